@@ -8,7 +8,7 @@ interface AuthContextType {
   user: User | null;
   loading: boolean;
   login: (email: string, password: string) => Promise<void>;
-  logout: () => void;
+  logout: () => Promise<void>;
   fetchUser: () => Promise<void>;
 }
 
@@ -17,7 +17,7 @@ const AuthContext = createContext<AuthContextType>({
   user: null,
   loading: true,
   login: async () => {},
-  logout: () => {},
+  logout: async () => {},
   fetchUser: async () => {},
 });
 
@@ -79,10 +79,16 @@ export const AuthProvider = ({ children }: AuthProviderProps) => {
     await fetchUser();
   };
 
-  const logout = () => {
-    // TODO: Implement a backend logout endpoint that clears the HttpOnly cookie.
-    setUser(null);
-    alert("Logged out (client-side). A backend logout endpoint is needed for full logout.");
+  const logout = async () => {
+    // The backend revokes the token and clears the HttpOnly cookie.
+    try {
+      await fetch('http://localhost:8000/api/auth/logout', {
+        method: 'POST',
+        credentials: 'include',
+      });
+    } finally {
+      setUser(null);
+    }
   };
 
   const value = {
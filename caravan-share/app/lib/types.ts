@@ -19,5 +19,13 @@ export interface Caravan {
   is_available: boolean;
   average_rating: number;
   review_count: number;
+  rating_histogram?: number[];
   image_url?: string;
-}
\ No newline at end of file
+  latitude?: number | null;
+  longitude?: number | null;
+}
+
+export interface CaravanListPage<T = Caravan> {
+  items: T[];
+  next_cursor: string | null;
+}
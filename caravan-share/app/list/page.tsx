@@ -1,33 +1,51 @@
 'use client';
 
-import { useState, useEffect } from 'react';
-import { Caravan } from '@/app/lib/types';
+import { useState, useEffect, useCallback } from 'react';
+import { Caravan, CaravanListPage } from '@/app/lib/types';
 import CaravanCard from '@/components/CaravanCard';
 
+// Only the fields the card renders are requested from the server.
+const CARD_FIELDS = ['name', 'type', 'location', 'price_per_day', 'image_url', 'average_rating'];
+const PAGE_SIZE = 24;
+
 const AllCaravansPage = () => {
   const [caravans, setCaravans] = useState<Caravan[]>([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
-  useEffect(() => {
-    const fetchCaravans = async () => {
-      try {
-        const res = await fetch('http://localhost:8000/api/caravans');
-        if (!res.ok) {
-          throw new Error('Failed to fetch caravans');
-        }
-        const data: Caravan[] = await res.json();
-        setCaravans(data);
-      } catch (err: any) {
-        setError(err.message);
-      } finally {
-        setLoading(false);
-      }
-    };
-
-    fetchCaravans();
+  const fetchPage = useCallback(async (cursor: string | null) => {
+    const params = new URLSearchParams({ limit: String(PAGE_SIZE), fields: CARD_FIELDS.join(',') });
+    if (cursor) {
+      params.set('cursor', cursor);
+    }
+    const res = await fetch(`http://localhost:8000/api/caravans?${params}`);
+    if (!res.ok) {
+      throw new Error('Failed to fetch caravans');
+    }
+    const data: CaravanListPage = await res.json();
+    setCaravans((previous) => (cursor ? [...previous, ...data.items] : data.items));
+    setNextCursor(data.next_cursor);
   }, []);
 
+  useEffect(() => {
+    fetchPage(null)
+      .catch((err: any) => setError(err.message))
+      .finally(() => setLoading(false));
+  }, [fetchPage]);
+
+  const loadMore = async () => {
+    setLoadingMore(true);
+    try {
+      await fetchPage(nextCursor);
+    } catch (err: any) {
+      setError(err.message);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   if (loading) {
     return <p className="text-center text-gray-500">Loading caravans...</p>;
   }
@@ -49,6 +67,18 @@ const AllCaravansPage = () => {
           ))}
         </div>
       )}
+
+      {nextCursor && (
+        <div className="mt-8 text-center">
+          <button
+            onClick={loadMore}
+            disabled={loadingMore}
+            className="px-6 py-2 bg-blue-500 text-white rounded-lg hover:bg-blue-600 disabled:opacity-50"
+          >
+            {loadingMore ? 'Loading...' : 'Load more'}
+          </button>
+        </div>
+      )}
     </div>
   );
 };
@@ -1,12 +1,16 @@
+import os
+import asyncio
+import secrets
+import tempfile
+import numpy as np
 import uvicorn
-from fastapi import FastAPI, HTTPException, Depends, status, Response
-from fastapi.responses import RedirectResponse, JSONResponse
-from fastapi.encoders import jsonable_encoder
+from fastapi import FastAPI, HTTPException, Depends, Query, Request, status, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import RedirectResponse
 from datetime import date, timedelta
-from typing import List
+from typing import List, Literal, Optional
 from dotenv import load_dotenv
 from jose import JWTError, jwt
-import traceback
+from contextlib import asynccontextmanager
 
 # Load environment variables
 load_dotenv()
@@ -15,40 +19,103 @@ load_dotenv()
 from src.models.user import User
 from src.models.caravan import Caravan
 from src.models.review import Review
-from src.models.poi import PointOfInterest
-from src.models.reservation import Reservation, ReservationCreate
-from src.models.schemas import UserCreate, ReservationDetails
+from src.models.webhook import Webhook, WebhookCreate, WebhookOut
+from src.models.poi import PointOfInterestResult, RouteCorridorQuery, RoutePointOfInterest
+from src.models.reservation import Reservation, ReservationCreate, ReservationBatchCreate
+from src.models.schemas import (
+    UserCreate, PasswordChange, ReservationDetails, CaravanAvailability, AvailabilityGrid, DateRange, CaravanSearchPage,
+    MapCluster, MapClusters, ReviewCreate, ReviewOut, ReviewPage
+)
 
 # Data
 from src.data.mock_pois import MOCK_POIS
+from src.data.poi_loader import load_poi_store
 
 # Repositories
-from src.repositories.base_repository import BaseRepository
+from src.repositories.caravan_repository import CaravanRepository
 from src.repositories.reservation_repository import ReservationRepository
 from src.repositories.user_repository import UserRepository
+from src.repositories.review_repository import ReviewRepository
+from src.repositories.base_repository import BaseRepository, Index
+from src.repositories.sqlite_repository import (
+    SqliteDatabase, SqliteRepository, SqliteCaravanRepository, SqliteReservationRepository, SqliteReviewRepository, SqliteUserRepository
+)
+from src.repositories.persistence import RepositoryPersistence
+from src.repositories.poi_spatial_index import PoiSpatialIndex
+from src.repositories.poi_store import PoiStoreBuilder
+from src.repositories.map_clusters import ClusterPyramid, IncrementalClusterGrid
 
 # Services
 from src.services.reservation_service import ReservationService
-from src.services.notification_service import NotificationService
+from src.services.notification_service import NotificationConnection, NotificationService
 from src.services.review_service import ReviewService
 from src.services.recommendation_service import RecommendationService
+from src.services.co_booking_service import CoBookingRecommender
+from src.services.trending_service import TrendingTracker
 from src.services.auth_service import AuthService
+from src.services.password_hasher import PasswordHasher, PasswordHasherBusy
+from src.services.search_service import CaravanSearchService
+from src.services.webhook_service import WebhookDispatcher, WebhookRetryQueue
 
 # Validators
 from src.validators.reservation_validator import ReservationValidator
 
 # Patterns
 from src.patterns.strategies import LongStayDiscount
+from src.patterns.factories import ReservationFactory
+from src.patterns.observers import HostNotifier, UserNotifier
 
 from fastapi.security import OAuth2PasswordRequestForm
 
 # Security
-from src.security import get_token_from_cookie
+from src.security import check_outbound_url, get_token_from_cookie
+
+# Response Cache
+from src.response_cache import ResponseCache
+from src.token_cache import TokenCache
 
 from fastapi.middleware.cors import CORSMiddleware
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    시작 시 알림 전달 작업자, 예약 이력 추천 모델의 주기적 재계산, OAuth용 공용 HTTP 커넥션 풀을 준비하고,
+    종료 시 남은 알림을 전달한 뒤 재계산 작업, 커넥션 풀, 저장소 자원을 정리합니다.
+    """
+    await notification_service.start()
+    rebuild_task = asyncio.create_task(_rebuild_co_booking_periodically())
+    auth_service.http_client = AuthService.create_http_client(
+        max_connections=int(os.getenv("OAUTH_HTTP_MAX_CONNECTIONS", "100")),
+        max_keepalive_connections=int(os.getenv("OAUTH_HTTP_MAX_KEEPALIVE", "20")),
+        timeout=float(os.getenv("OAUTH_HTTP_TIMEOUT_SECONDS", "10")),
+    )
+    await webhook_dispatcher.start()
+    yield
+    await webhook_dispatcher.stop()
+    await auth_service.aclose()
+    await notification_service.stop()
+    rebuild_task.cancel()
+    await asyncio.gather(rebuild_task, return_exceptions=True)
+    co_booking.close()
+    password_hasher.close()
+    for store in persistence_stores:
+        store.close()
+    if webhook_queue_db is not database:
+        webhook_queue_db.close()
+    if database is not None:
+        database.close()
+
+async def _rebuild_co_booking_periodically():
+    while True:
+        try:
+            # 예약 목록 전체를 읽는 동안 이벤트 루프를 막지 않도록 스레드에서 시작합니다.
+            await asyncio.wrap_future(await asyncio.to_thread(co_booking.rebuild_in_background))
+        except Exception:
+            pass  # 실패는 CoBookingRecommender가 기록하고, 기존 모델을 계속 사용합니다.
+        await asyncio.sleep(CO_BOOKING_REBUILD_SECONDS)
+
 # FastAPI 애플리케이션 인스턴스 생성
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # CORS 미들웨어 추가
 app.add_middleware(
@@ -63,44 +130,177 @@ app.add_middleware(
 print("--- CaravanShare 애플리케이션 초기화 ---")
 
 # 1. 핵심 서비스 및 저장소 인스턴스화 (전역)
-user_repo = UserRepository()
+# REPOSITORY_BACKEND: 'memory'(기본값, 재시작 시 데이터 소실) 또는 'sqlite'(SQLITE_PATH 파일에 영속 저장)
+# PERSISTENCE_DIR: 'memory' 저장소를 스냅샷 + 저널로 영속화할 디렉터리 (설정하지 않으면 영속화하지 않음)
+REPOSITORY_BACKEND = os.getenv("REPOSITORY_BACKEND", "memory")
+PERSISTENCE_DIR = os.getenv("PERSISTENCE_DIR")
+database = None
+persistence_stores = []
+# 호스트별 웹훅 구독 조회용 인덱스
+WEBHOOK_INDEXES = (Index(('host_id',)),)
+
+if REPOSITORY_BACKEND == "sqlite":
+    database = SqliteDatabase(os.getenv("SQLITE_PATH", "caravanshare.db"))
+    user_repo = SqliteUserRepository(database)
+    caravan_repo = SqliteCaravanRepository(database)
+    reservation_repo = SqliteReservationRepository(database)
+    review_repo = SqliteReviewRepository(database)
+    webhook_repo = SqliteRepository[Webhook](database, Webhook, "webhooks", WEBHOOK_INDEXES)
+elif REPOSITORY_BACKEND == "memory":
+    user_repo = UserRepository()
+    caravan_repo = CaravanRepository()
+    reservation_repo = ReservationRepository()
+    review_repo = ReviewRepository()
+    webhook_repo = BaseRepository[Webhook](WEBHOOK_INDEXES)
+    if PERSISTENCE_DIR:
+        for name, repo, model in [
+            ("users", user_repo, User),
+            ("caravans", caravan_repo, Caravan),
+            ("reservations", reservation_repo, Reservation),
+            ("reviews", review_repo, Review),
+            ("webhooks", webhook_repo, Webhook),
+        ]:
+            store = RepositoryPersistence(PERSISTENCE_DIR, name, model)
+            recovery = store.attach(repo)
+            print(
+                f"[Persistence] '{name}' 복구: 스냅샷 {recovery.snapshot_entities}건 + "
+                f"저널 {recovery.journal_records}건 ({recovery.total_seconds * 1000:.1f}ms)"
+            )
+            persistence_stores.append(store)
+else:
+    raise ValueError(f"Unknown REPOSITORY_BACKEND: {REPOSITORY_BACKEND}")
+# 재시작 후 기존 예약 ID를 덮어쓰지 않도록 ID 시퀀스를 맞춥니다.
+ReservationFactory.ensure_next_id_after(reservation_repo.max_id())
 app.state.user_repo = user_repo # Attach repo to app state for dependency injection
 
-caravan_repo = BaseRepository[Caravan]()
-reservation_repo = ReservationRepository()
-review_repo = BaseRepository[Review]()
-notification_service = NotificationService()
-recommendation_service = RecommendationService(caravan_repo)
-auth_service = AuthService(user_repo)
+# 지도용 카라반 클러스터: 기존 카라반으로 채운 뒤 저장/삭제 이벤트로 갱신합니다.
+caravan_clusters = IncrementalClusterGrid()
+for caravan in caravan_repo.get_all():
+    caravan_clusters.on_repository_event('save', caravan.caravan_id, caravan)
+caravan_repo.add_listener(caravan_clusters.on_repository_event)
+
+# 인기 순위: 시간 감쇠된 예약/조회 점수 (TRENDING_HALF_LIFE_HOURS: 점수가 절반이 되는 시간)
+trending = TrendingTracker(half_life_hours=float(os.getenv("TRENDING_HALF_LIFE_HOURS", "72")))
+for caravan in caravan_repo.get_all():
+    trending.add(caravan.caravan_id)
+caravan_repo.add_listener(trending.on_repository_event)
+
+# 예약 알림은 요청 경로에서 큐에 넣기만 하고, 작업자가 묶어서 전달합니다.
+# NOTIFICATION_WORKERS / NOTIFICATION_MAILBOX_SIZE: 전달 작업자 수 / 오프라인 사용자별 보관 알림 수
+# NOTIFICATION_BATCH_WINDOW_SECONDS: 묶음을 모으는 시간 (같은 호스트의 알림을 요약으로 합칠 기회)
+notification_service = NotificationService(
+    workers=int(os.getenv("NOTIFICATION_WORKERS", "4")),
+    batch_window=float(os.getenv("NOTIFICATION_BATCH_WINDOW_SECONDS", "0.05")),
+    mailbox_size=int(os.getenv("NOTIFICATION_MAILBOX_SIZE", "100")),
+)
+# 호스트 웹훅: 구독 저장소와 영속 재시도 큐 (WEBHOOK_QUEUE_PATH로 큐 파일 지정)
+# sqlite 저장소를 쓰면 같은 데이터베이스에, 아니면 PERSISTENCE_DIR(없으면 임시 디렉터리)의 파일에 큐를 둡니다.
+if database is not None:
+    webhook_queue_db = database
+else:
+    webhook_queue_db = SqliteDatabase(os.getenv("WEBHOOK_QUEUE_PATH") or os.path.join(
+        PERSISTENCE_DIR or tempfile.mkdtemp(prefix="caravanshare-"), "webhook_queue.db"
+    ))
+# WEBHOOK_MAX_ATTEMPTS / WEBHOOK_PER_DESTINATION / WEBHOOK_TIMEOUT_SECONDS: 최대 시도 횟수 / 목적지별 동시 요청 수 / 요청 제한 시간
+# WEBHOOK_ALLOW_PRIVATE_NETWORKS=1: 사설/루프백 주소로의 웹훅을 허용 (로컬 개발용, 기본은 차단)
+WEBHOOK_ALLOW_PRIVATE_NETWORKS = os.getenv("WEBHOOK_ALLOW_PRIVATE_NETWORKS", "0") == "1"
+webhook_dispatcher = WebhookDispatcher(
+    webhook_repo,
+    WebhookRetryQueue(webhook_queue_db),
+    max_attempts=int(os.getenv("WEBHOOK_MAX_ATTEMPTS", "8")),
+    per_destination=int(os.getenv("WEBHOOK_PER_DESTINATION", "4")),
+    timeout=float(os.getenv("WEBHOOK_TIMEOUT_SECONDS", "10")),
+    allow_private_networks=WEBHOOK_ALLOW_PRIVATE_NETWORKS,
+)
+# WebSocket 연결별 송신 버퍼 크기와, 가득 찼을 때의 처리('disconnect' 또는 'drop')
+WS_SEND_BUFFER_SIZE = int(os.getenv("WS_SEND_BUFFER_SIZE", "100"))
+WS_SLOW_CONSUMER_POLICY = os.getenv("WS_SLOW_CONSUMER_POLICY", "disconnect")
+# 느린 클라이언트를 끊을 때 닫기 프레임 전송을 기다리는 최대 시간 (초)
+WS_CLOSE_TIMEOUT_SECONDS = float(os.getenv("WS_CLOSE_TIMEOUT_SECONDS", "5"))
+# 예약 이력 기반 추천 모델 (작업 프로세스에서 주기적으로 재계산, 새 예약은 옵저버로 즉시 반영)
+# CO_BOOKING_REBUILD_SECONDS: 전체 재계산 주기 (초)
+CO_BOOKING_REBUILD_SECONDS = float(os.getenv("CO_BOOKING_REBUILD_SECONDS", "3600"))
+co_booking = CoBookingRecommender(reservation_repo)
+recommendation_service = RecommendationService(caravan_repo, co_booking)
+# 비밀번호 해시는 작업 프로세스 풀에서 계산합니다.
+# BCRYPT_ROUNDS: bcrypt 비용 (바꾸면 기존 해시는 다음 로그인 때 새 비용으로 다시 저장됨)
+# PASSWORD_HASH_WORKERS / PASSWORD_HASH_MAX_PENDING: 작업 프로세스 수 / 동시에 받을 최대 작업 수 (초과 시 503)
+password_hasher = PasswordHasher(
+    rounds=int(os.getenv("BCRYPT_ROUNDS", "12")),
+    max_workers=int(os.getenv("PASSWORD_HASH_WORKERS", "2")),
+    max_pending=int(os.getenv("PASSWORD_HASH_MAX_PENDING", "16")),
+)
+auth_service = AuthService(user_repo, password_hasher)
 print("저장소 및 서비스 준비 완료.")
 
-# 2. 초기 데이터 생성
-host_user = user_repo.save(User(user_id=101, name="김호스트", email="host@example.com", balance=0))
-another_host = user_repo.save(User(user_id=102, name="이호스트", email="host2@example.com", balance=0))
+# 2. 초기 데이터 생성 (저장된 데이터가 있으면 덮어쓰지 않고 없는 것만 만듭니다)
+host_user = user_repo.find_by_id(101) or user_repo.save(
+    User(user_id=101, name="김호스트", email="host@example.com", balance=0)
+)
+another_host = user_repo.find_by_id(102) or user_repo.save(
+    User(user_id=102, name="이호스트", email="host2@example.com", balance=0)
+)
 
-caravan_repo.save(Caravan(
+seed_caravans = [Caravan(
     caravan_id=1, name="별밤지기 캠퍼", owner_id=host_user.user_id, type="Campervan", price_per_day=120.0,
-    location="경기도 양평", sleeps=2, description="별보기 좋은 넓은 창을 가진 커플용 감성 캠퍼밴입니다. 로맨틱한 여행에 최적화되어 있습니다.",
+    location="경기도 양평", latitude=37.4917, longitude=127.4875, sleeps=2, description="별보기 좋은 넓은 창을 가진 커플용 감성 캠퍼밴입니다. 로맨틱한 여행에 최적화되어 있습니다.",
     image_url="/images/Gemini_Generated_Image_arlr5aarlr5aarlr.png"
-))
-caravan_repo.save(Caravan(
+), Caravan(
     caravan_id=2, name="어드벤처 패밀리", owner_id=another_host.user_id, type="Motorhome", price_per_day=250.0,
-    location="강원도 인제", sleeps=5, description="산과 계곡, 어디든 갈 수 있는 튼튼한 가족용 모터홈. 자전거 거치대와 루프탑 텐트가 포함되어 있습니다.",
+    location="강원도 인제", latitude=38.0697, longitude=128.1707, sleeps=5, description="산과 계곡, 어디든 갈 수 있는 튼튼한 가족용 모터홈. 자전거 거치대와 루프탑 텐트가 포함되어 있습니다.",
     image_url="https://placehold.co/600x400/718096/FFFFFF?text=Adventure+Family"
-))
-caravan_repo.save(Caravan(
+), Caravan(
     caravan_id=3, name="럭셔리 글램퍼", owner_id=host_user.user_id, type="Trailer", price_per_day=350.0,
-    location="제주도 애월", sleeps=4, description="호텔 스위트룸 부럽지 않은 최고급 시설을 갖춘 럭셔리 트레일러. 편안하고 프라이빗한 휴가를 즐겨보세요.",
+    location="제주도 애월", latitude=33.4622, longitude=126.3094, sleeps=4, description="호텔 스위트룸 부럽지 않은 최고급 시설을 갖춘 럭셔리 트레일러. 편안하고 프라이빗한 휴가를 즐겨보세요.",
     image_url="https://placehold.co/600x400/E2E8F0/2D3748?text=Luxury+Glamper"
-))
-print(f"새로운 테스트 데이터 3개 생성 완료.")
+)]
+created = 0
+for caravan in seed_caravans:
+    if caravan_repo.find_by_id(caravan.caravan_id) is None:
+        caravan_repo.save(caravan)
+        created += 1
+print(f"새로운 테스트 데이터 {created}개 생성 완료.")
 
 # 3. 비즈니스 로직 컴포넌트 인스턴스화 (의존성 주입)
 validator = ReservationValidator(user_repo, caravan_repo, reservation_repo)
 reservation_service = ReservationService(
     user_repo, caravan_repo, reservation_repo, validator, discount_strategy=LongStayDiscount()
 )
+reservation_service.attach(UserNotifier(notification_service))
+reservation_service.attach(HostNotifier(notification_service))
+reservation_service.attach(webhook_dispatcher)
+reservation_service.attach(co_booking)
+reservation_service.attach(trending)
 review_service = ReviewService(review_repo, reservation_repo, caravan_repo)
+search_service = CaravanSearchService(caravan_repo, reservation_repo, trending)
+# POI 저장소 및 공간 인덱스 (반경 / 최근접 / 경계 상자 조회)
+# POI_DATA_PATH: CSV 또는 GeoJSON POI 파일 (설정하지 않으면 목업 데이터 사용)
+# POI_CACHE_PATH: 적재 결과를 저장할 바이너리 캐시 파일 (원본보다 최신이면 원본 대신 사용)
+POI_DATA_PATH = os.getenv("POI_DATA_PATH")
+if POI_DATA_PATH:
+    poi_store, poi_stats = load_poi_store(POI_DATA_PATH, os.getenv("POI_CACHE_PATH"))
+    print(
+        f"[POI] {poi_stats.rows}건 적재 ({'캐시' if poi_stats.from_cache else '원본'}, "
+        f"건너뜀 {poi_stats.skipped}건, {poi_stats.seconds * 1000:.1f}ms)"
+    )
+else:
+    poi_builder = PoiStoreBuilder()
+    for region, pois in MOCK_POIS.items():
+        for poi in pois:
+            poi_builder.add_point(poi, region)
+    poi_store = poi_builder.build()
+poi_index = PoiSpatialIndex(poi_store.latitudes, poi_store.longitudes, poi_store.type_codes, poi_store.type_names)
+# 지도용 POI 클러스터 피라미드: 전체(None) + 종류별
+poi_clusters = {None: ClusterPyramid(poi_store.latitudes, poi_store.longitudes)}
+for code, poi_type in enumerate(poi_store.type_names):
+    members = np.flatnonzero(poi_store.type_codes == code)
+    poi_clusters[poi_type] = ClusterPyramid(poi_store.latitudes[members], poi_store.longitudes[members], ids=members)
+# 읽기 엔드포인트의 인코딩된 응답 캐시 (저장소 version이 바뀌면 무효화)
+response_cache = ResponseCache()
+# 검증된 JWT 캐시 (사용자가 변경되면 해당 사용자의 항목 무효화)
+# TOKEN_CACHE_SIZE: 최대 보관 토큰 수
+token_cache = TokenCache(max_entries=int(os.getenv("TOKEN_CACHE_SIZE", "10000")))
+user_repo.add_listener(token_cache.on_user_event)
 print("모든 서비스 및 검증기 준비 완료.")
 
 
@@ -115,6 +315,14 @@ async def get_current_user(token: str = Depends(get_token_from_cookie)) -> User:
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
     )
+    # 이미 검증한 토큰이면 서명 검증과 이메일 조회 없이 ID로 바로 찾습니다.
+    user_id = token_cache.get(token)
+    if user_id is not None:
+        user = app.state.user_repo.find_by_id(user_id)
+        if user is not None:
+            return user
+        token_cache.revoke(token)
+
     try:
         payload = jwt.decode(token, AuthService.SECRET_KEY, algorithms=[AuthService.ALGORITHM])
         email: str = payload.get("sub")
@@ -126,6 +334,13 @@ async def get_current_user(token: str = Depends(get_token_from_cookie)) -> User:
     user = app.state.user_repo.find_by_email(email=email)
     if user is None:
         raise credentials_exception
+    if payload.get("exp") is not None:
+        token_cache.put(token, user.user_id, payload["exp"])
+    # 캐시에 넣은 뒤에 폐기 여부를 확인해야, 그 사이에 로그아웃/비밀번호 변경이 일어나도
+    # 폐기된 토큰이 캐시에 남지 않습니다 (폐기하는 쪽은 폐기 후 캐시를 지움).
+    if auth_service.is_token_revoked(payload):
+        token_cache.revoke(token)
+        raise credentials_exception
     return user
 
 
@@ -136,28 +351,51 @@ def read_root():
     """루트 엔드포인트로, API 서버가 실행 중인지 확인합니다."""
     return {"message": "CaravanShare API 서버에 오신 것을 환영합니다!"}
 
+@app.get("/api/metrics/caches")
+def get_cache_metrics():
+    """캐시별 적중률 등 통계를 반환합니다."""
+    lookups = response_cache.hits + response_cache.misses
+    return {
+        "tokens": token_cache.stats(),
+        "responses": {
+            "hits": response_cache.hits,
+            "misses": response_cache.misses,
+            "hit_rate": response_cache.hits / lookups if lookups else 0.0,
+        },
+    }
+
 # --- Auth Endpoints ---
 
+def _password_hasher_busy(error: PasswordHasherBusy) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(error), headers={"Retry-After": "1"}
+    )
+
 @app.post("/api/auth/signup", response_model=User, status_code=status.HTTP_201_CREATED)
-def signup(user_data: UserCreate):
+async def signup(user_data: UserCreate):
     """
     Register a new user with email and password.
     """
     try:
-        return auth_service.register_user(
+        return await auth_service.register_user(
             name=user_data.name,
             email=user_data.email,
             password=user_data.password
         )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except PasswordHasherBusy as e:
+        raise _password_hasher_busy(e)
 
 @app.post("/api/auth/token")
-def login_for_access_token(response: Response, form_data: OAuth2PasswordRequestForm = Depends()):
+async def login_for_access_token(response: Response, form_data: OAuth2PasswordRequestForm = Depends()):
     """
     Authenticate with email/password, set HttpOnly cookie, and return a JWT.
     """
-    user = auth_service.authenticate_user(email=form_data.username, password=form_data.password)
+    try:
+        user = await auth_service.authenticate_user(email=form_data.username, password=form_data.password)
+    except PasswordHasherBusy as e:
+        raise _password_hasher_busy(e)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -177,6 +415,21 @@ def login_for_access_token(response: Response, form_data: OAuth2PasswordRequestF
     )
     return {"access_token": access_token, "token_type": "bearer"}
 
+@app.post("/api/auth/logout", status_code=status.HTTP_204_NO_CONTENT)
+def logout(response: Response, token: Optional[str] = Depends(get_token_from_cookie)):
+    """
+    Revoke the current token and clear the auth cookie.
+    """
+    if token is not None:
+        try:
+            payload = jwt.decode(token, AuthService.SECRET_KEY, algorithms=[AuthService.ALGORITHM])
+        except JWTError:
+            payload = None
+        if payload is not None:
+            auth_service.revoke_token(payload)
+        token_cache.revoke(token)
+    response.delete_cookie(key="access_token", httponly=True, samesite="lax")
+
 @app.get("/api/auth/url/google")
 def get_google_auth_url():
     """Google 로그인 페이지로 리디렉션할 URL을 반환합니다."""
@@ -208,6 +461,43 @@ async def read_users_me(current_user: User = Depends(get_current_user)):
     """현재 로그인된 사용자의 정보를 반환합니다."""
     return current_user
 
+@app.post("/api/users/me/password")
+async def change_my_password(
+    password_change: PasswordChange, response: Response, current_user: User = Depends(get_current_user)
+):
+    """
+    Change the current user's password. Every token issued before the change is revoked,
+    and a fresh token is issued for this session.
+    """
+    try:
+        user = await auth_service.change_password(
+            current_user, password_change.current_password, password_change.new_password
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except PasswordHasherBusy as e:
+        raise _password_hasher_busy(e)
+    access_token = auth_service.create_access_token(
+        data={"sub": user.email, "user_id": user.user_id}
+    )
+    response.set_cookie(
+        key="access_token",
+        value=f"Bearer {access_token}",
+        httponly=True,
+        secure=False, # Should be True in production
+        samesite="lax",
+    )
+    return {"access_token": access_token, "token_type": "bearer"}
+
+@app.get("/api/users/me/recommendations", response_model=List[Caravan])
+async def read_my_recommendations(
+    current_user: User = Depends(get_current_user), limit: int = Query(5, ge=1, le=20)
+):
+    """
+    Returns caravans recommended from the current user's booking history.
+    """
+    return recommendation_service.recommend_for_user(current_user.user_id, top_n=limit)
+
 @app.get("/api/users/me/reservations", response_model=List[ReservationDetails])
 def get_my_reservations(current_user: User = Depends(get_current_user)):
     """
@@ -234,53 +524,303 @@ def get_my_reservations(current_user: User = Depends(get_current_user)):
 
 # --- Caravan and POI Endpoints ---
 
-@app.get("/api/points-of-interest", response_model=List[PointOfInterest])
-def get_points_of_interest(location: str):
+def _poi_results(indices, distances=None) -> List[PointOfInterestResult]:
+    """Materializes spatial query hits as response models."""
+    if distances is None:
+        return [PointOfInterestResult(**poi_store.poi(i).model_dump()) for i in indices]
+    return [
+        PointOfInterestResult(**poi_store.poi(i).model_dump(), distance_km=round(float(distance), 3))
+        for i, distance in zip(indices, distances)
+    ]
+
+def _parse_bbox(bbox: str):
+    try:
+        min_lat, min_lon, max_lat, max_lon = (float(value) for value in bbox.split(","))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="bbox must be min_lat,min_lon,max_lat,max_lon")
+    if min_lat > max_lat:
+        raise HTTPException(status_code=400, detail="bbox min_lat must not exceed max_lat")
+    return min_lat, min_lon, max_lat, max_lon
+
+@app.get("/api/points-of-interest", response_model=List[PointOfInterestResult])
+def get_points_of_interest(
+    request: Request,
+    location: Optional[str] = None,
+    lat: Optional[float] = Query(None, ge=-90, le=90),
+    lon: Optional[float] = Query(None, ge=-180, le=180),
+    radius_km: Optional[float] = Query(None, gt=0, le=1000),
+    k: Optional[int] = Query(None, ge=1, le=1000),
+    bbox: Optional[str] = Query(None, description="min_lat,min_lon,max_lat,max_lon"),
+    poi_type: Optional[Literal['campground', 'toilet']] = Query(None, alias="type"),
+    limit: int = Query(500, ge=1, le=10000)
+):
     """
-    Returns a list of points of interest (campgrounds, toilets) for a given location.
+    Returns points of interest (campgrounds, toilets), optionally filtered by `type`.
+    - `bbox=min_lat,min_lon,max_lat,max_lon`: POIs inside the bounding box
+    - `lat`, `lon`, `k`: the k nearest POIs
+    - `lat`, `lon`, `radius_km`: POIs within the radius, nearest first
+    - `location`: POIs registered for a region name
     """
-    print(f"--- DEBUG: /api/points-of-interest called with location: {location} ---")
-    pois = MOCK_POIS.get(location, [])
-    print(f"--- DEBUG: Found {len(pois)} POIs for {location}. ---")
-    return pois
+    if bbox is not None:
+        return _poi_results(poi_index.bbox(*_parse_bbox(bbox), poi_type)[:limit])
+
+    if lat is not None and lon is not None:
+        if k is not None:
+            return _poi_results(*poi_index.nearest(lat, lon, k, poi_type))
+        if radius_km is not None:
+            return _poi_results(*poi_index.radius(lat, lon, radius_km, poi_type, limit=limit))
+        raise HTTPException(status_code=400, detail="Spatial queries need either k or radius_km.")
+
+    if location is not None:
+        # POI 저장소는 시작 시 한 번 적재되어 바뀌지 않으므로 버전이 고정입니다.
+        return response_cache.respond(
+            request, ("pois", location, poi_type), 0,
+            lambda: [
+                poi.model_dump(mode="json") for poi in map(poi_store.poi, poi_store.region_indices(location))
+                if poi_type is None or poi.type == poi_type
+            ],
+        )
+    raise HTTPException(status_code=400, detail="Provide location, bbox, or lat/lon with k or radius_km.")
+
+@app.post("/api/points-of-interest/route", response_model=List[RoutePointOfInterest])
+def get_points_of_interest_along_route(query: RouteCorridorQuery):
+    """
+    Returns points of interest within `corridor_km` of a planned route, in the order they are passed.
+    `route` is the route polyline as [latitude, longitude] vertices.
+    """
+    latitudes, longitudes = zip(*query.route)
+    indices, along, offsets = poi_index.corridor(latitudes, longitudes, query.corridor_km, query.type, limit=query.limit)
+    return [
+        RoutePointOfInterest(
+            **poi_store.poi(i).model_dump(),
+            distance_along_route_km=round(float(distance_along), 3),
+            distance_from_route_km=round(float(offset), 3),
+        )
+        for i, distance_along, offset in zip(indices, along, offsets)
+    ]
+
+@app.get("/api/map/clusters", response_model=MapClusters)
+def get_map_clusters(
+    bbox: str = Query(..., description="min_lat,min_lon,max_lat,max_lon"),
+    zoom: int = Query(..., ge=0, le=22),
+    layers: str = Query("caravans,pois", description="Comma-separated: caravans, pois"),
+    poi_type: Optional[Literal['campground', 'toilet']] = Query(None, alias="type")
+):
+    """
+    Returns marker clusters of caravans and POIs inside the bounding box at a map zoom level.
+    Each cluster carries its count and centroid; single-item clusters carry the item.
+    """
+    box = _parse_bbox(bbox)
+    requested = {layer.strip() for layer in layers.split(",")}
+    clusters: List[MapCluster] = []
+    if "caravans" in requested:
+        clusters.extend(
+            MapCluster(layer="caravans", count=hit.count, latitude=hit.latitude, longitude=hit.longitude,
+                       caravan_id=hit.member)
+            for hit in caravan_clusters.query(zoom, *box)
+        )
+    if "pois" in requested:
+        pyramid = poi_clusters.get(poi_type)
+        hits = pyramid.query(zoom, *box) if pyramid is not None else []
+        clusters.extend(
+            MapCluster(layer="pois", count=hit.count, latitude=hit.latitude, longitude=hit.longitude,
+                       poi=poi_store.poi(hit.member) if hit.member is not None else None)
+            for hit in hits
+        )
+    return MapClusters(zoom=zoom, clusters=clusters)
+
+# fields= 투영에 사용할 수 있는 Caravan 필드
+CARAVAN_FIELDS = frozenset(Caravan.model_fields)
 
 @app.get("/api/caravans")
-def get_caravans():
-    """(DEBUGGING) Manually serializes the caravan list to JSON."""
-    print("--- DEBUG: Testing manual JSON serialization ---")
+def get_caravans(
+    request: Request,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    sort: str = Query("caravan_id", pattern="^(price_per_day|average_rating|sleeps|caravan_id|trending)$"),
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    fields: Optional[str] = Query(None, description="Comma-separated caravan fields to include, e.g. name,type,price_per_day")
+):
+    """
+    Lists caravans one page at a time using keyset pagination.
+    Pass the returned `next_cursor` back as `cursor` to get the following page.
+    Only the requested page, and only the requested `fields`, are serialized.
+    `sort=trending` orders by time-decayed bookings and views, most popular first (`order` is ignored).
+    """
+    include = None
+    if fields:
+        include = {field.strip() for field in fields.split(",") if field.strip()}
+        unknown = include - CARAVAN_FIELDS
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+        # 클라이언트가 항목을 식별할 수 있도록 ID는 항상 포함합니다.
+        include.add("caravan_id")
+
+    def build():
+        try:
+            caravans, next_cursor = search_service.list_page(
+                sort_by=sort, descending=order == "desc", cursor=cursor, limit=limit
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return {
+            "items": [caravan.model_dump(mode="json", include=include) for caravan in caravans],
+            "next_cursor": next_cursor,
+        }
+
+    key = ("caravans", limit, cursor, sort, order, tuple(sorted(include)) if include else None)
+    # 인기 순위는 카라반이 바뀌지 않아도 예약/조회마다 바뀝니다.
+    version = (caravan_repo.version, trending.version) if sort == "trending" else caravan_repo.version
+    return response_cache.respond(request, key, version, build)
+
+@app.get("/api/caravans/search", response_model=CaravanSearchPage)
+def search_caravans(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    location: Optional[str] = None,
+    caravan_type: Optional[str] = Query(None, alias="type"),
+    min_sleeps: Optional[int] = Query(None, ge=1),
+    min_price: Optional[float] = Query(None, ge=0),
+    max_price: Optional[float] = Query(None, ge=0),
+    sort: str = Query("price_per_day", pattern="^(price_per_day|average_rating|sleeps|caravan_id)$"),
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100)
+):
+    """
+    Searches the fleet by attributes and, when dates are given, by availability for the whole stay.
+    """
     try:
-        caravans = caravan_repo.find_all()
-        print(f"--- DEBUG: Found {len(caravans)} caravans. Manually encoding... ---")
-        json_compatible_caravans = jsonable_encoder(caravans)
-        print("--- DEBUG: Manual encoding successful. Returning JSONResponse. ---")
-        return JSONResponse(content=json_compatible_caravans)
-    except Exception as e:
-        print(f"--- DEBUG: An exception occurred during manual serialization: ---")
-        traceback.print_exc()
-        raise
+        caravans, has_more = search_service.search(
+            start_date=start_date, end_date=end_date, location=location, caravan_type=caravan_type,
+            min_sleeps=min_sleeps, min_price=min_price, max_price=max_price,
+            sort_by=sort, descending=order == "desc", page=page, page_size=page_size,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return CaravanSearchPage(items=caravans, page=page, page_size=page_size, has_more=has_more)
+
+@app.get("/api/caravans/availability-grid", response_model=AvailabilityGrid)
+def get_availability_grid(
+    start_date: Optional[date] = None,
+    days: int = Query(30, ge=1, le=366)
+):
+    """
+    Returns a caravans x days availability grid for the whole fleet in one call.
+    """
+    start_date = start_date or date.today()
+    caravan_ids = caravan_repo.sorted_ids("caravan_id")
+    free_bitmaps = reservation_repo.availability_grid(caravan_ids, start_date, days)
+    return AvailabilityGrid(
+        start_date=start_date,
+        days=days,
+        caravan_ids=caravan_ids,
+        # 비트 d가 start_date + d일이므로, 문자열의 d번째 문자가 되도록 뒤집습니다.
+        rows=[format(bitmap, f"0{days}b")[::-1] for bitmap in free_bitmaps],
+    )
+
+@app.get("/api/caravans/{caravan_id}/availability", response_model=CaravanAvailability)
+def get_caravan_availability(
+    caravan_id: int,
+    start_date: Optional[date] = None,
+    days: int = Query(90, ge=1, le=366)
+):
+    """
+    Returns the free date ranges of a caravan over the next `days` days.
+    """
+    if not caravan_repo.find_by_id(caravan_id):
+        raise HTTPException(status_code=404, detail="Caravan not found")
+    start_date = start_date or date.today()
+    free_ranges = reservation_repo.find_free_ranges(caravan_id, start_date, days)
+    return CaravanAvailability(
+        caravan_id=caravan_id,
+        start_date=start_date,
+        end_date=start_date + timedelta(days=days),
+        free_ranges=[DateRange(start_date=start, end_date=end) for start, end in free_ranges],
+    )
+
+@app.get("/api/caravans/{caravan_id}/similar", response_model=List[Caravan])
+def get_similar_caravans(caravan_id: int, limit: int = Query(3, ge=1, le=50)):
+    """
+    Returns the caravans most similar to the given one by type, location, price, capacity and rating.
+    """
+    if not caravan_repo.find_by_id(caravan_id):
+        raise HTTPException(status_code=404, detail="Caravan not found")
+    return recommendation_service.recommend_similar_caravans(caravan_id, top_n=limit)
+
+@app.get("/api/caravans/{caravan_id}/also-booked", response_model=List[Caravan])
+def get_also_booked_caravans(caravan_id: int, limit: int = Query(5, ge=1, le=20)):
+    """
+    Returns caravans that guests who booked this caravan also booked, most shared bookings first.
+    """
+    if not caravan_repo.find_by_id(caravan_id):
+        raise HTTPException(status_code=404, detail="Caravan not found")
+    return recommendation_service.recommend_also_booked(caravan_id, top_n=limit)
 
 @app.get("/api/caravans/{caravan_id}")
-def get_caravan_by_id(caravan_id: int):
+def get_caravan_by_id(request: Request, caravan_id: int):
     """
-    Returns a single caravan by its ID, with manual JSON encoding and error tracing.
+    Returns a single caravan by its ID, served from the encoded response cache.
     """
-    print(f"--- DEBUG: /api/caravans/{caravan_id} called ---")
-    try:
+    trending.record_view(caravan_id)
+    def build():
         caravan = caravan_repo.find_by_id(caravan_id)
         if not caravan:
             raise HTTPException(status_code=404, detail="Caravan not found")
-        
-        print(f"--- DEBUG: Found caravan '{caravan.name}'. Manually encoding... ---")
-        json_compatible_caravan = jsonable_encoder(caravan)
-        print("--- DEBUG: Manual encoding successful. Returning JSONResponse. ---")
-        return JSONResponse(content=json_compatible_caravan)
-    except Exception as e:
-        print(f"--- DEBUG: An exception occurred in get_caravan_by_id for id {caravan_id}: ---")
-        traceback.print_exc()
-        raise
+        return caravan.model_dump(mode="json")
+
+    return response_cache.respond(request, ("caravan", caravan_id), caravan_repo.version, build)
+
+# --- Review Endpoints ---
+
+@app.post("/api/caravans/{caravan_id}/reviews", response_model=ReviewOut, status_code=status.HTTP_201_CREATED)
+async def create_review(
+    caravan_id: int, review_in: ReviewCreate, current_user: User = Depends(get_current_user)
+):
+    """
+    Adds a review for a caravan. Only guests with a confirmed reservation for the caravan may review it.
+    """
+    if not caravan_repo.find_by_id(caravan_id):
+        raise HTTPException(status_code=404, detail="Caravan not found")
+    try:
+        review = review_service.submit_review(current_user.user_id, caravan_id, review_in.rating, review_in.comment)
+    except PermissionError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+    return ReviewOut(**vars(review))
+
+@app.get("/api/caravans/{caravan_id}/reviews", response_model=ReviewPage)
+def list_reviews(caravan_id: int, limit: int = Query(20, ge=1, le=100), cursor: Optional[str] = None):
+    """
+    Lists a caravan's reviews newest first, one page at a time, with its rating histogram.
+    Pass the returned `next_cursor` back as `cursor` to get the following page.
+    """
+    caravan = caravan_repo.find_by_id(caravan_id)
+    if not caravan:
+        raise HTTPException(status_code=404, detail="Caravan not found")
+    try:
+        before = int(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor.")
+    # 다음 페이지 존재 여부를 알기 위해 1건 더 조회합니다.
+    reviews = review_service.list_reviews(caravan_id, before=before, limit=limit + 1)
+    next_cursor = str(reviews[limit - 1].review_id) if len(reviews) > limit else None
+    return ReviewPage(
+        items=[ReviewOut(**vars(review)) for review in reviews[:limit]],
+        next_cursor=next_cursor,
+        average_rating=caravan.average_rating,
+        review_count=caravan.review_count,
+        rating_histogram=caravan.rating_histogram,
+    )
 
 # --- Reservation Endpoints ---
 
+def _ensure_test_balance(user: User):
+    """We need to add a balance to the user for testing purposes."""
+    if user.balance == 0:
+        print(f"--- DEBUG: Adding 10000 to balance for user {user.user_id} for testing ---")
+        user.balance = 10000
+        user_repo.save(user)
+
 @app.post("/api/reservations", response_model=Reservation, status_code=status.HTTP_201_CREATED)
 def create_reservation(
     reservation_data: ReservationCreate,
@@ -290,10 +830,7 @@ def create_reservation(
     Creates a new reservation for the current user.
     """
     # The reservation_service has detailed internal logging.
-    # We need to add a balance to the user for testing purposes.
-    if current_user.balance == 0:
-        print(f"--- DEBUG: Adding 10000 to balance for user {current_user.user_id} for testing ---")
-        current_user.balance = 10000
+    _ensure_test_balance(current_user)
 
     new_reservation = reservation_service.create_reservation(
         user_id=current_user.user_id,
@@ -311,6 +848,108 @@ def create_reservation(
         )
     return new_reservation
 
+@app.post("/api/reservations/batch", response_model=List[Reservation], status_code=status.HTTP_201_CREATED)
+def create_reservations_batch(
+    batch_data: ReservationBatchCreate,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Books several caravans at once for the current user. Either every item is booked or none is.
+    """
+    _ensure_test_balance(current_user)
+
+    reservations = reservation_service.create_reservations_batch(
+        user_id=current_user.user_id,
+        items=batch_data.items
+    )
+
+    if reservations is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Batch reservation failed. A caravan may not be available, dates may be invalid or overlap within the batch, or funds may be insufficient."
+        )
+    return reservations
+
+# --- Webhook Endpoints ---
+
+@app.post("/api/webhooks", response_model=Webhook, status_code=status.HTTP_201_CREATED)
+def create_webhook(webhook_in: WebhookCreate, current_user: User = Depends(get_current_user)):
+    """
+    Register a webhook for the current host's booking events.
+    Only hosts who own at least one caravan can register, and the URL must not point to a private network.
+    Deliveries are signed with the returned `secret`, which is not shown again.
+    """
+    if caravan_repo.find_one_by(owner_id=current_user.user_id) is None:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only caravan hosts can register webhooks.")
+    try:
+        check_outbound_url(webhook_in.url, allow_private=WEBHOOK_ALLOW_PRIVATE_NETWORKS)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    webhook = Webhook(
+        **webhook_in.model_dump(), host_id=current_user.user_id, secret=secrets.token_hex(32)
+    )
+    return webhook_repo.save(webhook)
+
+@app.get("/api/webhooks", response_model=List[WebhookOut])
+def list_webhooks(current_user: User = Depends(get_current_user)):
+    """List the current host's webhooks."""
+    return webhook_repo.find_by(host_id=current_user.user_id)
+
+@app.delete("/api/webhooks/{webhook_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_webhook(webhook_id: int, current_user: User = Depends(get_current_user)):
+    """Delete one of the current host's webhooks. Pending deliveries to it are dropped."""
+    webhook = webhook_repo.find_by_id(webhook_id)
+    if webhook is None or webhook.host_id != current_user.user_id:
+        raise HTTPException(status_code=404, detail="Webhook not found")
+    webhook_repo.delete(webhook_id)
+
+# --- Notification Endpoints ---
+
+@app.websocket("/ws/notifications")
+async def notifications_socket(websocket: WebSocket):
+    """
+    Pushes the current user's notifications as JSON messages. Authenticated with the same cookie JWT as the REST API.
+    Notifications queued while the user was offline are sent right after connecting.
+    """
+    try:
+        user = await get_current_user(get_token_from_cookie(websocket))
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    await websocket.accept()
+
+    connection = NotificationConnection(
+        websocket.send_json, buffer_size=WS_SEND_BUFFER_SIZE, policy=WS_SLOW_CONSUMER_POLICY
+    )
+    notification_service.connect(user.user_id, connection)
+    # 송신 루프는 연결이 닫히면(느린 소비자로 끊긴 경우 포함) 진행 중인 전송을 취소하고 바로 끝납니다.
+    sender = asyncio.create_task(connection.run())
+    # 클라이언트가 보내는 메시지는 없지만, 연결 종료를 알아채려면 계속 받아야 합니다.
+    receiver = asyncio.create_task(_drain_websocket(websocket))
+    try:
+        done, _ = await asyncio.wait({sender, receiver}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        notification_service.disconnect(user.user_id, connection)
+        sender.cancel()
+        receiver.cancel()
+        await asyncio.gather(sender, receiver, return_exceptions=True)
+    if sender in done and connection.dropped:
+        # 송신 버퍼를 넘길 만큼 느린 클라이언트: 다시 연결하면 이후 알림부터 받습니다.
+        # 읽지 않는 클라이언트에는 닫기 프레임도 전송되지 않을 수 있으므로 오래 기다리지 않습니다.
+        try:
+            await asyncio.wait_for(
+                websocket.close(code=status.WS_1013_TRY_AGAIN_LATER), WS_CLOSE_TIMEOUT_SECONDS
+            )
+        except (asyncio.TimeoutError, RuntimeError):
+            pass
+
+async def _drain_websocket(websocket: WebSocket):
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+
 if __name__ == "__main__":
     """Uvicorn을 사용하여 FastAPI 애플리케이션을 실행합니다."""
     print("--- API 서버 시작 ---")
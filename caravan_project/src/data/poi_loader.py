@@ -0,0 +1,184 @@
+
+import csv
+import json
+import os
+import re
+import time
+from dataclasses import dataclass
+from operator import itemgetter
+from typing import Any, Dict, Iterator, List, Optional, Tuple, get_args
+
+from src.models.poi import PointOfInterest
+from src.repositories.poi_store import PoiStore, PoiStoreBuilder
+
+# PointOfInterest.type이 허용하는 값. 그 외 종류의 행은 건너뜁니다.
+POI_TYPES = frozenset(get_args(PointOfInterest.model_fields['type'].annotation))
+
+# 청크의 각 행은 이 순서의 튜플입니다.
+POI_FIELDS = ('name', 'type', 'latitude', 'longitude', 'address', 'region')
+PoiRow = Tuple[Any, ...]
+
+# CSV 열 이름 기본값 (표준 이름 -> 파일의 열 이름)
+DEFAULT_CSV_COLUMNS = {
+    'name': 'name',
+    'type': 'type',
+    'latitude': 'latitude',
+    'longitude': 'longitude',
+    'address': 'address',
+    'region': 'region',
+}
+
+_FEATURES_START = re.compile(r'"features"\s*:\s*\[')
+
+
+@dataclass
+class PoiLoadStats:
+    """POI 파일 적재 결과"""
+    rows: int = 0
+    skipped: int = 0
+    seconds: float = 0.0
+    from_cache: bool = False
+
+
+def iter_csv_chunks(path: str, chunk_size: int = 10_000,
+                    columns: Optional[Dict[str, str]] = None) -> Iterator[List[PoiRow]]:
+    """CSV 파일을 chunk_size행씩 읽어 POI_FIELDS 순서의 튜플 목록으로 돌려줍니다. 없는 열은 None입니다."""
+    columns = {**DEFAULT_CSV_COLUMNS, **(columns or {})}
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        # 헤더를 한 번만 해석하고, 행마다 위치로 꺼냅니다 (DictReader보다 훨씬 빠름).
+        # 없는 열은 행 끝에 덧붙인 빈 칸(None)을 가리키게 합니다.
+        missing = len(header)
+        extract = itemgetter(*(
+            header.index(columns[field]) if columns[field] in header else missing for field in POI_FIELDS
+        ))
+        padding = [None] * (missing + 1)
+        chunk = []
+        for row in reader:
+            # 짧은 행과 없는 열을 None으로 채웁니다.
+            row.extend(padding[len(row):])
+            chunk.append(extract(row))
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+def iter_geojson_features(path: str, buffer_size: int = 1 << 16) -> Iterator[Dict[str, Any]]:
+    """
+    GeoJSON 파일의 Feature를 하나씩 돌려줍니다. 파일 전체를 메모리에 올리지 않습니다.
+    - FeatureCollection: "features" 배열 안의 객체를 버퍼 단위로 읽으며 하나씩 디코딩
+    - 줄 단위 GeoJSON (.geojsonl, .geojsons, .ndjson): 한 줄에 Feature 하나
+    """
+    if path.endswith(('.geojsonl', '.geojsons', '.ndjson')):
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip().lstrip('\x1e')  # RFC 8142 레코드 구분자
+                if line:
+                    yield json.loads(line)
+        return
+
+    decoder = json.JSONDecoder()
+    with open(path, encoding='utf-8') as f:
+        buffer = ''
+        while True:
+            chunk = f.read(buffer_size)
+            if not chunk:
+                raise ValueError(f"{path} has no 'features' array")
+            buffer += chunk
+            match = _FEATURES_START.search(buffer)
+            if match:
+                buffer, position = buffer[match.end():], 0
+                break
+            # 키가 청크 경계에 걸친 경우를 위해 끝부분만 남깁니다.
+            buffer = buffer[-32:]
+
+        while True:
+            # 객체 사이의 공백과 쉼표를 건너뜁니다.
+            while position < len(buffer) and buffer[position] in ' \t\r\n,':
+                position += 1
+            if position < len(buffer) and buffer[position] == ']':
+                return
+            try:
+                feature, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                # 객체가 버퍼 경계에서 잘렸으므로 더 읽은 뒤 다시 시도합니다.
+                chunk = f.read(buffer_size)
+                if not chunk:
+                    raise
+                buffer = buffer[position:] + chunk
+                position = 0
+                continue
+            yield feature
+
+
+def iter_geojson_chunks(path: str, chunk_size: int = 10_000) -> Iterator[List[PoiRow]]:
+    """GeoJSON Point Feature를 chunk_size개씩 POI_FIELDS 순서의 튜플 목록으로 돌려줍니다."""
+    chunk = []
+    for feature in iter_geojson_features(path):
+        geometry = feature.get('geometry') or {}
+        properties = feature.get('properties') or {}
+        coordinates = geometry.get('coordinates') if geometry.get('type') == 'Point' else None
+        chunk.append((
+            properties.get('name'),
+            properties.get('type'),
+            # GeoJSON 좌표 순서는 [경도, 위도]입니다.
+            coordinates[1] if coordinates else None,
+            coordinates[0] if coordinates else None,
+            properties.get('address'),
+            properties.get('region'),
+        ))
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def load_poi_file(path: str, builder: PoiStoreBuilder, chunk_size: int = 10_000) -> PoiLoadStats:
+    """
+    CSV 또는 GeoJSON 파일을 청크 단위로 읽어 builder에 추가합니다.
+    종류가 허용되지 않거나 좌표가 올바르지 않은 행은 건너뛰고 개수만 기록합니다.
+    """
+    started = time.perf_counter()
+    stats = PoiLoadStats()
+    if path.endswith('.csv'):
+        chunks = iter_csv_chunks(path, chunk_size)
+    else:
+        chunks = iter_geojson_chunks(path, chunk_size)
+
+    for chunk in chunks:
+        valid = []
+        for name, poi_type, latitude, longitude, address, region in chunk:
+            try:
+                latitude, longitude = float(latitude), float(longitude)
+            except (TypeError, ValueError):
+                continue
+            if poi_type in POI_TYPES and name and -90 <= latitude <= 90 and -180 <= longitude <= 180:
+                valid.append((name, poi_type, latitude, longitude, address or '', region))
+        builder.add_rows(valid)
+        stats.rows += len(valid)
+        stats.skipped += len(chunk) - len(valid)
+    stats.seconds = time.perf_counter() - started
+    return stats
+
+
+def load_poi_store(source_path: str, cache_path: Optional[str] = None,
+                   chunk_size: int = 10_000) -> Tuple[PoiStore, PoiLoadStats]:
+    """
+    POI 파일을 PoiStore로 적재합니다.
+    cache_path가 원본보다 최신이면 캐시를 그대로 열고, 아니면 원본을 읽은 뒤 캐시를 새로 씁니다.
+    """
+    if cache_path and os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(source_path):
+        started = time.perf_counter()
+        store = PoiStore.load(cache_path)
+        return store, PoiLoadStats(rows=len(store), seconds=time.perf_counter() - started, from_cache=True)
+
+    builder = PoiStoreBuilder()
+    stats = load_poi_file(source_path, builder, chunk_size)
+    store = builder.build()
+    if cache_path:
+        store.save(cache_path)
+    return store, stats
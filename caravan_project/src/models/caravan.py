@@ -10,6 +10,8 @@ class CaravanCreate(BaseModel):
     sleeps: int = Field(..., gt=0)
     description: str
     image_url: Optional[str] = None
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
 
 class Caravan(CaravanCreate):
     """Full Caravan model including server-set fields."""
@@ -18,12 +20,15 @@ class Caravan(CaravanCreate):
     is_available: bool = True
     average_rating: float = 0.0
     review_count: int = 0
+    # rating_histogram[i] = number of reviews with rating i + 1
+    rating_histogram: List[int] = Field(default_factory=lambda: [0] * 5)
 
     class Config:
         from_attributes = True
 
     def update_rating(self, new_rating: int):
-        """Updates the average rating and review count when a new review is added."""
+        """Updates the average rating, review count and rating histogram when a new review is added."""
         total_rating = self.average_rating * self.review_count
         self.review_count += 1
-        self.average_rating = (total_rating + new_rating) / self.review_count
\ No newline at end of file
+        self.average_rating = (total_rating + new_rating) / self.review_count
+        self.rating_histogram[new_rating - 1] += 1
\ No newline at end of file
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Literal
+from pydantic import BaseModel, Field, model_validator
+from typing import Annotated, List, Literal, Optional, Tuple
 
 class PointOfInterest(BaseModel):
     """A model for a point of interest like a campground or a toilet."""
@@ -8,3 +8,33 @@ class PointOfInterest(BaseModel):
     latitude: float
     longitude: float
     address: str
+
+class PointOfInterestResult(PointOfInterest):
+    """A point of interest returned by a spatial query, with its distance from the query point when relevant."""
+    distance_km: Optional[float] = None
+
+# Limit on len(route) * corridor_km: the work of a corridor search grows with both.
+MAX_ROUTE_CORRIDOR_VERTEX_KM = 250_000
+
+RouteVertex = Tuple[Annotated[float, Field(ge=-90, le=90)], Annotated[float, Field(ge=-180, le=180)]]
+
+class RouteCorridorQuery(BaseModel):
+    """A planned route as [latitude, longitude] vertices and the corridor to search around it."""
+    route: List[RouteVertex] = Field(..., min_length=1, max_length=50000)
+    corridor_km: float = Field(5.0, gt=0, le=100, description="Maximum distance from the route")
+    type: Optional[Literal['campground', 'toilet']] = None
+    limit: int = Field(500, ge=1, le=10000)
+
+    @model_validator(mode='after')
+    def check_route_size(self) -> 'RouteCorridorQuery':
+        if len(self.route) * self.corridor_km > MAX_ROUTE_CORRIDOR_VERTEX_KM:
+            raise ValueError(
+                f"len(route) * corridor_km must be at most {MAX_ROUTE_CORRIDOR_VERTEX_KM}; "
+                "simplify the route or narrow the corridor"
+            )
+        return self
+
+class RoutePointOfInterest(PointOfInterest):
+    """A point of interest along a route, with how far along the route it is and how far off the route."""
+    distance_along_route_km: float
+    distance_from_route_km: float
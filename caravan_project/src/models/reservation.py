@@ -1,6 +1,6 @@
-from pydantic import BaseModel, validator
+from pydantic import BaseModel, Field, validator
 from datetime import date
-from typing import Optional
+from typing import List, Optional
 
 class ReservationCreate(BaseModel):
     """A model for creating a new reservation, with data from the user."""
@@ -8,6 +8,10 @@ class ReservationCreate(BaseModel):
     start_date: date
     end_date: date
 
+class ReservationBatchCreate(BaseModel):
+    """A model for booking several caravans at once (all-or-nothing)."""
+    items: List[ReservationCreate] = Field(..., min_length=1, max_length=100)
+
 class Reservation(BaseModel):
     """Full Reservation model."""
     reservation_id: Optional[int] = None
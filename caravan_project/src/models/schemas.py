@@ -1,12 +1,19 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from datetime import date
-from typing import Optional
+from typing import List, Literal, Optional
+
+from src.models.caravan import Caravan
+from src.models.poi import PointOfInterest
 
 class UserCreate(BaseModel):
     name: str
     email: EmailStr
     password: str
 
+class PasswordChange(BaseModel):
+    current_password: str
+    new_password: str
+
 class ReservationDetails(BaseModel):
     """Schema for returning reservation details including caravan info."""
     reservation_id: int
@@ -16,3 +23,70 @@ class ReservationDetails(BaseModel):
     status: str
     caravan_name: str
     caravan_image_url: Optional[str] = None
+
+class DateRange(BaseModel):
+    """A bookable date range. end_date is the checkout day (exclusive)."""
+    start_date: date
+    end_date: date
+
+class CaravanAvailability(BaseModel):
+    """Free date ranges of one caravan over a horizon."""
+    caravan_id: int
+    start_date: date
+    end_date: date
+    free_ranges: List[DateRange]
+
+class AvailabilityGrid(BaseModel):
+    """
+    Fleet-wide availability grid.
+    rows[i][d] is '1' if caravan_ids[i] is free on the night of start_date + d days, '0' otherwise.
+    """
+    start_date: date
+    days: int
+    caravan_ids: List[int]
+    rows: List[str]
+
+class CaravanSearchPage(BaseModel):
+    """One page of caravan search results."""
+    items: List[Caravan]
+    page: int
+    page_size: int
+    has_more: bool
+
+class MapCluster(BaseModel):
+    """
+    A marker cluster on the map. Single-item clusters carry the item itself:
+    `caravan_id` for the caravans layer, `poi` for the POI layer.
+    """
+    layer: Literal['caravans', 'pois']
+    count: int
+    latitude: float
+    longitude: float
+    caravan_id: Optional[int] = None
+    poi: Optional[PointOfInterest] = None
+
+class MapClusters(BaseModel):
+    """Clusters visible in a bounding box at a zoom level."""
+    zoom: int
+    clusters: List[MapCluster]
+
+class ReviewCreate(BaseModel):
+    """A review submitted by a guest who has stayed in the caravan."""
+    rating: int = Field(..., ge=1, le=5)
+    comment: str = Field("", max_length=2000)
+
+class ReviewOut(BaseModel):
+    """A review as returned by the API."""
+    review_id: int
+    user_id: int
+    caravan_id: int
+    rating: int
+    comment: str
+
+class ReviewPage(BaseModel):
+    """One page of a caravan's reviews, newest first, with the caravan's rating summary."""
+    items: List[ReviewOut]
+    next_cursor: Optional[str] = None
+    average_rating: float
+    review_count: int
+    rating_histogram: List[int]
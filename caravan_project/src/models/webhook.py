@@ -0,0 +1,29 @@
+from pydantic import BaseModel, Field, field_validator
+from typing import List, Literal, Optional, get_args
+
+from src.security import check_outbound_url
+
+# Events a host can subscribe to.
+WebhookEvent = Literal["reservation.confirmed"]
+
+class WebhookCreate(BaseModel):
+    """Model for registering a webhook. Fields provided by the host."""
+    url: str = Field(..., max_length=2000)
+    events: List[WebhookEvent] = Field(default_factory=lambda: list(get_args(WebhookEvent)))
+
+    @field_validator("url")
+    @classmethod
+    def url_must_be_well_formed(cls, url: str) -> str:
+        # Syntax only; which addresses may be targeted is decided at registration and delivery time.
+        check_outbound_url(url, allow_private=True)
+        return url
+
+class WebhookOut(WebhookCreate):
+    """Webhook as listed back to its host (without the signing secret)."""
+    webhook_id: Optional[int] = None
+    host_id: int
+    active: bool = True
+
+class Webhook(WebhookOut):
+    """Full webhook subscription. `secret` signs every delivery and is only shown once, on creation."""
+    secret: str
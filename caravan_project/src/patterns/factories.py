@@ -1,4 +1,5 @@
 
+import threading
 from datetime import date
 from src.models.reservation import Reservation
 
@@ -6,6 +7,8 @@ class ReservationFactory:
     """예약 객체 생성을 담당하는 팩토리"""
     
     _next_id = 1
+    # 여러 요청 스레드가 동시에 ID를 발급해도 중복되지 않도록 보호합니다.
+    _id_lock = threading.Lock()
 
     @classmethod
     def create_reservation(cls, user_id: int, caravan_id: int, start_date: date, end_date: date, total_price: float) -> Reservation:
@@ -13,8 +16,12 @@ class ReservationFactory:
         새로운 예약 객체를 생성하고 ID를 할당합니다.
         복잡한 초기화 로직이나 ID 생성 전략을 이 곳에 캡슐화할 수 있습니다.
         """
+        with cls._id_lock:
+            reservation_id = cls._next_id
+            cls._next_id += 1
+
         reservation = Reservation(
-            reservation_id=cls._next_id,
+            reservation_id=reservation_id,
             user_id=user_id,
             caravan_id=caravan_id,
             start_date=start_date,
@@ -22,5 +29,13 @@ class ReservationFactory:
             total_price=total_price,
             status='confirmed'  # 팩토리에서 초기 상태를 'confirmed'로 설정
         )
-        cls._next_id += 1
         return reservation
+
+    @classmethod
+    def ensure_next_id_after(cls, last_id: int):
+        """
+        이미 저장된 예약 ID와 겹치지 않도록 다음 ID를 last_id 이후로 맞춥니다.
+        재시작 후에도 데이터가 남아 있는 영속 저장소를 사용할 때 호출합니다.
+        """
+        with cls._id_lock:
+            cls._next_id = max(cls._next_id, last_id + 1)
@@ -1,5 +1,6 @@
 
 from abc import ABC, abstractmethod
+from collections import defaultdict
 from typing import List
 from src.services.notification_service import NotificationService
 
@@ -35,10 +36,16 @@ class UserNotifier(Observer):
 
     def update(self, subject, **kwargs):
         reservation = kwargs.get('reservation')
+        reservations = kwargs.get('reservations')
         if reservation:
             message = f"예약(ID: {reservation.reservation_id})이 성공적으로 확정되었습니다."
             # NotificationService를 통해 알림 전송
             self.notification_service.send(user_id=reservation.user_id, message=message)
+        elif reservations:
+            # 일괄 예약은 사용자에게 한 번만 알림
+            ids = ", ".join(str(r.reservation_id) for r in reservations)
+            message = f"예약 {len(reservations)}건(ID: {ids})이 성공적으로 확정되었습니다."
+            self.notification_service.send(user_id=reservations[0].user_id, message=message)
 
 class HostNotifier(Observer):
     """호스트에게 알림을 보내는 옵저버"""
@@ -48,14 +55,28 @@ class HostNotifier(Observer):
     def update(self, subject, **kwargs):
         reservation = kwargs.get('reservation')
         caravan = kwargs.get('caravan')
+        reservations = kwargs.get('reservations')
+        caravans = kwargs.get('caravans')
         if reservation and caravan:
             message = f"'{caravan.name}'에 대한 신규 예약(ID: {reservation.reservation_id})이 있습니다."
-            # NotificationService를 통해 알림 전송
-            self.notification_service.send(user_id=caravan.owner_id, message=message)
+            # NotificationService를 통해 알림 전송 (같은 호스트의 알림이 몰리면 요약으로 묶임)
+            self.notification_service.send(user_id=caravan.owner_id, message=message, coalesce=True)
+        elif reservations and caravans:
+            # 일괄 예약은 호스트별로 묶어서 한 번씩만 알림
+            by_host = defaultdict(list)
+            for res in reservations:
+                caravan = caravans.get(res.caravan_id)
+                if caravan:
+                    by_host[caravan.owner_id].append(f"'{caravan.name}'(예약 ID: {res.reservation_id})")
+            for host_id, entries in by_host.items():
+                message = f"신규 예약 {len(entries)}건이 있습니다: {', '.join(entries)}"
+                self.notification_service.send(user_id=host_id, message=message, coalesce=True)
 
 class StockManager(Observer):
     """재고 또는 카라반 상태를 관리하는 옵저버 (알림 서비스와 무관)"""
     def update(self, subject, **kwargs):
         caravan = kwargs.get('caravan')
-        if caravan:
-            print(f"   L [Stock] '{caravan.name}'(ID: {caravan.caravan_id})의 상태를 '예약됨'으로 변경합니다.")
+        caravans = kwargs.get('caravans') or {}
+        for caravan in ([caravan] if caravan else list(caravans.values())):
+            if caravan:
+                print(f"   L [Stock] '{caravan.name}'(ID: {caravan.caravan_id})의 상태를 '예약됨'으로 변경합니다.")
@@ -0,0 +1,99 @@
+
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Set, Tuple
+
+from src.models.reservation import Reservation
+
+class AvailabilityCalendar:
+    """
+    카라반별 점유 날짜를 일 단위 비트맵으로 관리하는 달력.
+    비트맵은 파이썬 정수로 표현되며, 비트 i가 1이면 epoch + i일 밤이 확정 예약으로 점유되었음을 의미합니다.
+    기간 조회는 시프트와 마스크 연산 몇 번으로 끝나므로 예약 수와 관계없이 일정한 시간에 처리됩니다.
+    """
+    def __init__(self, epoch: date):
+        self.epoch = epoch
+        self._bitmaps: Dict[int, int] = {}
+        # reservation_id -> 비트맵에 표시된 (caravan_id, start_date, end_date)
+        self._marked: Dict[int, Tuple[int, date, date]] = {}
+        # caravan_id -> 비트맵에 표시된 reservation_id 집합
+        self._marked_by_caravan: Dict[int, Set[int]] = {}
+
+    def _mask(self, start_date: date, end_date: date) -> int:
+        """[start_date, end_date) 기간에 해당하는 비트 마스크를 만듭니다. epoch 이전 날짜는 잘라냅니다."""
+        first = max((start_date - self.epoch).days, 0)
+        last = (end_date - self.epoch).days
+        if last <= first:
+            return 0
+        return ((1 << (last - first)) - 1) << first
+
+    def apply(self, reservation: Reservation):
+        """예약의 현재 상태를 반영합니다. 확정 예약만 비트맵에 표시됩니다."""
+        self.remove(reservation.reservation_id)
+        if reservation.status != 'confirmed':
+            return
+        mask = self._mask(reservation.start_date, reservation.end_date)
+        if mask:
+            self._bitmaps[reservation.caravan_id] = self._bitmaps.get(reservation.caravan_id, 0) | mask
+            self._marked[reservation.reservation_id] = (
+                reservation.caravan_id, reservation.start_date, reservation.end_date
+            )
+            self._marked_by_caravan.setdefault(reservation.caravan_id, set()).add(reservation.reservation_id)
+
+    def remove(self, reservation_id: int):
+        """
+        예약이 표시한 날짜를 비트맵에서 지웁니다.
+        겹치는 확정 예약이 있을 수 있으므로, 지운 구간에 걸친 같은 카라반의 다른 예약은 다시 표시합니다.
+        """
+        marked = self._marked.pop(reservation_id, None)
+        if marked is None:
+            return
+        caravan_id, start_date, end_date = marked
+        others = self._marked_by_caravan[caravan_id]
+        others.discard(reservation_id)
+        if not others:
+            del self._marked_by_caravan[caravan_id]
+        mask = self._mask(start_date, end_date)
+        bitmap = self._bitmaps.get(caravan_id, 0) & ~mask
+        for other_id in others:
+            _, other_start, other_end = self._marked[other_id]
+            if other_start < end_date and other_end > start_date:
+                bitmap |= self._mask(other_start, other_end) & mask
+        if bitmap:
+            self._bitmaps[caravan_id] = bitmap
+        else:
+            self._bitmaps.pop(caravan_id, None)
+
+    def clear(self):
+        self._bitmaps.clear()
+        self._marked.clear()
+        self._marked_by_caravan.clear()
+
+    def occupancy(self, caravan_id: int, start_date: date, days: int) -> int:
+        """start_date부터 days일 동안의 점유 비트맵을 반환합니다 (비트 0 = start_date)."""
+        offset = (start_date - self.epoch).days
+        bitmap = self._bitmaps.get(caravan_id, 0)
+        window = bitmap >> offset if offset >= 0 else bitmap << -offset
+        return window & ((1 << days) - 1)
+
+    def free_ranges(self, caravan_id: int, start_date: date, days: int) -> List[Tuple[date, date]]:
+        """start_date부터 days일 동안 예약 가능한 연속 기간 [시작일, 체크아웃일) 목록을 반환합니다."""
+        free = ~self.occupancy(caravan_id, start_date, days) & ((1 << days) - 1)
+        ranges = []
+        position = 0
+        while free:
+            # 가장 낮은 1비트(빈 날)부터, 그 위로 이어지는 1비트 구간의 길이를 구합니다.
+            skip = (free & -free).bit_length() - 1
+            free >>= skip
+            run = (~free & (free + 1)).bit_length() - 1
+            ranges.append((
+                start_date + timedelta(days=position + skip),
+                start_date + timedelta(days=position + skip + run),
+            ))
+            free >>= run
+            position += skip + run
+        return ranges
+
+    def grid(self, caravan_ids: Iterable[int], start_date: date, days: int) -> List[int]:
+        """여러 카라반의 start_date부터 days일 동안의 빈 날 비트맵 목록을 반환합니다 (비트 i = 1이면 예약 가능)."""
+        full = (1 << days) - 1
+        return [~self.occupancy(caravan_id, start_date, days) & full for caravan_id in caravan_ids]
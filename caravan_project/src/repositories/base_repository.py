@@ -1,16 +1,93 @@
 
-from typing import TypeVar, Generic, Dict, Optional
+import threading
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Any, Callable, TypeVar, Generic, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple, Union
 
 T = TypeVar('T')
 
+@dataclass(frozen=True)
+class Index:
+    """
+    저장소 보조 인덱스 선언.
+    하나 이상의 모델 필드를 키로 사용하며, unique=True이면 키당 하나의 엔티티만 허용합니다.
+    """
+    fields: Tuple[str, ...]
+    unique: bool = False
+
+@dataclass(frozen=True)
+class RangeIndex:
+    """
+    범위 조회 및 정렬용 인덱스 선언.
+    필드 값 순서로 정렬된 목록을 유지하여 범위 조회와 정렬된 순회를 정렬 없이 처리합니다.
+    """
+    field: str
+
+class _SortedColumn:
+    """RangeIndex의 저장 구조: (값, entity_id) 순으로 정렬된 키와, 같은 순서의 entity_id 목록"""
+    def __init__(self):
+        self.keys: List[Tuple[Any, int]] = []
+        self.ids: List[int] = []
+
+    def add(self, value: Any, entity_id: int):
+        position = bisect_left(self.keys, (value, entity_id))
+        self.keys.insert(position, (value, entity_id))
+        self.ids.insert(position, entity_id)
+
+    def remove(self, value: Any, entity_id: int):
+        position = bisect_left(self.keys, (value, entity_id))
+        if position < len(self.keys) and self.keys[position] == (value, entity_id):
+            del self.keys[position]
+            del self.ids[position]
+
+    def clear(self):
+        self.keys.clear()
+        self.ids.clear()
+
 class BaseRepository(Generic[T]):
     """
     제네릭 저장소 클래스.
     딕셔너리를 사용하여 ID 기반으로 데이터를 효율적으로 관리 (O(1) 시간 복잡도).
+    선언된 보조 인덱스는 저장/삭제 시 함께 갱신되어 find_by()를 O(1)에 처리합니다.
+    등록된 리스너는 모든 저장/삭제 이벤트를 전달받습니다 (영속화, 캐시 무효화 등에 사용).
+    데이터와 인덱스 변경은 짧은 재진입 잠금 안에서 수행되어 여러 요청 스레드에서 안전하게 사용할 수 있습니다.
     """
-    def __init__(self):
+    # 하위 클래스에서 선언하는 보조 인덱스 목록
+    indexes: Tuple[Union[Index, RangeIndex], ...] = ()
+
+    def __init__(self, indexes: Iterable[Union[Index, RangeIndex]] = ()):
         self._data: Dict[int, T] = {}
         self._next_id: int = 1
+        self._lock = threading.RLock()
+
+        self._indexes: Dict[FrozenSet[str], Index] = {}
+        # 필드 -> 값 순서로 정렬된 (값, entity_id) 목록
+        self._range_data: Dict[str, _SortedColumn] = {}
+        self._range_indexes: Dict[str, RangeIndex] = {}
+        for index in (*self.indexes, *indexes):
+            if isinstance(index, RangeIndex):
+                self._range_indexes[index.field] = index
+                self._range_data[index.field] = _SortedColumn()
+            else:
+                self._indexes[frozenset(index.fields)] = index
+        # 인덱스별 키 -> entity_id (unique) 또는 키 -> {entity_id: None} (다중 값, 삽입 순서 유지)
+        self._index_data: Dict[Index, Dict[tuple, Any]] = {index: {} for index in self._indexes.values()}
+        # entity_id -> 인덱스별로 등록된 키 (RangeIndex는 필드 값)
+        # 엔티티가 제자리에서 변경되어도 이전 키를 찾아 제거할 수 있도록 보관합니다.
+        self._index_keys: Dict[int, Dict[Union[Index, RangeIndex], Any]] = {}
+        # listener(event, entity_id, entity) - event는 'save', 'delete', 'clear' 중 하나
+        self._listeners: List[Callable[[str, Optional[int], Optional[T]], None]] = []
+        # 저장/삭제될 때마다 증가하는 버전 번호 (응답 캐시 무효화에 사용)
+        self.version: int = 0
+
+    def add_listener(self, listener: Callable[[str, Optional[int], Optional[T]], None]):
+        """저장/삭제 이벤트를 전달받을 리스너를 등록합니다."""
+        self._listeners.append(listener)
+
+    def _emit(self, event: str, entity_id: Optional[int], entity: Optional[T]):
+        self.version += 1
+        for listener in self._listeners:
+            listener(event, entity_id, entity)
 
     def find_by_id(self, entity_id: int) -> Optional[T]:
         """ID로 엔티티를 검색합니다."""
@@ -18,16 +95,241 @@ class BaseRepository(Generic[T]):
 
     def save(self, entity: T) -> T:
         """엔티티를 저장합니다. ID가 없으면 새로 할당합니다."""
-        entity_id = getattr(entity, 'id', None) or getattr(entity, f"{type(entity).__name__.lower()}_id")
-
-        if entity_id is None:
-            entity_id = self._next_id
-            setattr(entity, f"{type(entity).__name__.lower()}_id", entity_id)
-            self._next_id += 1
-        
-        self._data[entity_id] = entity
+        with self._lock:
+            entity_id = self._get_entity_id(entity)
+            self._check_unique(entity, entity_id)
+
+            if entity_id is None:
+                entity_id = self._next_id
+                setattr(entity, f"{type(entity).__name__.lower()}_id", entity_id)
+            # 직접 지정된 ID와 이후 자동 할당 ID가 겹치지 않도록 시퀀스를 맞춥니다.
+            self._next_id = max(self._next_id, entity_id + 1)
+
+            self._data[entity_id] = entity
+            self._reindex(entity_id, entity)
+            self._emit('save', entity_id, entity)
         return entity
 
+    def delete(self, entity_id: int) -> bool:
+        """ID로 엔티티를 삭제합니다. 존재하지 않으면 False를 반환합니다."""
+        with self._lock:
+            if entity_id not in self._data:
+                return False
+            self._unindex(entity_id)
+            del self._data[entity_id]
+            self._emit('delete', entity_id, None)
+        return True
+
+    def clear(self):
+        """모든 엔티티와 인덱스를 비웁니다."""
+        with self._lock:
+            self._data.clear()
+            self._index_keys.clear()
+            for entries in self._index_data.values():
+                entries.clear()
+            for column in self._range_data.values():
+                column.clear()
+            self._emit('clear', None, None)
+
     def get_all(self) -> list[T]:
         """모든 엔티티를 리스트로 반환합니다."""
         return list(self._data.values())
+
+    def max_id(self) -> int:
+        """저장된 엔티티 중 가장 큰 ID를 반환합니다. 비어 있으면 0을 반환합니다."""
+        return max(self._data, default=0)
+
+    def find_by(self, **criteria) -> List[T]:
+        """
+        필드 값이 모두 일치하는 엔티티를 조회합니다.
+        해당 필드 조합에 선언된 인덱스가 있으면 O(1)로, 없으면 전체 순회로 처리합니다.
+        """
+        index = self._indexes.get(frozenset(criteria))
+        if index is None:
+            return [
+                entity for entity in self._data.values()
+                if all(getattr(entity, field) == value for field, value in criteria.items())
+            ]
+
+        with self._lock:
+            entries = self._index_data[index].get(tuple(criteria[field] for field in index.fields))
+            if entries is None:
+                return []
+            if index.unique:
+                return [self._data[entries]]
+            return [self._data[entity_id] for entity_id in entries]
+
+    def find_one_by(self, **criteria) -> Optional[T]:
+        """필드 값이 모두 일치하는 첫 번째 엔티티를 조회합니다."""
+        index = self._indexes.get(frozenset(criteria))
+        if index is None:
+            matches = self.find_by(**criteria)
+            return matches[0] if matches else None
+
+        with self._lock:
+            entries = self._index_data[index].get(tuple(criteria[field] for field in index.fields))
+            if entries is None:
+                return None
+            if index.unique:
+                return self._data[entries]
+            return self._data[next(iter(entries))]
+
+    def find_ids_by(self, **criteria) -> List[int]:
+        """필드 값이 모두 일치하는 엔티티의 ID 목록을 조회합니다. (엔티티를 만들지 않는 find_by)"""
+        index = self._indexes.get(frozenset(criteria))
+        if index is None:
+            return [self._get_entity_id(entity) for entity in self.find_by(**criteria)]
+        with self._lock:
+            entries = self._index_data[index].get(tuple(criteria[field] for field in index.fields))
+            if entries is None:
+                return []
+            return [entries] if index.unique else list(entries)
+
+    def count_by(self, **criteria) -> int:
+        """find_ids_by()와 같은 조건에 맞는 엔티티 수를 ID 목록을 만들지 않고 반환합니다."""
+        index = self._indexes.get(frozenset(criteria))
+        if index is None:
+            return len(self.find_by(**criteria))
+        with self._lock:
+            entries = self._index_data[index].get(tuple(criteria[field] for field in index.fields))
+            if entries is None:
+                return 0
+            return 1 if index.unique else len(entries)
+
+    def find_ids_in_range(self, field: str, low: Any = None, high: Any = None) -> List[int]:
+        """필드 값이 [low, high] 범위(양 끝 포함, None이면 제한 없음)인 엔티티 ID를 값 순서로 조회합니다."""
+        column = self._range_data.get(field)
+        if column is None:
+            return [
+                entity_id for value, entity_id in self._scan_sorted(field)
+                if (low is None or value >= low) and (high is None or value <= high)
+            ]
+        with self._lock:
+            start, end = self._range_bounds(column, low, high)
+            return column.ids[start:end]
+
+    def count_in_range(self, field: str, low: Any = None, high: Any = None) -> int:
+        """find_ids_in_range()와 같은 범위의 엔티티 수를 반환합니다. (RangeIndex가 있으면 O(log n))"""
+        column = self._range_data.get(field)
+        if column is None:
+            return len(self.find_ids_in_range(field, low, high))
+        with self._lock:
+            start, end = self._range_bounds(column, low, high)
+            return end - start
+
+    @staticmethod
+    def _range_bounds(column: _SortedColumn, low: Any, high: Any) -> Tuple[int, int]:
+        start = 0 if low is None else bisect_left(column.keys, (low,))
+        end = len(column.keys) if high is None else bisect_right(column.keys, (high, float('inf')))
+        return start, end
+
+    def sorted_ids(self, field: str, descending: bool = False) -> List[int]:
+        """전체 엔티티 ID를 필드 값 순서로 반환합니다 (값이 같으면 ID 순서)."""
+        return list(self.iter_sorted_ids(field, descending))
+
+    def iter_sorted_ids(self, field: str, descending: bool = False, chunk: int = 256) -> Iterator[int]:
+        """
+        sorted_ids()와 같은 순서로 ID를 순회합니다.
+        정렬 목록 전체를 복사하지 않고, 잠금 안에서 chunk개씩 잘라 읽은 뒤 마지막 (값, ID) 다음부터 이어 읽습니다.
+        순회 중에 저장/삭제가 일어나도 이미 돌려준 항목이 반복되지 않습니다.
+        """
+        column = self._range_data.get(field)
+        if column is None:
+            keys = self._scan_sorted(field)
+            yield from (entity_id for _, entity_id in (reversed(keys) if descending else keys))
+            return
+        after = None
+        while True:
+            with self._lock:
+                if not descending:
+                    start = 0 if after is None else bisect_right(column.keys, after)
+                    end = min(start + chunk, len(column.keys))
+                else:
+                    end = len(column.keys) if after is None else bisect_left(column.keys, after)
+                    start = max(end - chunk, 0)
+                if start >= end:
+                    return
+                after = column.keys[start] if descending else column.keys[end - 1]
+                ids = column.ids[start:end]
+            yield from (reversed(ids) if descending else ids)
+
+    def page_ids(self, field: str, after: Optional[Tuple[Any, int]] = None, limit: int = 20,
+                 descending: bool = False) -> List[int]:
+        """
+        키셋 페이지네이션: (필드 값, ID) 순서에서 after 바로 다음(내림차순이면 바로 앞)부터 최대 limit개의 ID를 반환합니다.
+        앞 페이지에 저장/삭제가 일어나도 이미 본 항목이 반복되거나 건너뛰어지지 않습니다.
+        """
+        column = self._range_data.get(field)
+        if column is None:
+            keys = self._scan_sorted(field)
+            return self._slice_after(keys, [entity_id for _, entity_id in keys], after, limit, descending)
+        with self._lock:
+            return self._slice_after(column.keys, column.ids, after, limit, descending)
+
+    @staticmethod
+    def _slice_after(keys: List[Tuple[Any, int]], ids: List[int], after: Optional[Tuple[Any, int]],
+                     limit: int, descending: bool) -> List[int]:
+        if not descending:
+            start = 0 if after is None else bisect_right(keys, tuple(after))
+            return ids[start:start + limit]
+        end = len(keys) if after is None else bisect_left(keys, tuple(after))
+        return ids[max(end - limit, 0):end][::-1]
+
+    def _scan_sorted(self, field: str) -> List[Tuple[Any, int]]:
+        """RangeIndex가 없는 필드를 위한 전체 순회 + 정렬"""
+        return sorted(
+            (getattr(entity, field), entity_id) for entity_id, entity in list(self._data.items())
+            if getattr(entity, field) is not None
+        )
+
+    def _get_entity_id(self, entity: T) -> Optional[int]:
+        return getattr(entity, 'id', None) or getattr(entity, f"{type(entity).__name__.lower()}_id")
+
+    def _check_unique(self, entity: T, entity_id: Optional[int]):
+        """unique 인덱스 키가 다른 엔티티와 충돌하면 ValueError를 발생시킵니다."""
+        for index, entries in self._index_data.items():
+            if not index.unique:
+                continue
+            key = tuple(getattr(entity, field) for field in index.fields)
+            owner_id = entries.get(key)
+            if owner_id is not None and owner_id != entity_id:
+                raise ValueError(f"Duplicate value for unique index {index.fields}: {key}")
+
+    def _reindex(self, entity_id: int, entity: T):
+        """엔티티의 현재 필드 값으로 모든 인덱스를 다시 등록합니다."""
+        self._unindex(entity_id)
+        keys = {}
+        for index, entries in self._index_data.items():
+            key = tuple(getattr(entity, field) for field in index.fields)
+            if index.unique:
+                entries[key] = entity_id
+            else:
+                entries.setdefault(key, {})[entity_id] = None
+            keys[index] = key
+        for field, column in self._range_data.items():
+            value = getattr(entity, field)
+            if value is not None:
+                column.add(value, entity_id)
+                keys[self._range_indexes[field]] = value
+        if keys:
+            self._index_keys[entity_id] = keys
+
+    def _unindex(self, entity_id: int):
+        """엔티티를 모든 인덱스에서 제거합니다."""
+        keys = self._index_keys.pop(entity_id, None)
+        if keys is None:
+            return
+        for index, key in keys.items():
+            if isinstance(index, RangeIndex):
+                self._range_data[index.field].remove(key, entity_id)
+                continue
+            entries = self._index_data[index]
+            if index.unique:
+                if entries.get(key) == entity_id:
+                    del entries[key]
+            else:
+                ids = entries.get(key)
+                if ids is not None:
+                    ids.pop(entity_id, None)
+                    if not ids:
+                        del entries[key]
@@ -0,0 +1,19 @@
+
+from src.models.caravan import Caravan
+from .base_repository import BaseRepository, Index, RangeIndex
+
+class CaravanRepository(BaseRepository[Caravan]):
+    """
+    카라반 데이터에 특화된 저장소.
+    검색 조건으로 쓰이는 속성은 값 인덱스로, 범위 조건과 정렬에 쓰이는 속성은 정렬 인덱스로 관리합니다.
+    """
+    indexes = (
+        Index(('location',)),
+        Index(('type',)),
+        Index(('owner_id',)),
+        Index(('is_available',)),
+        RangeIndex('price_per_day'),
+        RangeIndex('sleeps'),
+        RangeIndex('average_rating'),
+        RangeIndex('caravan_id'),
+    )
@@ -0,0 +1,64 @@
+
+from bisect import bisect_left
+from datetime import date
+from typing import Iterator, List, Tuple
+
+class IntervalIndex:
+    """
+    한 카라반의 확정된 숙박 기간을 시작일 기준으로 정렬하여 보관하는 인덱스.
+    위치마다 그때까지의 최대 종료일을 함께 보관하므로, 정렬된 목록에서 이분 탐색만으로
+    O(log n)에 날짜 충돌 여부를 판단할 수 있습니다.
+    저장/불러오기/복구 과정에서 서로 겹치는 확정 숙박이 들어와도 결과는 정확합니다.
+    """
+    def __init__(self):
+        # (start_date, reservation_id) 기준으로 정렬된 키와, 같은 위치의 종료일
+        self._keys: List[Tuple[date, int]] = []
+        self._ends: List[date] = []
+        # _max_ends[i] = max(_ends[0..i])
+        self._max_ends: List[date] = []
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __iter__(self) -> Iterator[Tuple[int, date, date]]:
+        """(reservation_id, start_date, end_date)를 시작일 순서로 반환합니다."""
+        for (start_date, reservation_id), end_date in zip(self._keys, self._ends):
+            yield reservation_id, start_date, end_date
+
+    def add(self, reservation_id: int, start_date: date, end_date: date):
+        """숙박 기간을 정렬 순서를 유지하며 추가합니다."""
+        key = (start_date, reservation_id)
+        position = bisect_left(self._keys, key)
+        self._keys.insert(position, key)
+        self._ends.insert(position, end_date)
+        self._max_ends.insert(position, end_date)
+        self._refresh_max_ends(position)
+
+    def remove(self, reservation_id: int, start_date: date) -> bool:
+        """숙박 기간을 제거합니다. 존재하지 않으면 False를 반환합니다."""
+        key = (start_date, reservation_id)
+        position = bisect_left(self._keys, key)
+        if position < len(self._keys) and self._keys[position] == key:
+            del self._keys[position]
+            del self._ends[position]
+            del self._max_ends[position]
+            self._refresh_max_ends(position)
+            return True
+        return False
+
+    def overlaps(self, start_date: date, end_date: date) -> bool:
+        """
+        [start_date, end_date) 기간과 겹치는 숙박이 있는지 확인합니다.
+        end_date 이전에 시작하는 숙박 중 가장 늦게 끝나는 것만 확인하면 충분합니다.
+        """
+        position = bisect_left(self._keys, (end_date,))
+        return position > 0 and self._max_ends[position - 1] > start_date
+
+    def _refresh_max_ends(self, position: int):
+        """position부터 최대 종료일을 다시 계산합니다. 이전 값과 같아지는 지점부터는 뒤쪽도 그대로이므로 멈춥니다."""
+        running = self._max_ends[position - 1] if position > 0 else date.min
+        for i in range(position, len(self._ends)):
+            running = max(running, self._ends[i])
+            if i > position and self._max_ends[i] == running:
+                break
+            self._max_ends[i] = running
@@ -0,0 +1,199 @@
+
+import math
+import threading
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .poi_spatial_index import ranges_to_indices
+
+# 256px 타일 하나를 2^SUBDIVISION_BITS x 2^SUBDIVISION_BITS 셀로 나눕니다 (셀 하나 = 64px).
+SUBDIVISION_BITS = 2
+MAX_ZOOM = 16
+# 웹 메르카토르 투영이 정의되는 위도 범위
+MAX_LATITUDE = 85.05112878
+
+class ClusterHit(NamedTuple):
+    """조회된 클러스터. count가 1이면 member에 해당 점의 ID가 들어 있습니다."""
+    count: int
+    latitude: float
+    longitude: float
+    member: Optional[int]
+
+
+def mercator_xy(latitudes, longitudes) -> Tuple[np.ndarray, np.ndarray]:
+    """위경도를 [0, 1) 범위의 웹 메르카토르 좌표로 변환합니다 (y는 북쪽이 0)."""
+    latitudes = np.clip(np.asarray(latitudes, dtype=np.float64), -MAX_LATITUDE, MAX_LATITUDE)
+    longitudes = np.asarray(longitudes, dtype=np.float64)
+    x = (longitudes + 180) / 360
+    sin = np.sin(np.radians(latitudes))
+    y = 0.5 - np.log((1 + sin) / (1 - sin)) / (4 * math.pi)
+    return np.clip(x, 0, 1 - 1e-12), np.clip(y, 0, 1 - 1e-12)
+
+
+def _cell_ranges(zoom: int, min_lat: float, min_lon: float, max_lat: float, max_lon: float):
+    """경계 상자를 덮는 셀의 행 범위와 열 구간 목록을 구합니다. 날짜변경선을 넘으면 열 구간이 둘입니다."""
+    cells = 1 << (zoom + SUBDIVISION_BITS)
+    (x_lo, x_hi), (y_top, y_bottom) = mercator_xy([max_lat, min_lat], [min_lon, max_lon])
+    ix_lo, ix_hi = int(x_lo * cells), int(x_hi * cells)
+    iy_lo, iy_hi = int(y_top * cells), int(y_bottom * cells)
+    if min_lon <= max_lon:
+        col_ranges = [(ix_lo, ix_hi)]
+    else:
+        col_ranges = [(ix_lo, cells - 1), (0, ix_hi)]
+    return cells, iy_lo, iy_hi, col_ranges
+
+
+class ClusterPyramid:
+    """
+    정적인 점 집합(POI)에 대한 줌 레벨별 격자 클러스터 피라미드.
+    줌 z의 셀은 줌 z+1의 2x2 셀을 정확히 포함하므로, 최대 줌에서 점을 셀별로 모은 뒤
+    한 단계씩 부모 셀로 합쳐 올라가며 모든 레벨을 NumPy 연산으로 만듭니다.
+    각 레벨은 정렬된 셀 번호와 개수, 중심 좌표, 대표 점 ID 배열을 가집니다.
+    """
+    def __init__(self, latitudes: Sequence[float], longitudes: Sequence[float],
+                 ids: Optional[Sequence[int]] = None, max_zoom: int = MAX_ZOOM):
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+        ids = np.arange(len(latitudes)) if ids is None else np.asarray(ids, dtype=np.int64)
+        self.max_zoom = max_zoom
+
+        cells = 1 << (max_zoom + SUBDIVISION_BITS)
+        x, y = mercator_xy(latitudes, longitudes)
+        keys = (y * cells).astype(np.int64) * cells + (x * cells).astype(np.int64)
+        levels = [self._aggregate(keys, np.ones(len(keys), dtype=np.int64), latitudes, longitudes, ids)]
+        for zoom in range(max_zoom - 1, -1, -1):
+            child_keys, counts, lat_sums, lon_sums, members = levels[-1]
+            child_cells = 1 << (zoom + 1 + SUBDIVISION_BITS)
+            # 부모 셀 = (행 >> 1, 열 >> 1)
+            parent_keys = ((child_keys // child_cells) >> 1) * (child_cells >> 1) + ((child_keys % child_cells) >> 1)
+            levels.append(self._aggregate(parent_keys, counts, lat_sums, lon_sums, members))
+        # levels[z] = 줌 z
+        self._levels = levels[::-1]
+
+    @staticmethod
+    def _aggregate(keys, counts, lat_sums, lon_sums, members):
+        unique, inverse = np.unique(keys, return_inverse=True)
+        size = len(unique)
+        merged_members = np.full(size, np.iinfo(np.int64).max, dtype=np.int64)
+        np.minimum.at(merged_members, inverse, members)
+        return (
+            unique,
+            np.bincount(inverse, weights=counts, minlength=size).astype(np.int64),
+            np.bincount(inverse, weights=lat_sums, minlength=size),
+            np.bincount(inverse, weights=lon_sums, minlength=size),
+            merged_members,
+        )
+
+    def query(self, zoom: int, min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> List[ClusterHit]:
+        """경계 상자와 겹치는 줌 레벨 zoom의 클러스터를 반환합니다."""
+        zoom = min(max(zoom, 0), self.max_zoom)
+        keys, counts, lat_sums, lon_sums, members = self._levels[zoom]
+        cells, iy_lo, iy_hi, col_ranges = _cell_ranges(zoom, min_lat, min_lon, max_lat, max_lon)
+        rows = np.arange(iy_lo, iy_hi + 1, dtype=np.int64) * cells
+        starts, ends = [], []
+        for ix_lo, ix_hi in col_ranges:
+            starts.append(np.searchsorted(keys, rows + ix_lo, side='left'))
+            ends.append(np.searchsorted(keys, rows + ix_hi, side='right'))
+        positions = ranges_to_indices(np.concatenate(starts), np.concatenate(ends))
+
+        hits = []
+        for count, lat_sum, lon_sum, member in zip(
+            counts[positions].tolist(), lat_sums[positions].tolist(),
+            lon_sums[positions].tolist(), members[positions].tolist(),
+        ):
+            hits.append(ClusterHit(count, lat_sum / count, lon_sum / count, member if count == 1 else None))
+        return hits
+
+
+class IncrementalClusterGrid:
+    """
+    추가/삭제가 잦은 점 집합(카라반)을 위한 줌 레벨별 격자 클러스터.
+    ClusterPyramid와 같은 셀 구조를 사용하며, 셀마다 (개수, 위도 합, 경도 합, ID 합)을 보관하여
+    점 하나를 추가/삭제할 때 레벨마다 셀 하나만 갱신합니다.
+    개수가 1인 셀은 ID 합이 곧 그 점의 ID입니다.
+    """
+    def __init__(self, max_zoom: int = MAX_ZOOM):
+        self.max_zoom = max_zoom
+        self._levels: List[Dict[int, List[float]]] = [{} for _ in range(max_zoom + 1)]
+        # point_id -> (위도, 경도, 최대 줌에서의 (ix, iy))
+        self._points: Dict[int, Tuple[float, float, int, int]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def add(self, point_id: int, latitude: float, longitude: float):
+        """점을 추가합니다. 이미 있는 ID면 위치를 옮깁니다."""
+        cells = 1 << (self.max_zoom + SUBDIVISION_BITS)
+        x, y = mercator_xy([latitude], [longitude])
+        ix, iy = int(x[0] * cells), int(y[0] * cells)
+        with self._lock:
+            self._remove(point_id)
+            self._points[point_id] = (latitude, longitude, ix, iy)
+            self._update(point_id, latitude, longitude, ix, iy, 1)
+
+    def remove(self, point_id: int):
+        with self._lock:
+            self._remove(point_id)
+
+    def clear(self):
+        with self._lock:
+            self._points.clear()
+            for level in self._levels:
+                level.clear()
+
+    def on_repository_event(self, event: str, entity_id: Optional[int], entity):
+        """저장소 리스너: latitude/longitude가 있는 엔티티만 클러스터에 반영합니다."""
+        if event == 'clear':
+            self.clear()
+        elif event == 'delete' or entity.latitude is None or entity.longitude is None:
+            self.remove(entity_id)
+        else:
+            self.add(entity_id, entity.latitude, entity.longitude)
+
+    def _remove(self, point_id: int):
+        point = self._points.pop(point_id, None)
+        if point is not None:
+            self._update(point_id, *point, -1)
+
+    def _update(self, point_id: int, latitude: float, longitude: float, ix: int, iy: int, sign: int):
+        for zoom, level in enumerate(self._levels):
+            shift = self.max_zoom - zoom
+            cells = 1 << (zoom + SUBDIVISION_BITS)
+            key = (iy >> shift) * cells + (ix >> shift)
+            cell = level.get(key)
+            if cell is None:
+                cell = level[key] = [0, 0.0, 0.0, 0]
+            cell[0] += sign
+            cell[1] += sign * latitude
+            cell[2] += sign * longitude
+            cell[3] += sign * point_id
+            if cell[0] == 0:
+                del level[key]
+
+    def query(self, zoom: int, min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> List[ClusterHit]:
+        """경계 상자와 겹치는 줌 레벨 zoom의 클러스터를 반환합니다."""
+        zoom = min(max(zoom, 0), self.max_zoom)
+        cells, iy_lo, iy_hi, col_ranges = _cell_ranges(zoom, min_lat, min_lon, max_lat, max_lon)
+        with self._lock:
+            level = self._levels[zoom]
+            box_cells = (iy_hi - iy_lo + 1) * sum(ix_hi - ix_lo + 1 for ix_lo, ix_hi in col_ranges)
+            if box_cells <= len(level):
+                # 상자 안의 셀이 적으면 셀을 직접 찾아봅니다.
+                entries = [
+                    (key, level[key]) for iy in range(iy_lo, iy_hi + 1)
+                    for ix_lo, ix_hi in col_ranges for key in range(iy * cells + ix_lo, iy * cells + ix_hi + 1)
+                    if key in level
+                ]
+            else:
+                # 채워진 셀이 더 적으면 채워진 셀을 훑습니다.
+                entries = [
+                    (key, cell) for key, cell in level.items()
+                    if iy_lo <= key // cells <= iy_hi
+                    and any(ix_lo <= key % cells <= ix_hi for ix_lo, ix_hi in col_ranges)
+                ]
+            return [
+                ClusterHit(cell[0], cell[1] / cell[0], cell[2] / cell[0], cell[3] if cell[0] == 1 else None)
+                for _, cell in sorted(entries)
+            ]
@@ -0,0 +1,334 @@
+
+import glob
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Generic, Iterator, List, Optional, Tuple, Type, TypeVar
+
+from .base_repository import BaseRepository
+from .serialization import decode_entity, encode_entity
+
+T = TypeVar('T')
+
+# --- 파일 포맷 ---
+# 저널: [magic 8B][generation u64] 이후 레코드 반복
+#       레코드 = [payload 길이 u32][payload crc32 u32][op u8][entity_id i64][엔티티 JSON]
+# 스냅샷: [magic 8B][generation u64][count u64] + count개의 [entity_id i64][offset u64][length u32] + 엔티티 JSON 영역
+_JOURNAL_MAGIC = b'CVJRNL01'
+_SNAPSHOT_MAGIC = b'CVSNAP01'
+_FILE_HEADER = struct.Struct('<8sQ')
+_RECORD_HEADER = struct.Struct('<II')
+_RECORD_OP = struct.Struct('<Bq')
+_SNAPSHOT_COUNT = struct.Struct('<Q')
+_SNAPSHOT_ENTRY = struct.Struct('<qQI')
+
+OP_SAVE = 1
+OP_DELETE = 2
+OP_CLEAR = 3
+
+_EVENT_OPS = {'save': OP_SAVE, 'delete': OP_DELETE, 'clear': OP_CLEAR}
+
+
+@dataclass
+class JournalStats:
+    """저널 쓰기 비용 측정값"""
+    records: int = 0
+    bytes_written: int = 0
+    fsyncs: int = 0
+    write_seconds: float = 0.0
+    fsync_seconds: float = 0.0
+
+
+@dataclass
+class RecoveryStats:
+    """시작 시 상태 복구 측정값"""
+    snapshot_generation: int = 0
+    snapshot_entities: int = 0
+    journal_records: int = 0
+    snapshot_load_seconds: float = 0.0
+    journal_replay_seconds: float = 0.0
+
+    @property
+    def total_seconds(self) -> float:
+        return self.snapshot_load_seconds + self.journal_replay_seconds
+
+
+class Journal:
+    """
+    저장/삭제 연산을 기록하는 append-only 저널 파일.
+    레코드마다 길이와 CRC를 앞에 붙여, 쓰다가 중단된 마지막 레코드를 복구 시 감지할 수 있습니다.
+    fsync는 fsync_batch개의 레코드 또는 fsync_interval초마다 한 번씩 묶어서 수행합니다.
+    """
+    def __init__(self, path: str, generation: int, stats: JournalStats,
+                 fsync_batch: int = 64, fsync_interval: float = 0.05):
+        self.path = path
+        self.generation = generation
+        self._stats = stats
+        self._fsync_batch = fsync_batch
+        self._fsync_interval = fsync_interval
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+        is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._file = open(path, 'ab')
+        if is_new:
+            self._file.write(_FILE_HEADER.pack(_JOURNAL_MAGIC, generation))
+            self.sync()
+
+    def append(self, op: int, entity_id: Optional[int], payload: bytes = b''):
+        """레코드를 추가합니다. 프로세스 장애에 대비해 매번 OS 버퍼까지 flush합니다."""
+        started = time.perf_counter()
+        body = _RECORD_OP.pack(op, entity_id or 0) + payload
+        record = _RECORD_HEADER.pack(len(body), zlib.crc32(body)) + body
+        self._file.write(record)
+        self._file.flush()
+        self._unsynced += 1
+        self._stats.records += 1
+        self._stats.bytes_written += len(record)
+        self._stats.write_seconds += time.perf_counter() - started
+
+        if self._unsynced >= self._fsync_batch or time.monotonic() - self._last_sync >= self._fsync_interval:
+            self.sync()
+
+    def sync(self):
+        """버퍼에 남은 레코드를 디스크에 fsync합니다."""
+        started = time.perf_counter()
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._stats.fsyncs += 1
+        self._stats.fsync_seconds += time.perf_counter() - started
+
+    def close(self):
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+    @staticmethod
+    def read(path: str) -> Tuple[int, List[Tuple[int, int, bytes]]]:
+        """
+        저널 파일의 (generation, [(op, entity_id, payload), ...])를 반환합니다.
+        잘리거나 손상된 마지막 레코드 이후는 버리고 파일을 유효한 길이로 잘라냅니다.
+        """
+        with open(path, 'rb') as f:
+            data = f.read()
+        if len(data) < _FILE_HEADER.size:
+            # 헤더를 쓰기 전에 중단된 저널: 빈 파일로 되돌리면 다시 열 때 헤더가 기록됩니다.
+            with open(path, 'r+b') as f:
+                f.truncate(0)
+            return 0, []
+        magic, generation = _FILE_HEADER.unpack_from(data, 0)
+        if magic != _JOURNAL_MAGIC:
+            raise ValueError(f"{path} is not a journal file")
+
+        records = []
+        offset = _FILE_HEADER.size
+        while offset + _RECORD_HEADER.size <= len(data):
+            length, crc = _RECORD_HEADER.unpack_from(data, offset)
+            body = data[offset + _RECORD_HEADER.size:offset + _RECORD_HEADER.size + length]
+            if len(body) < length or zlib.crc32(body) != crc:
+                break
+            op, entity_id = _RECORD_OP.unpack_from(body, 0)
+            records.append((op, entity_id, body[_RECORD_OP.size:]))
+            offset += _RECORD_HEADER.size + length
+
+        if offset < len(data):
+            with open(path, 'r+b') as f:
+                f.truncate(offset)
+        return generation, records
+
+
+def write_snapshot(path: str, generation: int, entries: List[Tuple[int, bytes]]):
+    """엔티티 목록을 스냅샷 파일로 원자적으로 기록합니다 (임시 파일 작성 후 rename)."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(_FILE_HEADER.pack(_SNAPSHOT_MAGIC, generation))
+        f.write(_SNAPSHOT_COUNT.pack(len(entries)))
+        offset = _FILE_HEADER.size + _SNAPSHOT_COUNT.size + _SNAPSHOT_ENTRY.size * len(entries)
+        for entity_id, payload in entries:
+            f.write(_SNAPSHOT_ENTRY.pack(entity_id, offset, len(payload)))
+            offset += len(payload)
+        for _, payload in entries:
+            f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    _fsync_directory(os.path.dirname(path))
+
+
+def read_snapshot(path: str) -> Tuple[int, Iterator[Tuple[int, bytes]]]:
+    """스냅샷 파일을 메모리 매핑하여 (generation, (entity_id, payload) 이터레이터)를 반환합니다."""
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, generation = _FILE_HEADER.unpack_from(mapped, 0)
+    if magic != _SNAPSHOT_MAGIC:
+        mapped.close()
+        raise ValueError(f"{path} is not a snapshot file")
+    (count,) = _SNAPSHOT_COUNT.unpack_from(mapped, _FILE_HEADER.size)
+
+    def entries():
+        try:
+            table = _FILE_HEADER.size + _SNAPSHOT_COUNT.size
+            for i in range(count):
+                entity_id, offset, length = _SNAPSHOT_ENTRY.unpack_from(mapped, table + i * _SNAPSHOT_ENTRY.size)
+                yield entity_id, mapped[offset:offset + length]
+        finally:
+            mapped.close()
+
+    return generation, entries()
+
+
+def _fsync_directory(directory: str):
+    """rename 결과가 디스크에 반영되도록 디렉터리를 fsync합니다 (POSIX 전용)."""
+    if not hasattr(os, 'O_DIRECTORY'):
+        return
+    fd = os.open(directory or '.', os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class RepositoryPersistence(Generic[T]):
+    """
+    인메모리 저장소를 위한 선택적 영속화 계층.
+    모든 저장/삭제를 저널에 기록하고, 저널이 snapshot_every개의 레코드만큼 쌓이면
+    백그라운드에서 스냅샷을 만들고 이전 저널을 제거합니다.
+    시작 시에는 마지막 스냅샷을 읽은 뒤 그 이후의 저널만 재생하므로, 재생할 저널은 항상 snapshot_every개 안팎으로 유지됩니다.
+
+    파일 이름: <name>.snapshot, <name>.journal.<generation>
+    스냅샷 generation G는 generation G 미만의 저널 내용을 모두 포함합니다.
+    """
+    def __init__(self, directory: str, name: str, model: Type[T], fsync_batch: int = 64,
+                 fsync_interval: float = 0.05, snapshot_every: int = 10_000):
+        self.directory = directory
+        self.name = name
+        self._model = model
+        self._fsync_batch = fsync_batch
+        self._fsync_interval = fsync_interval
+        self._snapshot_every = snapshot_every
+
+        self.journal_stats = JournalStats()
+        self.recovery_stats = RecoveryStats()
+        self._repository: Optional[BaseRepository[T]] = None
+        self._journal: Optional[Journal] = None
+        self._records_since_snapshot = 0
+        self._lock = threading.Lock()
+        self._snapshot_lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def _snapshot_path(self) -> str:
+        return os.path.join(self.directory, f"{self.name}.snapshot")
+
+    def _journal_path(self, generation: int) -> str:
+        return os.path.join(self.directory, f"{self.name}.journal.{generation}")
+
+    def _journal_generations(self) -> List[int]:
+        paths = glob.glob(os.path.join(glob.escape(self.directory), f"{glob.escape(self.name)}.journal.*"))
+        return sorted(int(path.rsplit('.', 1)[1]) for path in paths if path.rsplit('.', 1)[1].isdigit())
+
+    def attach(self, repository: BaseRepository[T]) -> RecoveryStats:
+        """
+        저장소 상태를 디스크에서 복구한 뒤, 이후의 모든 변경을 저널에 기록하도록 연결합니다.
+        복구는 저장소의 save()/delete()를 그대로 사용하므로 하위 클래스의 인덱스도 함께 재구성됩니다.
+        """
+        stats = self.recovery_stats
+        snapshot_generation = 0
+
+        started = time.perf_counter()
+        if os.path.exists(self._snapshot_path):
+            snapshot_generation, entries = read_snapshot(self._snapshot_path)
+            for _, payload in entries:
+                repository.save(decode_entity(self._model, payload))
+                stats.snapshot_entities += 1
+        stats.snapshot_generation = snapshot_generation
+        stats.snapshot_load_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        generation = snapshot_generation
+        for journal_generation in self._journal_generations():
+            path = self._journal_path(journal_generation)
+            if journal_generation < snapshot_generation:
+                # 스냅샷에 이미 반영된 저널 (스냅샷 직후 삭제되기 전에 종료된 경우)
+                os.remove(path)
+                continue
+            _, records = Journal.read(path)
+            for op, entity_id, payload in records:
+                self._replay(repository, op, entity_id, payload)
+            stats.journal_records += len(records)
+            generation = journal_generation
+        stats.journal_replay_seconds = time.perf_counter() - started
+
+        self._records_since_snapshot = stats.journal_records
+        self._repository = repository
+        self._journal = Journal(
+            self._journal_path(generation), generation, self.journal_stats,
+            self._fsync_batch, self._fsync_interval
+        )
+        repository.add_listener(self._on_change)
+        return stats
+
+    def _replay(self, repository: BaseRepository[T], op: int, entity_id: int, payload: bytes):
+        if op == OP_SAVE:
+            repository.save(decode_entity(self._model, payload))
+        elif op == OP_DELETE:
+            repository.delete(entity_id)
+        elif op == OP_CLEAR:
+            repository.clear()
+
+    def _on_change(self, event: str, entity_id: Optional[int], entity: Optional[T]):
+        payload = encode_entity(entity).encode('utf-8') if event == 'save' else b''
+        with self._lock:
+            self._journal.append(_EVENT_OPS[event], entity_id, payload)
+            self._records_since_snapshot += 1
+            should_snapshot = self._records_since_snapshot >= self._snapshot_every
+        if should_snapshot and not self._snapshot_lock.locked():
+            threading.Thread(target=self.snapshot, name=f"{self.name}-snapshot", daemon=True).start()
+
+    def snapshot(self):
+        """
+        현재 상태를 스냅샷으로 기록하고 이전 저널을 정리합니다.
+        저널은 먼저 새 generation으로 교체되므로, 스냅샷을 쓰는 동안의 변경은 새 저널에 기록됩니다.
+        저널 교체와 엔티티 인코딩은 저장소 잠금 안에서 하므로 그 사이에 변경이 끼어들지 않습니다.
+        (잠금 순서는 save()와 같이 저장소 잠금 → 영속화 잠금)
+        """
+        if not self._snapshot_lock.acquire(blocking=False):
+            return
+        try:
+            with self._repository._lock, self._lock:
+                self._journal.close()
+                generation = self._journal.generation + 1
+                self._journal = Journal(
+                    self._journal_path(generation), generation, self.journal_stats,
+                    self._fsync_batch, self._fsync_interval
+                )
+                self._records_since_snapshot = 0
+                entries = [
+                    (entity_id, encode_entity(entity).encode('utf-8'))
+                    for entity_id, entity in self._repository._data.items()
+                ]
+
+            write_snapshot(self._snapshot_path, generation, entries)
+            for old_generation in self._journal_generations():
+                if old_generation < generation:
+                    os.remove(self._journal_path(old_generation))
+        finally:
+            self._snapshot_lock.release()
+
+    def sync(self):
+        """대기 중인 저널 레코드를 디스크에 fsync합니다."""
+        with self._lock:
+            if self._journal:
+                self._journal.sync()
+
+    def close(self):
+        """저널을 fsync하고 닫습니다."""
+        with self._snapshot_lock, self._lock:
+            if self._journal:
+                self._journal.close()
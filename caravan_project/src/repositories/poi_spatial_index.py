@@ -0,0 +1,338 @@
+
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.models.poi import PointOfInterest
+
+EARTH_RADIUS_KM = 6371.0088
+# 위도 1도의 길이 (km)
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+# 경로 조회에서 한 번에 거리를 계산하는 연속 구간 수
+ROUTE_GROUP_SIZE = 32
+# 경로 조회에서 한 번에 거리를 계산하는 (점, 묶음) 후보 쌍의 최대 수.
+# 쌍마다 ROUTE_GROUP_SIZE개 구간까지의 거리 배열을 만들므로, 요청 하나의 최대 메모리가 이 값에 비례합니다.
+ROUTE_PAIR_BUDGET = 16384
+
+def haversine_km(lat: float, lon: float, latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """한 지점에서 여러 지점까지의 대원 거리(km)를 벡터 연산으로 계산합니다. 좌표는 도 단위입니다."""
+    lat1, lon1 = math.radians(lat), math.radians(lon)
+    lat2, lon2 = np.radians(latitudes), np.radians(longitudes)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+def ranges_to_indices(starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """[starts[i], ends[i]) 구간들을 이어 붙인 인덱스 배열을 파이썬 반복 없이 만듭니다."""
+    lengths = ends - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64)
+    # 각 구간의 출력 시작 위치를 빼 두면, 전체 arange에 더했을 때 원래 위치가 됩니다.
+    offsets = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+    return offsets + np.arange(total)
+
+class PoiSpatialIndex:
+    """
+    POI 좌표에 대한 격자(grid) 공간 인덱스.
+    지구를 cell_degrees 크기의 위경도 셀로 나누고, 점들을 셀 번호 순서로 정렬해 NumPy 배열에 보관합니다.
+    같은 위도 행에서 연속된 셀은 정렬된 배열에서도 연속된 구간이므로, 조회 영역을 행별 구간으로 잘라
+    후보를 모은 뒤 벡터화된 haversine 거리로 정확히 걸러냅니다.
+
+    조회 결과는 생성 시 전달된 순서 기준의 원래 인덱스입니다.
+    """
+    def __init__(
+        self,
+        latitudes: Sequence[float],
+        longitudes: Sequence[float],
+        type_codes: Sequence[int],
+        type_names: Sequence[str],
+        cell_degrees: float = 0.1,
+    ):
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+        self.cell_degrees = cell_degrees
+        self._rows = int(math.ceil(180 / cell_degrees))
+        self._cols = int(math.ceil(360 / cell_degrees))
+        self._type_codes_by_name: Dict[str, int] = {name: code for code, name in enumerate(type_names)}
+
+        keys = self._cell_keys(latitudes, longitudes)
+        # 셀 번호 순서로 정렬 (같은 셀 안에서는 원래 순서 유지)
+        order = np.argsort(keys, kind='stable')
+        self._order = order
+        self._keys = keys[order]
+        self._latitudes = latitudes[order]
+        self._longitudes = longitudes[order]
+        self._type_codes = np.asarray(type_codes, dtype=np.int16)[order]
+
+    @classmethod
+    def from_points(cls, pois: Sequence[PointOfInterest], cell_degrees: float = 0.1) -> "PoiSpatialIndex":
+        """PointOfInterest 목록으로 인덱스를 만듭니다."""
+        codes: Dict[str, int] = {}
+        for poi in pois:
+            codes.setdefault(poi.type, len(codes))
+        return cls(
+            [poi.latitude for poi in pois],
+            [poi.longitude for poi in pois],
+            [codes[poi.type] for poi in pois],
+            list(codes),
+            cell_degrees=cell_degrees,
+        )
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def radius(
+        self, lat: float, lon: float, radius_km: float, poi_type: Optional[str] = None, limit: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """(lat, lon)에서 radius_km 이내의 POI를 가까운 순서로 반환합니다. (원래 인덱스, 거리 km)"""
+        positions, distances = self._within(lat, lon, radius_km, poi_type)
+        order = np.argsort(distances, kind='stable')
+        if limit is not None:
+            order = order[:limit]
+        return self._order[positions[order]], distances[order]
+
+    def nearest(self, lat: float, lon: float, k: int, poi_type: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (lat, lon)에서 가장 가까운 k개의 POI를 가까운 순서로 반환합니다. (원래 인덱스, 거리 km)
+        반경을 두 배씩 넓혀 가며 k개 이상이 모이면, 그 반경 안의 점만으로 정확한 상위 k개를 고릅니다.
+        """
+        radius_km = self.cell_degrees * KM_PER_DEGREE
+        while True:
+            positions, distances = self._within(lat, lon, radius_km, poi_type)
+            if len(positions) >= k or radius_km >= math.pi * EARTH_RADIUS_KM:
+                break
+            radius_km *= 2
+        if len(positions) > k:
+            top = np.argpartition(distances, k - 1)[:k]
+            positions, distances = positions[top], distances[top]
+        order = np.argsort(distances, kind='stable')
+        return self._order[positions[order]], distances[order]
+
+    def bbox(
+        self, min_lat: float, min_lon: float, max_lat: float, max_lon: float, poi_type: Optional[str] = None
+    ) -> np.ndarray:
+        """
+        경계 상자 안의 POI 원래 인덱스를 반환합니다.
+        min_lon > max_lon이면 날짜변경선(경도 180도)을 가로지르는 상자로 처리합니다.
+        """
+        if min_lon <= max_lon:
+            col_ranges = [(self._col(min_lon), self._col(max_lon))]
+        else:
+            col_ranges = [(self._col(min_lon), self._cols - 1), (0, self._col(max_lon))]
+        positions = self._candidates(self._row(min_lat), self._row(max_lat), col_ranges)
+
+        latitudes, longitudes = self._latitudes[positions], self._longitudes[positions]
+        inside = (latitudes >= min_lat) & (latitudes <= max_lat)
+        if min_lon <= max_lon:
+            inside &= (longitudes >= min_lon) & (longitudes <= max_lon)
+        else:
+            inside &= (longitudes >= min_lon) | (longitudes <= max_lon)
+        positions = positions[inside]
+        positions = self._filter_type(positions, poi_type)
+        return np.sort(self._order[positions])
+
+    def corridor(
+        self,
+        route_latitudes: Sequence[float],
+        route_longitudes: Sequence[float],
+        corridor_km: float,
+        poi_type: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        경로(polyline)에서 corridor_km 이내의 POI를 경로 진행 순서로 반환합니다.
+        (원래 인덱스, 출발점부터 경로를 따라간 거리 km, 경로까지의 거리 km)
+
+        연속된 구간(segment)을 최대 ROUTE_GROUP_SIZE개씩 묶고, 묶음마다 corridor_km만큼 넓힌 경계 상자를
+        셀 구간으로 바꿔 (점, 묶음) 후보 쌍을 만듭니다. 후보 쌍을 ROUTE_PAIR_BUDGET개씩 나눠,
+        나눈 조각마다 묶음 안의 모든 구간까지의 거리를 (쌍 수 x 묶음 크기) 배열로 계산해 가장 가까운 구간을 고르고,
+        점마다 지금까지의 최솟값만 남깁니다. 그래서 경로가 길고 POI가 많아도 메모리 사용량은 일정합니다.
+        거리는 구간 중간 위도 기준의 평면 근사입니다. 날짜변경선을 넘는 경로는 지원하지 않습니다.
+        """
+        latitudes = np.asarray(route_latitudes, dtype=np.float64)
+        longitudes = np.asarray(route_longitudes, dtype=np.float64)
+        empty = np.empty(0, dtype=np.int64), np.empty(0), np.empty(0)
+        if len(latitudes) == 1:
+            latitudes, longitudes = np.repeat(latitudes, 2), np.repeat(longitudes, 2)
+        if len(latitudes) < 2 or len(self) == 0:
+            return empty
+
+        lat_a, lat_b = latitudes[:-1], latitudes[1:]
+        lon_a, lon_b = longitudes[:-1], longitudes[1:]
+        segment_lengths = self._segment_lengths(lat_a, lon_a, lat_b, lon_b)
+        # 구간 시작점까지의 누적 거리
+        starts_km = np.concatenate([[0.0], np.cumsum(segment_lengths)[:-1]])
+
+        # 1) 구간 묶기: 누적 거리가 group_km 구간을 넘거나 묶음이 가득 차면 새 묶음을 시작합니다.
+        segment_count = len(lat_a)
+        group_km = max(corridor_km, self.cell_degrees * KM_PER_DEGREE)
+        buckets = np.floor(starts_km / group_km)
+        segment_ids = np.arange(segment_count)
+        new_group = np.ones(segment_count, dtype=bool)
+        new_group[1:] = buckets[1:] != buckets[:-1]
+        run_starts = np.maximum.accumulate(np.where(new_group, segment_ids, 0))
+        new_group |= (segment_ids - run_starts) % ROUTE_GROUP_SIZE == 0
+        group_starts = np.flatnonzero(new_group)
+        group_sizes = np.diff(np.append(group_starts, segment_count))
+        # 묶음별 구간 번호 (묶음 크기보다 남는 칸은 마지막 구간을 반복)
+        members = group_starts[:, None] + np.minimum(np.arange(group_sizes.max()), group_sizes[:, None] - 1)
+
+        # 2) 묶음별 확장 상자 -> 행마다 열 구간 -> 정렬 배열의 위치 구간
+        delta_lat = corridor_km / KM_PER_DEGREE
+        box_lat_lo = np.minimum.reduceat(np.minimum(lat_a, lat_b), group_starts) - delta_lat
+        box_lat_hi = np.maximum.reduceat(np.maximum(lat_a, lat_b), group_starts) + delta_lat
+        max_abs_lat = np.minimum(np.maximum(np.abs(box_lat_lo), np.abs(box_lat_hi)), 89.0)
+        delta_lon = delta_lat / np.cos(np.radians(max_abs_lat))
+        box_lon_lo = np.minimum.reduceat(np.minimum(lon_a, lon_b), group_starts) - delta_lon
+        box_lon_hi = np.maximum.reduceat(np.maximum(lon_a, lon_b), group_starts) + delta_lon
+        row_lo, row_hi = self._rows_of(box_lat_lo), self._rows_of(box_lat_hi)
+        col_lo, col_hi = self._cols_of(box_lon_lo), self._cols_of(box_lon_hi)
+
+        group_of_row = np.repeat(np.arange(len(group_starts)), row_hi - row_lo + 1)
+        rows = ranges_to_indices(row_lo, row_hi + 1) * self._cols
+        starts = np.searchsorted(self._keys, rows + col_lo[group_of_row], side='left')
+        ends = np.searchsorted(self._keys, rows + col_hi[group_of_row], side='right')
+        type_code = None
+        if poi_type is not None:
+            type_code = self._type_codes_by_name.get(poi_type)
+            if type_code is None:
+                return empty
+
+        scale = KM_PER_DEGREE * np.cos(np.radians((lat_a + lat_b) / 2))
+        ax, ay = lon_a * scale, lat_a * KM_PER_DEGREE
+        dx, dy = lon_b * scale - ax, lat_b * KM_PER_DEGREE - ay
+        squared = dx * dx + dy * dy
+        inverse = np.divide(1.0, squared, out=np.zeros_like(squared), where=squared > 0)
+        boxes = box_lat_lo, box_lat_hi, box_lon_lo, box_lon_hi
+        geometry = scale, ax, ay, dx, dy, inverse
+
+        # 후보 쌍 번호 [0, total)를 예산만큼씩 잘라, 행 구간 목록에서 해당 부분만 펼칩니다.
+        pair_offsets = np.concatenate([[0], np.cumsum(ends - starts)])
+        best = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0), np.empty(0)
+        for first_pair in range(0, int(pair_offsets[-1]), ROUTE_PAIR_BUDGET):
+            last_pair = min(first_pair + ROUTE_PAIR_BUDGET, int(pair_offsets[-1]))
+            lo = int(np.searchsorted(pair_offsets, first_pair, side='right')) - 1
+            hi = int(np.searchsorted(pair_offsets, last_pair, side='left'))
+            chunk_starts, chunk_ends = starts[lo:hi].copy(), ends[lo:hi].copy()
+            chunk_starts[0] += first_pair - pair_offsets[lo]
+            chunk_ends[-1] -= pair_offsets[hi] - last_pair
+            positions = ranges_to_indices(chunk_starts, chunk_ends)
+            groups = np.repeat(group_of_row[lo:hi], chunk_ends - chunk_starts)
+            found = self._nearest_segments(positions, groups, type_code, corridor_km, members, boxes, geometry)
+            best = self._keep_nearest(*(np.concatenate(pair) for pair in zip(best, found)))
+
+        positions, segments, offsets, t = best
+        if len(positions) == 0:
+            return empty
+        along = starts_km[segments] + t * segment_lengths[segments]
+        order = np.argsort(along, kind='stable')
+        if limit is not None:
+            order = order[:limit]
+        return self._order[positions[order]], along[order], offsets[order]
+
+    def _nearest_segments(self, positions, groups, type_code, corridor_km, members, boxes, geometry):
+        """
+        (점, 묶음) 후보 쌍마다 묶음 안에서 가장 가까운 구간을 찾아, corridor_km 안에 있는 것만
+        (위치, 구간, 거리, 구간 위 비율 t)로 반환합니다. 한 점이 여러 쌍에 나올 수 있습니다.
+        """
+        if type_code is not None:
+            keep = self._type_codes[positions] == type_code
+            positions, groups = positions[keep], groups[keep]
+
+        # 셀 단위 후보 중 묶음의 확장 상자 밖에 있는 쌍은 거리 계산 전에 버립니다.
+        box_lat_lo, box_lat_hi, box_lon_lo, box_lon_hi = boxes
+        point_lat, point_lon = self._latitudes[positions], self._longitudes[positions]
+        keep = ((point_lat >= box_lat_lo[groups]) & (point_lat <= box_lat_hi[groups])
+                & (point_lon >= box_lon_lo[groups]) & (point_lon <= box_lon_hi[groups]))
+        positions, groups = positions[keep], groups[keep]
+        point_lat, point_lon = point_lat[keep], point_lon[keep]
+
+        # (점, 묶음) 쌍마다 묶음 안 모든 구간까지의 평면 근사 점-선분 거리
+        scale, ax, ay, dx, dy, inverse = geometry
+        segments = members[groups]
+        px = point_lon[:, None] * scale[segments] - ax[segments]
+        py = point_lat[:, None] * KM_PER_DEGREE - ay[segments]
+        seg_dx, seg_dy = dx[segments], dy[segments]
+        t = np.clip((px * seg_dx + py * seg_dy) * inverse[segments], 0, 1)
+        distances = np.hypot(px - t * seg_dx, py - t * seg_dy)
+
+        nearest = distances.argmin(axis=1) if len(positions) else np.empty(0, dtype=np.int64)
+        pairs = np.arange(len(positions))
+        offsets, t, segments = distances[pairs, nearest], t[pairs, nearest], segments[pairs, nearest]
+        inside = offsets <= corridor_km
+        return positions[inside], segments[inside], offsets[inside], t[inside]
+
+    @staticmethod
+    def _keep_nearest(positions, segments, offsets, t):
+        """점마다 가장 가까운 구간 하나만 남깁니다 (인접한 묶음의 상자가 겹칠 수 있음)."""
+        order = np.lexsort((offsets, positions))
+        positions, segments, offsets, t = positions[order], segments[order], offsets[order], t[order]
+        first = np.ones(len(positions), dtype=bool)
+        first[1:] = positions[1:] != positions[:-1]
+        return positions[first], segments[first], offsets[first], t[first]
+
+    def _within(self, lat: float, lon: float, radius_km: float, poi_type: Optional[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """반경 안에 있는 점들의 정렬 배열 위치와 거리를 반환합니다."""
+        delta_lat = radius_km / KM_PER_DEGREE
+        if abs(lat) + delta_lat >= 90 or radius_km >= math.pi * EARTH_RADIUS_KM / 2:
+            # 극을 포함하거나 매우 넓은 반경은 모든 경도를 확인합니다.
+            col_ranges = [(0, self._cols - 1)]
+        else:
+            delta_lon = delta_lat / math.cos(math.radians(abs(lat) + delta_lat))
+            col_ranges = self._wrapped_col_ranges(lon - delta_lon, lon + delta_lon)
+        positions = self._candidates(self._row(lat - delta_lat), self._row(lat + delta_lat), col_ranges)
+        positions = self._filter_type(positions, poi_type)
+
+        distances = haversine_km(lat, lon, self._latitudes[positions], self._longitudes[positions])
+        inside = distances <= radius_km
+        return positions[inside], distances[inside]
+
+    def _candidates(self, row_lo: int, row_hi: int, col_ranges: List[Tuple[int, int]]) -> np.ndarray:
+        """행 범위 x 열 구간에 속한 셀들의 점 위치를 모읍니다. 행마다 정렬 배열의 연속 구간 하나입니다."""
+        rows = np.arange(row_lo, row_hi + 1, dtype=np.int64) * self._cols
+        starts, ends = [], []
+        for col_lo, col_hi in col_ranges:
+            starts.append(np.searchsorted(self._keys, rows + col_lo, side='left'))
+            ends.append(np.searchsorted(self._keys, rows + col_hi, side='right'))
+        return ranges_to_indices(np.concatenate(starts), np.concatenate(ends))
+
+    def _filter_type(self, positions: np.ndarray, poi_type: Optional[str]) -> np.ndarray:
+        if poi_type is None:
+            return positions
+        code = self._type_codes_by_name.get(poi_type)
+        if code is None:
+            return positions[:0]
+        return positions[self._type_codes[positions] == code]
+
+    def _wrapped_col_ranges(self, lon_lo: float, lon_hi: float) -> List[Tuple[int, int]]:
+        """경도 범위를 열 구간으로 바꿉니다. 날짜변경선을 넘으면 두 구간으로 나눕니다."""
+        if lon_hi - lon_lo >= 360:
+            return [(0, self._cols - 1)]
+        if lon_lo < -180:
+            return [(self._col(lon_lo + 360), self._cols - 1), (0, self._col(lon_hi))]
+        if lon_hi > 180:
+            return [(self._col(lon_lo), self._cols - 1), (0, self._col(lon_hi - 360))]
+        return [(self._col(lon_lo), self._col(lon_hi))]
+
+    @staticmethod
+    def _segment_lengths(lat_a, lon_a, lat_b, lon_b) -> np.ndarray:
+        """구간별 대원 거리(km)"""
+        lat_a, lat_b = np.radians(lat_a), np.radians(lat_b)
+        a = np.sin((lat_b - lat_a) / 2) ** 2 + np.cos(lat_a) * np.cos(lat_b) * np.sin(np.radians(lon_b - lon_a) / 2) ** 2
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+    def _rows_of(self, latitudes: np.ndarray) -> np.ndarray:
+        return np.clip(np.floor((latitudes + 90) / self.cell_degrees), 0, self._rows - 1).astype(np.int64)
+
+    def _cols_of(self, longitudes: np.ndarray) -> np.ndarray:
+        return np.clip(np.floor((longitudes + 180) / self.cell_degrees), 0, self._cols - 1).astype(np.int64)
+
+    def _row(self, lat: float) -> int:
+        return min(max(int(math.floor((lat + 90) / self.cell_degrees)), 0), self._rows - 1)
+
+    def _col(self, lon: float) -> int:
+        return min(max(int(math.floor((lon + 180) / self.cell_degrees)), 0), self._cols - 1)
+
+    def _cell_keys(self, latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+        return self._rows_of(latitudes) * self._cols + self._cols_of(longitudes)
@@ -0,0 +1,229 @@
+
+import json
+import mmap
+import os
+import struct
+from array import array
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.models.poi import PointOfInterest
+
+# --- 캐시 파일 포맷 ---
+# [magic 8B][헤더 길이 u32][JSON 헤더] 이후 8바이트 정렬된 배열 영역
+# JSON 헤더 = {"count", "type_names", "region_names", "arrays": {이름: [dtype, offset, 원소 수]}}
+_CACHE_MAGIC = b'CVPOI001'
+_CACHE_PREFIX = struct.Struct('<8sI')
+_ALIGNMENT = 8
+
+
+class StringTable:
+    """
+    문자열 목록을 하나의 UTF-8 바이트 배열과 오프셋 배열로 보관하는 테이블.
+    문자열 객체 대신 연속된 바이트만 유지하므로 행마다 파이썬 객체를 두는 것보다 메모리를 크게 줄입니다.
+    """
+    def __init__(self, blob: np.ndarray, offsets: np.ndarray):
+        self._blob = blob
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        return self._blob[self._offsets[i]:self._offsets[i + 1]].tobytes().decode('utf-8')
+
+
+class _StringTableBuilder:
+    def __init__(self):
+        self._blob = bytearray()
+        self._offsets = array('q', [0])
+
+    def append(self, value: str):
+        self._blob += value.encode('utf-8')
+        self._offsets.append(len(self._blob))
+
+    def extend(self, values: Iterable[str]):
+        blob, offsets = self._blob, self._offsets
+        for value in values:
+            blob += value.encode('utf-8')
+            offsets.append(len(blob))
+
+    def build(self) -> StringTable:
+        return StringTable(np.frombuffer(bytes(self._blob), dtype=np.uint8), np.frombuffer(self._offsets, dtype=np.int64))
+
+
+class PoiStore:
+    """
+    POI를 열(column) 단위로 보관하는 읽기 전용 저장소.
+    - 좌표: float64 배열 (공간 인덱스가 복사 없이 그대로 사용)
+    - 종류/지역: 정수 코드 배열 + 이름 목록 (문자열 인터닝)
+    - 이름/주소: StringTable
+    PointOfInterest 객체는 API 응답을 만들 때 poi(i)로만 생성합니다.
+    """
+    def __init__(
+        self,
+        latitudes: np.ndarray,
+        longitudes: np.ndarray,
+        type_codes: np.ndarray,
+        type_names: Sequence[str],
+        region_codes: np.ndarray,
+        region_names: Sequence[str],
+        names: StringTable,
+        addresses: StringTable,
+    ):
+        self.latitudes = latitudes
+        self.longitudes = longitudes
+        self.type_codes = type_codes
+        self.type_names = list(type_names)
+        self.region_codes = region_codes
+        self.region_names = list(region_names)
+        self.names = names
+        self.addresses = addresses
+        self._region_lookup = {name: code for code, name in enumerate(self.region_names)}
+
+    def __len__(self) -> int:
+        return len(self.latitudes)
+
+    def poi(self, i: int) -> PointOfInterest:
+        """i번째 POI를 PointOfInterest 모델로 만듭니다."""
+        i = int(i)
+        return PointOfInterest(
+            name=self.names[i],
+            type=self.type_names[self.type_codes[i]],
+            latitude=float(self.latitudes[i]),
+            longitude=float(self.longitudes[i]),
+            address=self.addresses[i],
+        )
+
+    def region_indices(self, region: str) -> np.ndarray:
+        """지역 이름에 속한 POI 인덱스를 반환합니다."""
+        code = self._region_lookup.get(region)
+        if code is None:
+            return np.empty(0, dtype=np.int64)
+        return np.flatnonzero(self.region_codes == code)
+
+    def nbytes(self) -> int:
+        """열 배열이 차지하는 바이트 수"""
+        return sum(values.nbytes for values in self._arrays().values())
+
+    def _arrays(self) -> Dict[str, np.ndarray]:
+        return {
+            'latitudes': self.latitudes,
+            'longitudes': self.longitudes,
+            'type_codes': self.type_codes,
+            'region_codes': self.region_codes,
+            'name_blob': self.names._blob,
+            'name_offsets': self.names._offsets,
+            'address_blob': self.addresses._blob,
+            'address_offsets': self.addresses._offsets,
+        }
+
+    def save(self, path: str):
+        """저장소를 바이너리 캐시 파일로 원자적으로 기록합니다 (임시 파일 작성 후 rename)."""
+        arrays = self._arrays()
+        layout = {}
+        offset = 0
+        for name, values in arrays.items():
+            layout[name] = [values.dtype.str, offset, len(values)]
+            offset += -(-values.nbytes // _ALIGNMENT) * _ALIGNMENT
+        header = json.dumps({
+            'count': len(self),
+            'type_names': self.type_names,
+            'region_names': self.region_names,
+            'arrays': layout,
+        }).encode('utf-8')
+        data_start = -(-(_CACHE_PREFIX.size + len(header)) // _ALIGNMENT) * _ALIGNMENT
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(_CACHE_PREFIX.pack(_CACHE_MAGIC, len(header)))
+            f.write(header)
+            f.write(b'\0' * (data_start - _CACHE_PREFIX.size - len(header)))
+            for name, values in arrays.items():
+                f.write(values.tobytes())
+                f.write(b'\0' * (-values.nbytes % _ALIGNMENT))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "PoiStore":
+        """
+        바이너리 캐시 파일을 메모리 매핑하여 저장소를 엽니다.
+        배열은 파일을 복사하지 않고 매핑된 영역을 그대로 가리키므로 시작 시간이 행 수와 거의 무관합니다.
+        """
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, header_length = _CACHE_PREFIX.unpack_from(mapped, 0)
+        if magic != _CACHE_MAGIC:
+            mapped.close()
+            raise ValueError(f"{path} is not a POI cache file")
+        header = json.loads(mapped[_CACHE_PREFIX.size:_CACHE_PREFIX.size + header_length])
+        data_start = -(-(_CACHE_PREFIX.size + header_length) // _ALIGNMENT) * _ALIGNMENT
+
+        arrays = {
+            name: np.frombuffer(mapped, dtype=np.dtype(dtype), count=count, offset=data_start + offset)
+            for name, (dtype, offset, count) in header['arrays'].items()
+        }
+        return cls(
+            arrays['latitudes'], arrays['longitudes'],
+            arrays['type_codes'], header['type_names'],
+            arrays['region_codes'], header['region_names'],
+            StringTable(arrays['name_blob'], arrays['name_offsets']),
+            StringTable(arrays['address_blob'], arrays['address_offsets']),
+        )
+
+
+class PoiStoreBuilder:
+    """행을 하나씩 추가하여 PoiStore를 만드는 빌더. 열마다 타입이 고정된 array에 누적합니다."""
+    def __init__(self):
+        self._latitudes = array('d')
+        self._longitudes = array('d')
+        self._type_codes = array('h')
+        self._region_codes = array('i')
+        self._type_lookup: Dict[str, int] = {}
+        self._region_lookup: Dict[str, int] = {}
+        self._names = _StringTableBuilder()
+        self._addresses = _StringTableBuilder()
+
+    def __len__(self) -> int:
+        return len(self._latitudes)
+
+    def add(self, name: str, poi_type: str, latitude: float, longitude: float, address: str = '',
+            region: Optional[str] = None):
+        self._latitudes.append(latitude)
+        self._longitudes.append(longitude)
+        self._type_codes.append(self._type_lookup.setdefault(poi_type, len(self._type_lookup)))
+        self._region_codes.append(self._region_lookup.setdefault(region or '', len(self._region_lookup)))
+        self._names.append(name)
+        self._addresses.append(address)
+
+    def add_rows(self, rows: Iterable[Tuple[str, str, float, float, str, Optional[str]]]):
+        """(name, type, latitude, longitude, address, region) 튜플을 한 번에 추가합니다. 대량 적재용입니다."""
+        rows = list(rows)
+        if not rows:
+            return
+        names, types, latitudes, longitudes, addresses, regions = zip(*rows)
+        self._latitudes.extend(latitudes)
+        self._longitudes.extend(longitudes)
+        type_lookup, region_lookup = self._type_lookup, self._region_lookup
+        self._type_codes.extend([type_lookup.setdefault(value, len(type_lookup)) for value in types])
+        self._region_codes.extend([region_lookup.setdefault(value or '', len(region_lookup)) for value in regions])
+        self._names.extend(names)
+        self._addresses.extend(addresses)
+
+    def add_point(self, poi: PointOfInterest, region: Optional[str] = None):
+        self.add(poi.name, poi.type, poi.latitude, poi.longitude, poi.address, region)
+
+    def build(self) -> PoiStore:
+        return PoiStore(
+            np.frombuffer(self._latitudes, dtype=np.float64),
+            np.frombuffer(self._longitudes, dtype=np.float64),
+            np.frombuffer(self._type_codes, dtype=np.int16),
+            list(self._type_lookup),
+            np.frombuffer(self._region_codes, dtype=np.int32),
+            list(self._region_lookup),
+            self._names.build(),
+            self._addresses.build(),
+        )
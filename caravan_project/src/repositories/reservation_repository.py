@@ -1,49 +1,111 @@
 
 from collections import defaultdict
 from datetime import date
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from src.models.reservation import Reservation
-from .base_repository import BaseRepository
+from .base_repository import BaseRepository, Index
+from .availability_calendar import AvailabilityCalendar
+from .interval_index import IntervalIndex
 
 class ReservationRepository(BaseRepository[Reservation]):
     """
     예약 데이터에 특화된 저장소.
-    카라반 ID별로 예약을 그룹화하여 날짜 충돌 검사 성능을 최적화합니다.
+    카라반 ID별로 확정된 숙박 기간만 정렬된 인덱스로 관리하여 날짜 충돌 검사를 O(log n)에 처리합니다.
+    같은 숙박 기간을 일 단위 비트맵 달력에도 반영하여 빈 날짜 조회를 빠르게 처리합니다.
     """
+    indexes = (
+        Index(('user_id',)),
+        Index(('caravan_id',)),
+        Index(('user_id', 'caravan_id', 'status')),
+    )
+
     def __init__(self):
         super().__init__()
-        # caravan_id를 키로 사용하여 예약을 그룹화하는 인덱스
-        self._reservations_by_caravan: Dict[int, List[Reservation]] = defaultdict(list)
+        # caravan_id별로 확정(confirmed)된 숙박 기간만 보관하는 정렬 인덱스
+        self._confirmed_stays: Dict[int, IntervalIndex] = defaultdict(IntervalIndex)
+        # reservation_id -> 인덱스에 등록된 (caravan_id, start_date)
+        # 예약 객체가 제자리에서 변경되어도 이전 위치를 찾아 제거할 수 있도록 보관합니다.
+        self._indexed_stays: Dict[int, Tuple[int, date]] = {}
+        # 오늘부터의 점유 날짜를 표시하는 카라반별 비트맵 달력
+        self.calendar = AvailabilityCalendar(epoch=date.today())
 
     def save(self, reservation: Reservation) -> Reservation:
-        """예약을 저장하고 카라반 ID 기반 인덱스에도 추가합니다."""
-        super().save(reservation)
-        self._reservations_by_caravan[reservation.caravan_id].append(reservation)
+        """예약을 저장하고 카라반별 숙박 인덱스를 갱신합니다."""
+        with self._lock:
+            super().save(reservation)
+            self._reindex_stay(reservation)
         return reservation
 
+    def delete(self, reservation_id: int) -> bool:
+        """예약을 삭제하고 숙박 인덱스에서도 제거합니다."""
+        with self._lock:
+            self._unindex_stay(reservation_id)
+            return super().delete(reservation_id)
+
+    def clear(self):
+        """모든 예약과 숙박 인덱스를 비웁니다."""
+        with self._lock:
+            super().clear()
+            self._confirmed_stays.clear()
+            self._indexed_stays.clear()
+            self.calendar.clear()
+
+    def cancel(self, reservation_id: int) -> Optional[Reservation]:
+        """예약을 취소 상태로 변경하고 숙박 인덱스에서 제거합니다."""
+        reservation = self.find_by_id(reservation_id)
+        if reservation is None:
+            return None
+        reservation.status = 'cancelled'
+        return self.save(reservation)
+
     def find_by_caravan_id(self, caravan_id: int) -> List[Reservation]:
         """특정 카라반의 모든 예약을 조회합니다."""
-        return self._reservations_by_caravan.get(caravan_id, [])
+        return self.find_by(caravan_id=caravan_id)
 
     def find_by_user_id(self, user_id: int) -> List[Reservation]:
         """특정 사용자의 모든 예약을 조회합니다."""
-        # This is inefficient for a real database, but fine for an in-memory repo.
-        return [res for res in self._data.values() if res.user_id == user_id]
+        return self.find_by(user_id=user_id)
 
     def check_caravan_availability(self, caravan_id: int, start_date: date, end_date: date) -> bool:
         """
-        최적화된 방식으로 특정 카라반이 주어진 날짜에 이용 가능한지 확인합니다.
-        해당 카라반의 예약 목록만 순회하므로 전체 예약을 순회하는 것보다 훨씬 효율적입니다.
+        특정 카라반이 주어진 날짜에 이용 가능한지 확인합니다.
+        확정된 숙박만 담긴 정렬 인덱스를 이분 탐색하므로, 취소되거나 지난 예약이 쌓여도 느려지지 않습니다.
         """
-        reservations_for_caravan = self.find_by_caravan_id(caravan_id)
-        
-        for reservation in reservations_for_caravan:
-            # 예약 상태가 'confirmed'인 경우에만 충돌 검사
-            if reservation.status == 'confirmed':
-                # 기존 예약과 날짜가 겹치는지 확인
-                # (start1 < end2) and (start2 < end1)
-                if start_date < reservation.end_date and end_date > reservation.start_date:
-                    return False # 겹치는 예약이 있으므로 이용 불가능
-        
-        return True # 겹치는 예약이 없으므로 이용 가능
+        with self._lock:
+            stays = self._confirmed_stays.get(caravan_id)
+            if stays is None:
+                return True
+            return not stays.overlaps(start_date, end_date)
+
+    def find_free_ranges(self, caravan_id: int, start_date: date, days: int) -> List[Tuple[date, date]]:
+        """start_date부터 days일 동안 특정 카라반을 예약할 수 있는 연속 기간 목록을 반환합니다."""
+        with self._lock:
+            return self.calendar.free_ranges(caravan_id, start_date, days)
+
+    def availability_grid(self, caravan_ids: Iterable[int], start_date: date, days: int) -> List[int]:
+        """여러 카라반의 빈 날 비트맵(비트 i = start_date + i일 예약 가능)을 한 번에 반환합니다."""
+        with self._lock:
+            return self.calendar.grid(caravan_ids, start_date, days)
+
+    def _reindex_stay(self, reservation: Reservation):
+        """예약의 현재 상태와 날짜에 맞게 숙박 인덱스를 다시 등록합니다."""
+        self._unindex_stay(reservation.reservation_id)
+        self.calendar.apply(reservation)
+        if reservation.status == 'confirmed':
+            self._confirmed_stays[reservation.caravan_id].add(
+                reservation.reservation_id, reservation.start_date, reservation.end_date
+            )
+            self._indexed_stays[reservation.reservation_id] = (reservation.caravan_id, reservation.start_date)
+
+    def _unindex_stay(self, reservation_id: int):
+        """숙박 인덱스에서 예약을 제거합니다."""
+        self.calendar.remove(reservation_id)
+        indexed = self._indexed_stays.pop(reservation_id, None)
+        if indexed is None:
+            return
+        caravan_id, start_date = indexed
+        stays = self._confirmed_stays[caravan_id]
+        stays.remove(reservation_id, start_date)
+        if not stays:
+            del self._confirmed_stays[caravan_id]
@@ -0,0 +1,64 @@
+
+from bisect import bisect_left, insort
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from src.models.review import Review
+from .base_repository import BaseRepository, Index
+
+class ReviewRepository(BaseRepository[Review]):
+    """
+    리뷰 데이터에 특화된 저장소.
+    카라반별 리뷰 ID를 정렬된 목록으로 유지하여, 카라반 하나의 리뷰를 최신순 키셋 페이지로
+    전체 리뷰 수와 무관하게 조회합니다.
+    """
+    indexes = (
+        Index(('caravan_id',)),
+        Index(('user_id', 'caravan_id')),
+    )
+
+    def __init__(self):
+        super().__init__()
+        # caravan_id -> 오름차순 review_id 목록
+        self._by_caravan: Dict[int, List[int]] = defaultdict(list)
+        # review_id -> 목록에 등록된 caravan_id (리뷰가 제자리에서 변경되어도 이전 위치를 찾기 위해 보관)
+        self._indexed_caravans: Dict[int, int] = {}
+
+    def save(self, review: Review) -> Review:
+        """리뷰를 저장하고 카라반별 목록을 갱신합니다."""
+        with self._lock:
+            super().save(review)
+            self._unlist(review.review_id)
+            insort(self._by_caravan[review.caravan_id], review.review_id)
+            self._indexed_caravans[review.review_id] = review.caravan_id
+        return review
+
+    def delete(self, review_id: int) -> bool:
+        """리뷰를 삭제하고 카라반별 목록에서도 제거합니다."""
+        with self._lock:
+            self._unlist(review_id)
+            return super().delete(review_id)
+
+    def clear(self):
+        with self._lock:
+            super().clear()
+            self._by_caravan.clear()
+            self._indexed_caravans.clear()
+
+    def page_by_caravan(self, caravan_id: int, before: Optional[int] = None, limit: int = 20) -> List[Review]:
+        """카라반의 리뷰를 최신순(review_id 내림차순)으로, before보다 작은 ID부터 최대 limit개 조회합니다."""
+        with self._lock:
+            ids = self._by_caravan.get(caravan_id, [])
+            end = len(ids) if before is None else bisect_left(ids, before)
+            return [self._data[review_id] for review_id in reversed(ids[max(end - limit, 0):end])]
+
+    def _unlist(self, review_id: int):
+        caravan_id = self._indexed_caravans.pop(review_id, None)
+        if caravan_id is None:
+            return
+        ids = self._by_caravan[caravan_id]
+        position = bisect_left(ids, review_id)
+        if position < len(ids) and ids[position] == review_id:
+            del ids[position]
+        if not ids:
+            del self._by_caravan[caravan_id]
@@ -0,0 +1,22 @@
+
+import dataclasses
+import json
+from typing import Type, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar('T')
+
+def encode_entity(entity) -> str:
+    """Pydantic 모델 또는 데이터 클래스 엔티티를 JSON 문자열로 직렬화합니다."""
+    if isinstance(entity, BaseModel):
+        return entity.model_dump_json()
+    if dataclasses.is_dataclass(entity):
+        return json.dumps(dataclasses.asdict(entity), ensure_ascii=False, default=str)
+    raise TypeError(f"Cannot serialize entity of type {type(entity).__name__}")
+
+def decode_entity(model: Type[T], data: str | bytes) -> T:
+    """encode_entity()로 직렬화된 JSON을 모델 객체로 복원합니다."""
+    if issubclass(model, BaseModel):
+        return model.model_validate_json(data)
+    return model(**json.loads(data))
@@ -0,0 +1,430 @@
+
+import sqlite3
+import threading
+from datetime import date
+from typing import Any, Callable, Generic, Iterable, Iterator, List, Optional, Tuple, Type, TypeVar, Union
+
+from src.models.caravan import Caravan
+from src.models.reservation import Reservation
+from src.models.review import Review
+from src.models.user import User
+from .availability_calendar import AvailabilityCalendar
+from .base_repository import Index, RangeIndex
+from .caravan_repository import CaravanRepository
+from .reservation_repository import ReservationRepository
+from .review_repository import ReviewRepository
+from .serialization import decode_entity, encode_entity
+from .user_repository import UserRepository
+
+T = TypeVar('T')
+
+class SqliteDatabase:
+    """
+    SQLite 데이터베이스 연결 풀.
+    sqlite3 연결은 스레드 간에 안전하게 공유할 수 없으므로 스레드마다 하나의 연결을 만들어 재사용합니다.
+    파일 데이터베이스는 WAL 모드로 열어 읽기와 쓰기가 서로를 막지 않도록 합니다.
+    """
+    def __init__(self, path: str, cached_statements: int = 256, busy_timeout_ms: int = 5000):
+        self.path = path
+        self._cached_statements = cached_statements
+        self._busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+    def connection(self) -> sqlite3.Connection:
+        """현재 스레드의 연결을 반환합니다. 없으면 새로 생성합니다."""
+        conn = getattr(self._local, 'connection', None)
+        if conn is None:
+            # check_same_thread=False는 close()에서 다른 스레드의 연결을 닫기 위함이며,
+            # 각 연결은 자신을 만든 스레드에서만 사용됩니다.
+            conn = sqlite3.connect(self.path, cached_statements=self._cached_statements, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={self._busy_timeout_ms}")
+            self._local.connection = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def close(self):
+        """풀에 있는 모든 연결을 닫습니다."""
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+
+class SqliteRepository(Generic[T]):
+    """
+    BaseRepository와 같은 인터페이스를 SQLite 위에 구현한 저장소.
+    엔티티는 JSON으로 저장하고, 선언된 인덱스의 필드는 별도 컬럼과 실제 SQL 인덱스로 관리합니다.
+    """
+    indexes: Tuple[Union[Index, RangeIndex], ...] = ()
+    # 인덱스 외에 SQL 조건에 사용할 추가 컬럼
+    columns: Tuple[str, ...] = ()
+
+    def __init__(self, database: SqliteDatabase, model: Type[T], table: str,
+                 indexes: Iterable[Union[Index, RangeIndex]] = ()):
+        self._db = database
+        self._model = model
+        self._table = table
+        self._id_field = f"{model.__name__.lower()}_id"
+        self._indexes = (*self.indexes, *indexes)
+        self._columns = tuple(dict.fromkeys(
+            [field for index in self._indexes for field in self._index_fields(index)] + list(self.columns)
+        ))
+        # ID 필드는 기본 키(id) 컬럼이 이미 담고 있으므로 별도 컬럼으로 만들지 않습니다.
+        self._columns = tuple(column for column in self._columns if column != self._id_field)
+        self._create_schema()
+        # 이 프로세스에서 저장/삭제될 때마다 증가하는 버전 번호 (응답 캐시 무효화에 사용)
+        # 다른 프로세스가 같은 파일에 쓴 변경은 반영되지 않습니다.
+        self.version = 0
+        # listener(event, entity_id, entity) - 커밋이 끝난 뒤 호출됩니다. (BaseRepository와 같은 형식)
+        self._listeners: List[Callable[[str, Optional[int], Optional[T]], None]] = []
+        self._emit_lock = threading.Lock()
+
+        # SQL 문자열을 한 번만 만들어 두어 연결별 prepared statement 캐시를 재사용합니다.
+        column_list = "".join(f", {column}" for column in self._columns)
+        placeholders = ", ?" * len(self._columns)
+        updates = "".join(f", {column} = excluded.{column}" for column in self._columns)
+        self._sql_find_by_id = f"SELECT data FROM {table} WHERE id = ?"
+        self._sql_get_all = f"SELECT data FROM {table} ORDER BY id"
+        self._sql_insert = f"INSERT INTO {table} (data{column_list}) VALUES (?{placeholders})"
+        self._sql_upsert = (
+            f"INSERT INTO {table} (id, data{column_list}) VALUES (?, ?{placeholders}) "
+            f"ON CONFLICT(id) DO UPDATE SET data = excluded.data{updates}"
+        )
+        self._sql_update_data = f"UPDATE {table} SET data = ? WHERE id = ?"
+        self._sql_delete = f"DELETE FROM {table} WHERE id = ?"
+        self._sql_clear = f"DELETE FROM {table}"
+        self._sql_max_id = f"SELECT MAX(id) FROM {table}"
+
+    @staticmethod
+    def _index_fields(index: Union[Index, RangeIndex]) -> Tuple[str, ...]:
+        return (index.field,) if isinstance(index, RangeIndex) else index.fields
+
+    def add_listener(self, listener: Callable[[str, Optional[int], Optional[T]], None]):
+        """저장/삭제 이벤트를 전달받을 리스너를 등록합니다."""
+        self._listeners.append(listener)
+
+    def _emit(self, event: str, entity_id: Optional[int], entity: Optional[T]):
+        with self._emit_lock:
+            self.version += 1
+            for listener in self._listeners:
+                listener(event, entity_id, entity)
+
+    def _create_schema(self):
+        conn = self._db.connection()
+        column_defs = "".join(f", {column}" for column in self._columns)
+        with conn:
+            conn.execute(f"CREATE TABLE IF NOT EXISTS {self._table} (id INTEGER PRIMARY KEY, data TEXT NOT NULL{column_defs})")
+            for index in self._indexes:
+                fields = self._index_fields(index)
+                if self._id_field in fields:
+                    continue
+                unique = "UNIQUE " if getattr(index, 'unique', False) else ""
+                name = f"ix_{self._table}_{'_'.join(fields)}"
+                conn.execute(f"CREATE {unique}INDEX IF NOT EXISTS {name} ON {self._table} ({', '.join(fields)})")
+
+    @staticmethod
+    def _to_column(value: Any) -> Any:
+        """필드 값을 SQLite 컬럼 값으로 변환합니다. 날짜는 정렬 가능한 ISO 문자열로 저장합니다."""
+        if isinstance(value, date):
+            return value.isoformat()
+        return value
+
+    def _column_values(self, entity: T) -> List[Any]:
+        return [self._to_column(getattr(entity, column)) for column in self._columns]
+
+    def _decode_rows(self, rows) -> List[T]:
+        return [decode_entity(self._model, row[0]) for row in rows]
+
+    def find_by_id(self, entity_id: int) -> Optional[T]:
+        """ID로 엔티티를 검색합니다."""
+        row = self._db.connection().execute(self._sql_find_by_id, (entity_id,)).fetchone()
+        return decode_entity(self._model, row[0]) if row else None
+
+    def save(self, entity: T) -> T:
+        """엔티티를 저장합니다. ID가 없으면 SQLite가 새로 할당합니다."""
+        entity_id = getattr(entity, 'id', None) or getattr(entity, self._id_field)
+        conn = self._db.connection()
+        try:
+            with conn:
+                if entity_id is None:
+                    cursor = conn.execute(self._sql_insert, [encode_entity(entity), *self._column_values(entity)])
+                    entity_id = cursor.lastrowid
+                    setattr(entity, self._id_field, entity_id)
+                    # 할당된 ID를 포함하도록 본문을 다시 기록합니다.
+                    conn.execute(self._sql_update_data, (encode_entity(entity), entity_id))
+                else:
+                    conn.execute(self._sql_upsert, [entity_id, encode_entity(entity), *self._column_values(entity)])
+        except sqlite3.IntegrityError as e:
+            raise ValueError(f"Duplicate value for unique index in {self._table}: {e}") from e
+        self._emit('save', entity_id, entity)
+        return entity
+
+    def delete(self, entity_id: int) -> bool:
+        """ID로 엔티티를 삭제합니다. 존재하지 않으면 False를 반환합니다."""
+        conn = self._db.connection()
+        with conn:
+            deleted = conn.execute(self._sql_delete, (entity_id,)).rowcount > 0
+        if deleted:
+            self._emit('delete', entity_id, None)
+        return deleted
+
+    def clear(self):
+        """모든 엔티티를 삭제합니다."""
+        conn = self._db.connection()
+        with conn:
+            conn.execute(self._sql_clear)
+        self._emit('clear', None, None)
+
+    def get_all(self) -> list[T]:
+        """모든 엔티티를 리스트로 반환합니다."""
+        return self._decode_rows(self._db.connection().execute(self._sql_get_all))
+
+    def max_id(self) -> int:
+        """저장된 엔티티 중 가장 큰 ID를 반환합니다. 비어 있으면 0을 반환합니다."""
+        row = self._db.connection().execute(self._sql_max_id).fetchone()
+        return row[0] or 0
+
+    def find_by(self, **criteria) -> List[T]:
+        """
+        필드 값이 모두 일치하는 엔티티를 조회합니다.
+        모든 필드가 컬럼으로 관리되면 SQL 인덱스를 사용하고, 아니면 전체 순회로 처리합니다.
+        """
+        if not set(criteria) <= set(self._columns):
+            return [
+                entity for entity in self.get_all()
+                if all(getattr(entity, field) == value for field, value in criteria.items())
+            ]
+        fields = sorted(criteria)
+        where = " AND ".join(f"{field} = ?" for field in fields)
+        rows = self._db.connection().execute(
+            f"SELECT data FROM {self._table} WHERE {where} ORDER BY id",
+            [self._to_column(criteria[field]) for field in fields],
+        )
+        return self._decode_rows(rows)
+
+    def find_one_by(self, **criteria) -> Optional[T]:
+        """필드 값이 모두 일치하는 첫 번째 엔티티를 조회합니다."""
+        matches = self.find_by(**criteria)
+        return matches[0] if matches else None
+
+    def find_ids_by(self, **criteria) -> List[int]:
+        """필드 값이 모두 일치하는 엔티티의 ID 목록을 조회합니다."""
+        if not set(criteria) <= set(self._columns):
+            return [getattr(entity, self._id_field) for entity in self.find_by(**criteria)]
+        fields = sorted(criteria)
+        where = " AND ".join(f"{field} = ?" for field in fields)
+        rows = self._db.connection().execute(
+            f"SELECT id FROM {self._table} WHERE {where} ORDER BY id",
+            [self._to_column(criteria[field]) for field in fields],
+        )
+        return [row[0] for row in rows]
+
+    def count_by(self, **criteria) -> int:
+        """find_ids_by()와 같은 조건에 맞는 엔티티 수를 반환합니다."""
+        if not set(criteria) <= set(self._columns):
+            return len(self.find_by(**criteria))
+        fields = sorted(criteria)
+        where = " AND ".join(f"{field} = ?" for field in fields)
+        row = self._db.connection().execute(
+            f"SELECT COUNT(*) FROM {self._table} WHERE {where}",
+            [self._to_column(criteria[field]) for field in fields],
+        ).fetchone()
+        return row[0]
+
+    def find_ids_in_range(self, field: str, low: Any = None, high: Any = None) -> List[int]:
+        """필드 값이 [low, high] 범위(양 끝 포함, None이면 제한 없음)인 엔티티 ID를 값 순서로 조회합니다."""
+        column = self._require_column(field)
+        where, params = self._range_where(column, low, high)
+        rows = self._db.connection().execute(
+            f"SELECT id FROM {self._table} WHERE {where} ORDER BY {column}, id", params
+        )
+        return [row[0] for row in rows]
+
+    def count_in_range(self, field: str, low: Any = None, high: Any = None) -> int:
+        """find_ids_in_range()와 같은 범위의 엔티티 수를 반환합니다."""
+        column = self._require_column(field)
+        where, params = self._range_where(column, low, high)
+        row = self._db.connection().execute(f"SELECT COUNT(*) FROM {self._table} WHERE {where}", params).fetchone()
+        return row[0]
+
+    def _range_where(self, column: str, low: Any, high: Any) -> Tuple[str, List[Any]]:
+        conditions, params = [f"{column} IS NOT NULL"], []
+        if low is not None:
+            conditions.append(f"{column} >= ?")
+            params.append(self._to_column(low))
+        if high is not None:
+            conditions.append(f"{column} <= ?")
+            params.append(self._to_column(high))
+        return " AND ".join(conditions), params
+
+    def sorted_ids(self, field: str, descending: bool = False) -> List[int]:
+        """전체 엔티티 ID를 필드 값 순서로 반환합니다 (값이 같으면 ID 순서)."""
+        return list(self.iter_sorted_ids(field, descending))
+
+    def iter_sorted_ids(self, field: str, descending: bool = False) -> Iterator[int]:
+        """sorted_ids()와 같은 순서로 ID를 순회합니다. 결과 행을 목록으로 모으지 않고 커서에서 바로 읽습니다."""
+        column = self._require_column(field)
+        order = "DESC" if descending else "ASC"
+        rows = self._db.connection().execute(
+            f"SELECT id FROM {self._table} WHERE {column} IS NOT NULL ORDER BY {column} {order}, id {order}"
+        )
+        return (row[0] for row in rows)
+
+    def page_ids(self, field: str, after: Optional[Tuple[Any, int]] = None, limit: int = 20,
+                 descending: bool = False) -> List[int]:
+        """키셋 페이지네이션: (필드 값, ID) 순서에서 after 다음부터 최대 limit개의 ID를 반환합니다."""
+        column = self._require_column(field)
+        order, comparison = ("DESC", "<") if descending else ("ASC", ">")
+        conditions, params = [f"{column} IS NOT NULL"], []
+        if after is not None:
+            # 행 값 비교 (column, id) > (?, ?)는 (column, id) 복합 정렬 순서와 일치합니다.
+            conditions.append(f"({column}, id) {comparison} (?, ?)")
+            params.extend([self._to_column(after[0]), after[1]])
+        rows = self._db.connection().execute(
+            f"SELECT id FROM {self._table} WHERE {' AND '.join(conditions)} "
+            f"ORDER BY {column} {order}, id {order} LIMIT ?",
+            [*params, limit],
+        )
+        return [row[0] for row in rows]
+
+    def _require_column(self, field: str) -> str:
+        """필드에 해당하는 컬럼 이름을 반환합니다. 컬럼으로 관리되지 않는 필드면 ValueError를 발생시킵니다."""
+        if field == self._id_field:
+            return 'id'
+        if field not in self._columns:
+            raise ValueError(f"{field} is not an indexed column of {self._table}")
+        return field
+
+
+class SqliteCaravanRepository(SqliteRepository[Caravan]):
+    """CaravanRepository의 SQLite 구현. 검색/정렬 속성은 컬럼과 SQL 인덱스로 관리합니다."""
+    indexes = CaravanRepository.indexes
+
+    def __init__(self, database: SqliteDatabase):
+        super().__init__(database, Caravan, 'caravans')
+
+
+class SqliteReviewRepository(SqliteRepository[Review]):
+    """ReviewRepository의 SQLite 구현. (caravan_id) 인덱스가 rowid 순서를 함께 담으므로 최신순 페이지를 인덱스만으로 찾습니다."""
+    indexes = ReviewRepository.indexes
+
+    _SQL_PAGE_BY_CARAVAN = (
+        "SELECT data FROM reviews WHERE caravan_id = ? AND id < ? ORDER BY id DESC LIMIT ?"
+    )
+
+    def __init__(self, database: SqliteDatabase):
+        super().__init__(database, Review, 'reviews')
+
+    def page_by_caravan(self, caravan_id: int, before: Optional[int] = None, limit: int = 20) -> List[Review]:
+        """카라반의 리뷰를 최신순(review_id 내림차순)으로, before보다 작은 ID부터 최대 limit개 조회합니다."""
+        before = (1 << 63) - 1 if before is None else before
+        return self._decode_rows(
+            self._db.connection().execute(self._SQL_PAGE_BY_CARAVAN, (caravan_id, before, limit))
+        )
+
+
+class SqliteReservationRepository(SqliteRepository[Reservation]):
+    """
+    ReservationRepository의 SQLite 구현.
+    확정된 숙박만 담는 부분 인덱스(caravan_id, end_date)를 사용해 날짜 충돌을 범위 조건으로 검사합니다.
+    빈 날짜 조회용 비트맵 달력은 시작 시 확정 예약으로 채운 뒤, 이 프로세스의 저장/삭제에 맞춰 갱신합니다.
+    """
+    indexes = ReservationRepository.indexes
+    columns = ('start_date', 'end_date')
+
+    # 체크인 이후에 끝나는 숙박(대개 앞으로의 몇 건)만 인덱스로 훑고, 그중 체크아웃 전에 시작하는 것을 찾습니다.
+    # 겹치는 확정 숙박이 저장되어 있어도 정확합니다.
+    _SQL_OVERLAPPING_STAY = (
+        "SELECT 1 FROM reservations INDEXED BY ix_reservations_confirmed_ends "
+        "WHERE caravan_id = ? AND status = 'confirmed' AND end_date > ? AND start_date < ? LIMIT 1"
+    )
+
+    def __init__(self, database: SqliteDatabase):
+        super().__init__(database, Reservation, 'reservations')
+        conn = self._db.connection()
+        with conn:
+            conn.execute("DROP INDEX IF EXISTS ix_reservations_confirmed_stays")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_reservations_confirmed_ends "
+                "ON reservations (caravan_id, end_date, start_date) WHERE status = 'confirmed'"
+            )
+        self._calendar_lock = threading.Lock()
+        self.calendar = AvailabilityCalendar(epoch=date.today())
+        rows = conn.execute(
+            "SELECT data FROM reservations WHERE status = 'confirmed' AND end_date > ?", (date.today().isoformat(),)
+        )
+        for reservation in self._decode_rows(rows):
+            self.calendar.apply(reservation)
+
+    def save(self, reservation: Reservation) -> Reservation:
+        """예약을 저장하고 비트맵 달력을 갱신합니다."""
+        super().save(reservation)
+        with self._calendar_lock:
+            self.calendar.apply(reservation)
+        return reservation
+
+    def delete(self, reservation_id: int) -> bool:
+        """예약을 삭제하고 비트맵 달력에서도 제거합니다."""
+        with self._calendar_lock:
+            self.calendar.remove(reservation_id)
+        return super().delete(reservation_id)
+
+    def clear(self):
+        """모든 예약과 비트맵 달력을 비웁니다."""
+        super().clear()
+        with self._calendar_lock:
+            self.calendar.clear()
+
+    def cancel(self, reservation_id: int) -> Optional[Reservation]:
+        """예약을 취소 상태로 변경합니다."""
+        reservation = self.find_by_id(reservation_id)
+        if reservation is None:
+            return None
+        reservation.status = 'cancelled'
+        return self.save(reservation)
+
+    def find_by_caravan_id(self, caravan_id: int) -> List[Reservation]:
+        """특정 카라반의 모든 예약을 조회합니다."""
+        return self.find_by(caravan_id=caravan_id)
+
+    def find_by_user_id(self, user_id: int) -> List[Reservation]:
+        """특정 사용자의 모든 예약을 조회합니다."""
+        return self.find_by(user_id=user_id)
+
+    def check_caravan_availability(self, caravan_id: int, start_date: date, end_date: date) -> bool:
+        """
+        특정 카라반이 주어진 날짜에 이용 가능한지 확인합니다.
+        start_date 이후에 끝나는 확정 숙박 중 end_date 전에 시작하는 것이 있는지 인덱스 범위 조건으로 찾습니다.
+        """
+        row = self._db.connection().execute(
+            self._SQL_OVERLAPPING_STAY, (caravan_id, start_date.isoformat(), end_date.isoformat())
+        ).fetchone()
+        return row is None
+
+    def find_free_ranges(self, caravan_id: int, start_date: date, days: int) -> List[Tuple[date, date]]:
+        """start_date부터 days일 동안 특정 카라반을 예약할 수 있는 연속 기간 목록을 반환합니다."""
+        with self._calendar_lock:
+            return self.calendar.free_ranges(caravan_id, start_date, days)
+
+    def availability_grid(self, caravan_ids: Iterable[int], start_date: date, days: int) -> List[int]:
+        """여러 카라반의 빈 날 비트맵(비트 i = start_date + i일 예약 가능)을 한 번에 반환합니다."""
+        with self._calendar_lock:
+            return self.calendar.grid(caravan_ids, start_date, days)
+
+
+class SqliteUserRepository(SqliteRepository[User]):
+    """UserRepository의 SQLite 구현. 이메일은 UNIQUE 인덱스로 관리합니다."""
+    indexes = UserRepository.indexes
+
+    def __init__(self, database: SqliteDatabase):
+        super().__init__(database, User, 'users')
+
+    def find_by_email(self, email: str) -> Optional[User]:
+        """이메일로 사용자를 조회합니다."""
+        return self.find_one_by(email=email)
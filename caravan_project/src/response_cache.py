@@ -0,0 +1,120 @@
+
+import gzip
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from fastapi import Request, Response
+
+try:
+    import brotli
+except ImportError:  # brotli는 선택 의존성입니다. 없으면 gzip만 사용합니다.
+    brotli = None
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """미리 인코딩된 JSON 응답 본문과 압축 방식별 압축본"""
+    etag: str
+    body: bytes
+    encoded: Dict[str, bytes]
+
+    def etag_for(self, encoding: Optional[str]) -> str:
+        """표현(압축 방식)마다 다른 강한 ETag를 반환합니다."""
+        return self.etag if encoding is None else f'{self.etag[:-1]}-{encoding}"'
+
+class ResponseCache:
+    """
+    읽기 엔드포인트의 JSON 응답을 바이트로 미리 인코딩해 보관하는 캐시.
+    항목은 저장소 버전 번호와 함께 저장되며, 저장소가 변경되어 버전이 달라지면 다시 만들어집니다.
+    캐시 적중 시에는 모델 직렬화 없이 저장된 바이트를 그대로 응답하고,
+    If-None-Match가 ETag와 일치하면 본문 없이 304를 응답합니다.
+    """
+    def __init__(self, max_entries: int = 1024, min_compress_size: int = 512, gzip_level: int = 6):
+        self.max_entries = max_entries
+        self.min_compress_size = min_compress_size
+        self.gzip_level = gzip_level
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, version: Hashable, build: Callable[[], Any]) -> CachedResponse:
+        """
+        key에 해당하는 캐시 항목을 반환합니다. 없거나 버전이 다르면 build()로 내용을 만들어 저장합니다.
+        version은 build() 호출 전에 읽어야 빌드 중 발생한 변경이 다음 요청에서 반영됩니다.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        cached = self._encode(build())
+        with self._lock:
+            self._entries[key] = (version, cached)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return cached
+
+    def respond(self, request: Request, key: Hashable, version: Hashable, build: Callable[[], Any]) -> Response:
+        """캐시된 응답을 요청의 If-None-Match / Accept-Encoding에 맞춰 돌려줍니다."""
+        cached = self.get(key, version, build)
+        encoding = self._choose_encoding(request.headers.get("accept-encoding", ""), cached)
+        headers = {"ETag": cached.etag_for(encoding), "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+        if self._etag_matches(request.headers.get("if-none-match"), cached):
+            return Response(status_code=304, headers=headers)
+
+        body = cached.body
+        if encoding is not None:
+            body = cached.encoded[encoding]
+            headers["Content-Encoding"] = encoding
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _encode(self, content: Any) -> CachedResponse:
+        body = json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+        encoded: Dict[str, bytes] = {}
+        if len(body) >= self.min_compress_size:
+            encoded["gzip"] = gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+            if brotli is not None:
+                encoded["br"] = brotli.compress(body)
+        return CachedResponse(etag=etag, body=body, encoded=encoded)
+
+    @staticmethod
+    def _etag_matches(if_none_match: Optional[str], cached: CachedResponse) -> bool:
+        """If-None-Match가 이 응답의 어떤 표현(압축 여부 무관)의 ETag와 일치하는지 확인합니다."""
+        if not if_none_match:
+            return False
+        etags = {cached.etag_for(None), *(cached.etag_for(encoding) for encoding in cached.encoded)}
+        candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+        # If-None-Match는 약한 비교를 사용하므로 W/ 접두사는 무시합니다.
+        return "*" in candidates or any(candidate.removeprefix("W/") in etags for candidate in candidates)
+
+    @staticmethod
+    def _choose_encoding(accept_encoding: str, cached: CachedResponse) -> Optional[str]:
+        """클라이언트가 허용하는 압축 방식 중 brotli, gzip 순서로 선택합니다."""
+        accepted = set()
+        for part in accept_encoding.split(","):
+            name, _, params = part.partition(";")
+            key, _, value = params.strip().partition("=")
+            try:
+                # q=0은 해당 압축 방식을 거부한다는 의미입니다.
+                if key.strip() == "q" and float(value) == 0:
+                    continue
+            except ValueError:
+                continue
+            accepted.add(name.strip().lower())
+        for encoding in ("br", "gzip"):
+            if encoding in cached.encoded and (encoding in accepted or "*" in accepted):
+                return encoding
+        return None
@@ -1,6 +1,14 @@
+import ipaddress
+import re
+from urllib.parse import urlsplit
+
+import httpx
 from fastapi import Request
 from typing import Optional
 
+# Host names (letters, digits, '-', '.') or IP literals (IPv6 without brackets after urlsplit)
+_HOSTNAME = re.compile(r"^[A-Za-z0-9.\-]+$|^[0-9A-Fa-f:.]+(%[A-Za-z0-9]+)?$")
+
 def get_token_from_cookie(request: Request) -> Optional[str]:
     """
     Extracts the JWT from the 'access_token' cookie.
@@ -14,3 +22,55 @@ def get_token_from_cookie(request: Request) -> Optional[str]:
         return token.split("Bearer ")[1]
         
     return token
+
+
+def is_public_address(address: str) -> bool:
+    """
+    Returns True if the IP address is publicly routable.
+    Loopback, link-local, private, multicast, reserved and unspecified addresses
+    (including IPv4-mapped IPv6 forms of them) are not.
+    """
+    try:
+        ip = ipaddress.ip_address(address.split("%", 1)[0])
+    except ValueError:
+        return False
+    if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped is not None:
+        ip = ip.ipv4_mapped
+    return not (
+        ip.is_private or ip.is_loopback or ip.is_link_local or ip.is_multicast
+        or ip.is_reserved or ip.is_unspecified
+    )
+
+
+def check_outbound_url(url: str, allow_private: bool = False) -> str:
+    """
+    Validates a URL the server will send requests to (e.g. a webhook) and returns its hostname.
+    Requires an http(s) scheme, a well-formed host and a valid port. Unless allow_private is set,
+    hosts that are IP literals must be public, and 'localhost' names are rejected.
+    Names are checked again after DNS resolution when the request is sent.
+    Raises ValueError if the URL is not acceptable.
+    """
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+        httpx.URL(url)
+    except (ValueError, httpx.InvalidURL) as e:
+        raise ValueError(f"Invalid URL: {e}")
+    if parts.scheme not in ("http", "https"):
+        raise ValueError("URL must use http or https")
+    host = parts.hostname
+    if not host or not _HOSTNAME.match(host):
+        raise ValueError("URL must include a valid host")
+    if port == 0:
+        raise ValueError("URL must include a valid port")
+    if allow_private:
+        return host
+    if host == "localhost" or host.endswith(".localhost"):
+        raise ValueError("URL must not point to a local address")
+    try:
+        ipaddress.ip_address(host)
+    except ValueError:
+        return host  # 이름은 전송 시 DNS 조회 결과로 다시 검사합니다.
+    if not is_public_address(host):
+        raise ValueError("URL must not point to a private, loopback or link-local address")
+    return host
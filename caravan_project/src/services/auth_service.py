@@ -1,17 +1,16 @@
 import os
+import uuid
 import httpx
 from datetime import datetime, timedelta, timezone
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
 from jose import JWTError, jwt
 from dotenv import load_dotenv
-from passlib.context import CryptContext
 
 from src.models.user import User
 from src.repositories.user_repository import UserRepository
-
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from src.services.password_hasher import PasswordHasher
+from src.token_revocation import TokenRevocationStore
 
 # Load environment variables from .env file
 load_dotenv()
@@ -29,39 +28,106 @@ class AuthService:
     GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
     GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET")
     GOOGLE_REDIRECT_URI = os.getenv("GOOGLE_REDIRECT_URI")
-    GOOGLE_TOKEN_URL = "https://oauth2.googleapis.com/token"
-    GOOGLE_USERINFO_URL = "https://www.googleapis.com/oauth2/v3/userinfo"
-
-    def __init__(self, user_repository: UserRepository):
+    # Provider endpoints can point at a local stand-in server for offline testing and benchmarks.
+    GOOGLE_AUTH_URL = os.getenv("GOOGLE_AUTH_URL", "https://accounts.google.com/o/oauth2/v2/auth")
+    GOOGLE_TOKEN_URL = os.getenv("GOOGLE_TOKEN_URL", "https://oauth2.googleapis.com/token")
+    GOOGLE_USERINFO_URL = os.getenv("GOOGLE_USERINFO_URL", "https://www.googleapis.com/oauth2/v3/userinfo")
+
+    def __init__(
+        self,
+        user_repository: UserRepository,
+        password_hasher: Optional[PasswordHasher] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+        revocations: Optional[TokenRevocationStore] = None,
+    ):
         self.user_repository = user_repository
+        self.password_hasher = password_hasher or PasswordHasher()
+        self.revocations = revocations or TokenRevocationStore(
+            token_lifetime_seconds=self.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        )
+        # Shared pooled client for OAuth calls; normally opened and closed by the app lifespan.
+        self.http_client = http_client
+
+    @staticmethod
+    def create_http_client(
+        max_connections: int = 100, max_keepalive_connections: int = 20, timeout: float = 10.0
+    ) -> httpx.AsyncClient:
+        """Creates a keep-alive connection pool for calls to the OAuth provider."""
+        return httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections, max_keepalive_connections=max_keepalive_connections
+            ),
+            timeout=httpx.Timeout(timeout),
+        )
+
+    async def aclose(self):
+        if self.http_client is not None:
+            await self.http_client.aclose()
+            self.http_client = None
+
+    def _client(self) -> httpx.AsyncClient:
+        if self.http_client is None:
+            self.http_client = self.create_http_client()
+        return self.http_client
 
     # --- Password Hashing ---
-    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        return pwd_context.verify(plain_password, hashed_password)
+    async def verify_password(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """Returns (matches, new hash if the stored hash uses a different bcrypt cost)."""
+        return await self.password_hasher.verify(plain_password, hashed_password)
 
-    def get_password_hash(self, password: str) -> str:
-        print(f"--- DEBUG: About to hash password. Value: '{password}', Type: {type(password)} ---")
-        return pwd_context.hash(password)
+    async def get_password_hash(self, password: str) -> str:
+        return await self.password_hasher.hash(password)
 
     # --- Token Creation ---
     def create_access_token(self, data: dict, expires_delta: Optional[timedelta] = None) -> str:
-        """Creates a new JWT access token."""
+        """
+        Creates a new JWT access token.
+        Each token gets a unique `jti` so it can be revoked on its own, and a sub-second `iat`
+        so tokens issued right after a user-wide revocation are still accepted.
+        """
         to_encode = data.copy()
+        now = datetime.now(timezone.utc)
         if expires_delta:
-            expire = datetime.now(timezone.utc) + expires_delta
+            expire = now + expires_delta
         else:
-            expire = datetime.now(timezone.utc) + timedelta(minutes=self.ACCESS_TOKEN_EXPIRE_MINUTES)
-        to_encode.update({"exp": expire})
+            expire = now + timedelta(minutes=self.ACCESS_TOKEN_EXPIRE_MINUTES)
+        to_encode.update({"exp": expire, "iat": now.timestamp(), "jti": uuid.uuid4().hex})
         encoded_jwt = jwt.encode(to_encode, self.SECRET_KEY, algorithm=self.ALGORITHM)
         return encoded_jwt
 
+    # --- Token Revocation ---
+    def is_token_revoked(self, payload: Dict[str, Any]) -> bool:
+        """Checks a decoded token against revoked tokens and user-wide revocations."""
+        return self.revocations.is_revoked(payload.get("jti"), payload.get("user_id"), payload.get("iat"))
+
+    def revoke_token(self, payload: Dict[str, Any]):
+        """Revokes a single decoded token (e.g. on logout) until it expires."""
+        if payload.get("jti") is not None and payload.get("exp") is not None:
+            self.revocations.revoke(payload["jti"], payload["exp"])
+
+    async def change_password(self, user: User, current_password: str, new_password: str) -> User:
+        """
+        Changes a user's password after checking the current one, and revokes every token issued to the user so far.
+        """
+        if not user.hashed_password:
+            raise ValueError("This account does not use a password")
+        verified, _ = await self.verify_password(current_password, user.hashed_password)
+        if not verified:
+            raise ValueError("Current password is incorrect")
+        hashed_password = await self.get_password_hash(new_password)
+        # Revoke before saving, so a request that validates an old token while the save
+        # clears the token cache cannot put that token back into the cache.
+        self.revocations.revoke_user(user.user_id)
+        user.hashed_password = hashed_password
+        return self.user_repository.save(user)
+
     # --- Direct Authentication ---
-    def register_user(self, name: str, email: str, password: str) -> User:
+    async def register_user(self, name: str, email: str, password: str) -> User:
         """Registers a new user with email and password."""
         if self.user_repository.find_by_email(email):
             raise ValueError("User with this email already exists")
         
-        hashed_password = self.get_password_hash(password)
+        hashed_password = await self.get_password_hash(password)
         new_user = User(
             name=name,
             email=email,
@@ -70,41 +136,46 @@ class AuthService:
         )
         return self.user_repository.save(new_user)
 
-    def authenticate_user(self, email: str, password: str) -> Optional[User]:
-        """Authenticates a user by email and password."""
+    async def authenticate_user(self, email: str, password: str) -> Optional[User]:
+        """
+        Authenticates a user by email and password.
+        If the stored hash was made with a different bcrypt cost, it is replaced with one at the current cost.
+        """
         user = self.user_repository.find_by_email(email)
         if not user or not user.hashed_password:
             return None
-        if not self.verify_password(password, user.hashed_password):
+        verified, new_hash = await self.verify_password(password, user.hashed_password)
+        if not verified:
             return None
+        if new_hash:
+            user.hashed_password = new_hash
+            self.user_repository.save(user)
         return user
 
     # --- Google OAuth2 ---
     async def _get_google_token(self, code: str) -> Dict[str, Any]:
         """Exchange authorization code for Google access token."""
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                self.GOOGLE_TOKEN_URL,
-                data={
-                    "code": code,
-                    "client_id": self.GOOGLE_CLIENT_ID,
-                    "client_secret": self.GOOGLE_CLIENT_SECRET,
-                    "redirect_uri": self.GOOGLE_REDIRECT_URI,
-                    "grant_type": "authorization_code",
-                },
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await self._client().post(
+            self.GOOGLE_TOKEN_URL,
+            data={
+                "code": code,
+                "client_id": self.GOOGLE_CLIENT_ID,
+                "client_secret": self.GOOGLE_CLIENT_SECRET,
+                "redirect_uri": self.GOOGLE_REDIRECT_URI,
+                "grant_type": "authorization_code",
+            },
+        )
+        response.raise_for_status()
+        return response.json()
 
     async def _get_google_user_info(self, token: str) -> Dict[str, Any]:
         """Fetch user information from Google using access token."""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                self.GOOGLE_USERINFO_URL,
-                headers={"Authorization": f"Bearer {token}"},
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await self._client().get(
+            self.GOOGLE_USERINFO_URL,
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        response.raise_for_status()
+        return response.json()
 
     async def handle_google_login(self, code: str) -> str:
         """Main logic for Google login."""
@@ -133,7 +204,7 @@ class AuthService:
     def get_google_auth_url(self) -> str:
         """Constructs the Google authorization URL for the frontend."""
         return (
-            f"https://accounts.google.com/o/oauth2/v2/auth?"
+            f"{self.GOOGLE_AUTH_URL}?"
             f"client_id={self.GOOGLE_CLIENT_ID}&"
             f"redirect_uri={self.GOOGLE_REDIRECT_URI}&"
             f"response_type=code&"
@@ -0,0 +1,186 @@
+import heapq
+import threading
+from collections import Counter, defaultdict
+from concurrent.futures import CancelledError, Executor, Future, ProcessPoolExecutor
+from itertools import permutations
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from src.patterns.observers import Observer
+from src.repositories.reservation_repository import ReservationRepository
+
+# (user_id, caravan_id)
+Booking = Tuple[int, int]
+
+class CoBookingModel:
+    """
+    "이 카라반을 예약한 사람들이 함께 예약한 카라반" 모델.
+    카라반 x 카라반 동시 예약 수를 0이 아닌 칸만 담은 희소 행렬(dict of Counter)로 보관하고,
+    카라반별 상위 top_n 목록과 사용자별 추천 목록을 미리 계산해 두어 조회는 dict 조회 한 번입니다.
+    """
+    def __init__(self, top_n: int = 20):
+        self.top_n = top_n
+        self.user_caravans: Dict[int, Set[int]] = defaultdict(set)
+        self.caravan_users: Dict[int, Set[int]] = defaultdict(set)
+        # counts[a][b] = a와 b를 모두 예약한 사용자 수 (대칭)
+        self.counts: Dict[int, Counter] = defaultdict(Counter)
+        self.ranked: Dict[int, List[int]] = {}
+        self.user_ranked: Dict[int, List[int]] = {}
+
+    def add_booking(self, user_id: int, caravan_id: int):
+        """
+        예약 하나를 반영합니다. 이미 예약한 적 있는 (사용자, 카라반)이면 아무것도 바뀌지 않습니다.
+        바뀐 행의 카라반 순위만 다시 계산하고, 영향을 받는 사용자의 추천은 다음 조회 때 다시 계산합니다.
+        """
+        booked = self.user_caravans[user_id]
+        if caravan_id in booked:
+            return
+        for other in booked:
+            self.counts[caravan_id][other] += 1
+            self.counts[other][caravan_id] += 1
+        touched = booked | {caravan_id}
+        booked.add(caravan_id)
+        self.caravan_users[caravan_id].add(user_id)
+        for touched_id in touched:
+            self.ranked[touched_id] = self._rank(self.counts[touched_id], ())
+            for affected_user in self.caravan_users[touched_id]:
+                self.user_ranked.pop(affected_user, None)
+
+    def also_booked(self, caravan_id: int) -> List[int]:
+        return self.ranked.get(caravan_id, [])
+
+    def for_user(self, user_id: int) -> List[int]:
+        """사용자가 예약한 카라반들의 동시 예약 수를 합산해, 아직 예약하지 않은 카라반을 순서대로 돌려줍니다."""
+        ranked = self.user_ranked.get(user_id)
+        if ranked is None:
+            booked = self.user_caravans.get(user_id, ())
+            scores = Counter()
+            for caravan_id in booked:
+                scores.update(self.counts.get(caravan_id, {}))
+            ranked = self.user_ranked[user_id] = self._rank(scores, booked)
+        return ranked
+
+    def rank_all(self):
+        """모든 카라반과 사용자의 추천 목록을 계산합니다."""
+        self.ranked = {caravan_id: self._rank(row, ()) for caravan_id, row in self.counts.items()}
+        self.user_ranked = {}
+        for user_id in self.user_caravans:
+            self.for_user(user_id)
+
+    def _rank(self, scores: Dict[int, int], exclude: Iterable[int]) -> List[int]:
+        # 점수가 같으면 ID가 작은 카라반이 먼저 옵니다.
+        candidates = ((caravan_id, score) for caravan_id, score in scores.items() if caravan_id not in exclude)
+        return [caravan_id for caravan_id, _ in heapq.nlargest(self.top_n, candidates, key=lambda kv: (kv[1], -kv[0]))]
+
+
+def build_co_booking_model(bookings: List[Booking], top_n: int = 20) -> CoBookingModel:
+    """(사용자, 카라반) 예약 목록으로 모델 전체를 만듭니다. 작업 프로세스에서 실행할 수 있는 최상위 함수입니다."""
+    model = CoBookingModel(top_n)
+    for user_id, caravan_id in bookings:
+        model.user_caravans[user_id].add(caravan_id)
+        model.caravan_users[caravan_id].add(user_id)
+    for caravans in model.user_caravans.values():
+        for a, b in permutations(caravans, 2):
+            model.counts[a][b] += 1
+    model.rank_all()
+    return model
+
+
+class CoBookingRecommender(Observer):
+    """
+    예약 이력 기반 추천을 제공하는 옵저버.
+    - 전체 재계산: 예약 저장소의 (사용자, 카라반) 목록을 작업 프로세스에 넘겨 모델을 새로 만든 뒤 참조를 한 번에 교체합니다.
+      재계산 중에 들어온 예약은 따로 기록해 두었다가 새 모델에 다시 반영한 뒤 교체하므로 유실되지 않습니다.
+    - 증분 갱신: ReservationService의 예약 알림마다 모델에 바로 반영합니다.
+    취소된 예약은 다음 전체 재계산 때 빠집니다.
+    """
+    def __init__(self, reservation_repo: ReservationRepository, top_n: int = 20, executor: Optional[Executor] = None):
+        self.reservation_repo = reservation_repo
+        self.top_n = top_n
+        self._model = CoBookingModel(top_n)
+        self._lock = threading.Lock()
+        self._executor = executor
+        self._owns_executor = executor is None
+        # 재계산이 진행 중일 때만 리스트 (그동안 들어온 예약)
+        self._pending: Optional[List[Booking]] = None
+        self._running: Optional[Future] = None
+
+    def update(self, subject, **kwargs):
+        reservation = kwargs.get('reservation')
+        reservations = kwargs.get('reservations') or ([reservation] if reservation else [])
+        for reservation in reservations:
+            self.record(reservation.user_id, reservation.caravan_id)
+
+    def record(self, user_id: int, caravan_id: int):
+        """새 예약 하나를 모델에 반영합니다."""
+        with self._lock:
+            self._model.add_booking(user_id, caravan_id)
+            if self._pending is not None:
+                self._pending.append((user_id, caravan_id))
+
+    def also_booked(self, caravan_id: int, top_n: int = 5) -> List[int]:
+        with self._lock:
+            return self._model.also_booked(caravan_id)[:top_n]
+
+    def for_user(self, user_id: int, top_n: int = 5) -> List[int]:
+        with self._lock:
+            return self._model.for_user(user_id)[:top_n]
+
+    def rebuild(self):
+        """현재 프로세스에서 모델을 다시 만들어 교체합니다. 만드는 동안 새 예약 반영은 기다립니다."""
+        with self._lock:
+            self._model = build_co_booking_model(self._bookings(), self.top_n)
+
+    def rebuild_in_background(self) -> Future:
+        """
+        작업 프로세스에서 모델을 다시 만듭니다. 돌려주는 Future는 새 모델로 교체가 끝나면 완료됩니다.
+        이미 진행 중이면 그 Future를 돌려줍니다.
+        예약 목록 전체를 읽는 동안에는 잠금을 잡지 않으므로 새 예약 반영과 조회를 막지 않습니다.
+        목록 읽기도 오래 걸릴 수 있으므로 이벤트 루프에서는 asyncio.to_thread로 호출하세요.
+        """
+        with self._lock:
+            if self._running is not None:
+                return self._running
+            # 목록을 읽기 전에 기록을 시작해야 그 사이에 들어온 예약도 놓치지 않습니다 (중복 반영은 무시됨).
+            self._pending = []
+            swapped = self._running = Future()
+            # 실행 중 상태로 두어 기다리는 쪽이 취소해도 교체 결과를 기록할 수 있게 합니다.
+            swapped.set_running_or_notify_cancel()
+        try:
+            bookings = self._bookings()
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(max_workers=1)
+                executor = self._executor
+            build = executor.submit(build_co_booking_model, bookings, self.top_n)
+        except Exception as e:
+            with self._lock:
+                self._pending = self._running = None
+            swapped.set_exception(e)
+            raise
+        build.add_done_callback(lambda future: self._swap(future, swapped))
+        return swapped
+
+    def close(self):
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _swap(self, build: Future, swapped: Future):
+        with self._lock:
+            pending, self._pending, self._running = self._pending or [], None, None
+            error = CancelledError() if build.cancelled() else build.exception()
+            if error is None:
+                model = build.result()
+                for user_id, caravan_id in pending:
+                    model.add_booking(user_id, caravan_id)
+                self._model = model
+        if error is None:
+            swapped.set_result(None)
+        else:
+            print(f"[CoBooking] 모델 재계산 실패: {error!r}")
+            swapped.set_exception(error)
+
+    def _bookings(self) -> List[Booking]:
+        return [
+            (reservation.user_id, reservation.caravan_id)
+            for reservation in self.reservation_repo.get_all() if reservation.status != 'cancelled'
+        ]
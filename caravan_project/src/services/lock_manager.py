@@ -0,0 +1,30 @@
+
+import threading
+from contextlib import contextmanager
+from typing import Hashable, Iterator, List
+
+class StripedLockManager:
+    """
+    임의의 키(카라반, 사용자 등)를 고정된 개수의 잠금(stripe)에 나누어 매핑하는 잠금 관리자.
+    서로 다른 키는 대부분 다른 잠금에 매핑되어 병렬로 처리되고, 같은 키를 다루는 작업만 직렬화됩니다.
+    여러 키를 잡을 때는 항상 stripe 번호 순서로 획득하므로 교착 상태가 발생하지 않습니다.
+    """
+    def __init__(self, stripes: int = 256):
+        self._locks: List[threading.Lock] = [threading.Lock() for _ in range(stripes)]
+
+    def _stripes_for(self, keys) -> List[int]:
+        return sorted({hash(key) % len(self._locks) for key in keys})
+
+    @contextmanager
+    def acquire(self, *keys: Hashable) -> Iterator[None]:
+        """주어진 모든 키의 잠금을 고정된 순서로 획득하고, 블록을 벗어나면 해제합니다."""
+        stripes = self._stripes_for(keys)
+        acquired = []
+        try:
+            for stripe in stripes:
+                self._locks[stripe].acquire()
+                acquired.append(stripe)
+            yield
+        finally:
+            for stripe in reversed(acquired):
+                self._locks[stripe].release()
@@ -1,32 +1,337 @@
+import asyncio
+import inspect
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Set, Union
+
+@dataclass
+class Notification:
+    """사용자에게 전달할 알림 하나. coalesce가 참인 알림은 같은 사용자의 다른 알림과 요약(digest)으로 묶일 수 있습니다."""
+    user_id: int
+    message: str
+    coalesce: bool = False
+    created_at: float = field(default_factory=time.time)
+
+# 연결이 등록되지 않은 온라인 사용자에게 알림 목록을 전달하는 함수. 코루틴 함수여도 됩니다.
+Deliver = Callable[[int, List[Notification]], Union[None, Awaitable[None]]]
+
+
+class NotificationConnection:
+    """
+    실시간 연결(WebSocket 등) 하나의 송신 버퍼.
+    push는 버퍼에 넣기만 하고 바로 반환하며, 실제 전송은 연결마다 도는 run 루프가 맡습니다.
+    그래서 느린 클라이언트는 자기 버퍼만 채울 뿐 다른 연결로의 전송을 막지 못합니다.
+    버퍼(buffer_size)가 가득 차면 policy에 따라 새 알림을 버리거나('drop') 연결을 끊습니다('disconnect').
+    close는 진행 중인 전송도 취소하므로, 읽지 않는 클라이언트에 묶여 있던 run도 바로 끝납니다.
+    """
+    def __init__(
+        self,
+        send: Callable[[dict], Awaitable[None]],
+        buffer_size: int = 100,
+        policy: str = 'disconnect',
+    ):
+        if policy not in ('drop', 'disconnect'):
+            raise ValueError(f"Unknown slow consumer policy: {policy}")
+        self._send = send
+        self.policy = policy
+        self._buffer: asyncio.Queue = asyncio.Queue(maxsize=buffer_size)
+        self._runner: Optional[asyncio.Task] = None
+        # 닫힐 때 한 번 호출됩니다 (NotificationService가 연결 목록에서 지우는 데 씀).
+        self._on_close: Optional[Callable[[], None]] = None
+        self.closed = False
+        self.sent = 0
+        self.dropped = 0
+
+    def push(self, notification: Notification) -> bool:
+        """알림을 송신 버퍼에 넣습니다. 넣지 못했으면 False."""
+        if self.closed:
+            return False
+        try:
+            self._buffer.put_nowait(notification)
+            return True
+        except asyncio.QueueFull:
+            self.dropped += 1
+            if self.policy == 'disconnect':
+                self.close()
+            return False
+
+    def close(self):
+        """송신 루프를 멈춥니다. 버퍼에 남은 알림은 버리고, 진행 중인 전송은 취소합니다."""
+        if self.closed:
+            return
+        self._mark_closed()
+        while not self._buffer.empty():
+            self._buffer.get_nowait()
+        self._buffer.put_nowait(None)
+        runner = self._runner
+        if runner is not None and runner is not asyncio.current_task():
+            runner.cancel()
+
+    async def run(self):
+        """연결이 닫히거나 전송이 실패할 때까지 버퍼의 알림을 순서대로 보냅니다."""
+        self._runner = asyncio.current_task()
+        try:
+            while not self.closed:
+                notification = await self._buffer.get()
+                if notification is None:
+                    return
+                try:
+                    await self._send({
+                        "user_id": notification.user_id,
+                        "message": notification.message,
+                        "created_at": notification.created_at,
+                    })
+                except asyncio.CancelledError:
+                    raise
+                except Exception:
+                    # 끊어진 연결: 더 보내지 않고 루프를 끝냅니다.
+                    self._mark_closed()
+                    return
+                self.sent += 1
+        except asyncio.CancelledError:
+            # close가 취소한 경우만 정상 종료이고, 바깥에서 취소하면 그대로 전달합니다.
+            if not self.closed:
+                raise
+        finally:
+            self._runner = None
+
+    def _mark_closed(self):
+        self.closed = True
+        on_close, self._on_close = self._on_close, None
+        if on_close is not None:
+            on_close()
 
-from typing import Dict, Set
 
 class NotificationService:
     """
-    사용자 알림을 관리하고 전송을 시뮬레이션하는 서비스.
-    실제 환경에서는 WebSocket 연결 관리자 또는 메시지 큐와 연동됩니다.
+    사용자 알림을 비동기로 묶어 전달하는 서비스.
+    - send는 요청 경로에서 호출되며 알림을 큐에 넣기만 하고 바로 반환합니다 (O(1), 대기 없음).
+      이벤트 루프 밖(요청 스레드)에서 호출되어도 call_soon_threadsafe로 넘기므로 안전합니다.
+    - 전달 작업자는 사용자 ID로 나눈 큐마다 하나씩 있어, 같은 사용자의 알림 순서가 유지됩니다.
+      작업자는 첫 알림 뒤 batch_window초 동안 쌓인 알림을 batch_size개까지 한 번에 꺼내 사용자별로 모아 전달합니다.
+    - 같은 사용자에게 묶을 수 있는(coalesce) 알림이 한 묶음에 여러 개면 요약 알림 하나로 합칩니다.
+    - 오프라인 사용자의 알림은 사용자별 메일박스(최대 mailbox_size개, 넘치면 오래된 것부터 버림)에 보관했다가
+      connect 때 같은 방식으로 요약해 전달합니다.
+    - connect에 NotificationConnection을 넘기면 그 사용자의 알림은 등록된 모든 연결의 송신 버퍼로 나뉘어 들어갑니다.
+      연결은 닫히는 즉시(느린 소비자로 끊긴 경우 포함) 목록에서 빠지고, 사용자는 마지막 연결이 끊길 때 오프라인이 됩니다.
+      어느 연결에도 들어가지 못한 알림은 사용자가 오프라인이 되었으면 메일박스에 보관합니다.
     """
-    def __init__(self):
+    def __init__(
+        self,
+        deliver: Optional[Deliver] = None,
+        workers: int = 4,
+        batch_size: int = 100,
+        batch_window: float = 0.0,
+        queue_size: int = 10000,
+        mailbox_size: int = 100,
+    ):
+        self._deliver = deliver or self._print
+        self.workers = workers
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.queue_size = queue_size
+        self.mailbox_size = mailbox_size
         # 현재 '온라인' 상태인 사용자 ID를 저장하는 집합
         self._online_users: Set[int] = set()
+        self._mailboxes: Dict[int, Deque[Notification]] = {}
+        # user_id -> 실시간 연결 목록 (한 사용자가 여러 탭/기기로 연결할 수 있음)
+        self._connections: Dict[int, List[NotificationConnection]] = {}
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queues: List[asyncio.Queue] = []
+        self._tasks: List[asyncio.Task] = []
+        # start 전에 보낸 알림
+        self._early: List[Notification] = []
+        self.sent = 0
+        self.delivered = 0
+        self.dropped = 0
+
+    async def start(self):
+        """현재 이벤트 루프에서 전달 작업자를 시작합니다. start 전에 보낸 알림도 이때 큐에 넣습니다."""
+        self._loop = asyncio.get_running_loop()
+        self._queues = [asyncio.Queue(maxsize=self.queue_size) for _ in range(self.workers)]
+        self._tasks = [asyncio.create_task(self._work(queue)) for queue in self._queues]
+        with self._lock:
+            early, self._early = self._early, []
+        for notification in early:
+            self._enqueue(notification)
 
-    def connect(self, user_id: int):
-        """사용자가 연결(온라인)되었음을 시뮬레이션합니다."""
+    async def stop(self):
+        """큐에 남은 알림을 모두 처리한 뒤 작업자를 멈춥니다."""
+        for queue in self._queues:
+            await queue.join()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._loop, self._queues, self._tasks = None, [], []
+
+    def connect(self, user_id: int, connection: Optional[NotificationConnection] = None) -> List[Notification]:
+        """
+        사용자를 온라인으로 표시하고(연결이 주어지면 등록), 메일박스에 쌓인 알림을 요약해 돌려줍니다.
+        돌려준 알림은 등록된 연결 또는 전달 함수로도 보냅니다.
+        """
         print(f"[System] 사용자 {user_id}가 연결되었습니다.")
-        self._online_users.add(user_id)
+        with self._lock:
+            self._online_users.add(user_id)
+            if connection is not None and not connection.closed:
+                self._connections.setdefault(user_id, []).append(connection)
+                connection._on_close = lambda: self._forget(user_id, connection)
+            pending = self._coalesce(list(self._mailboxes.pop(user_id, ())))
+        if pending:
+            self._schedule_delivery(user_id, pending)
+        return pending
 
-    def disconnect(self, user_id: int):
-        """사용자 연결이 끊어졌음(오프라인)을 시뮬레이션합니다."""
+    def disconnect(self, user_id: int, connection: Optional[NotificationConnection] = None):
+        """
+        사용자 연결이 끊어졌음을 표시합니다. 연결이 주어지면 그 연결만 해제하고,
+        남은 연결이 없을 때 오프라인으로 바꿉니다.
+        """
         print(f"[System] 사용자 {user_id}가 연결 해제되었습니다.")
-        self._online_users.discard(user_id)
+        if connection is not None:
+            connection.close()
+            self._forget(user_id, connection)
+            return
+        with self._lock:
+            self._online_users.discard(user_id)
+            remaining = self._connections.pop(user_id, ())
+        for other in remaining:
+            other.close()
+
+    def _forget(self, user_id: int, connection: NotificationConnection):
+        """닫힌 연결을 목록에서 지우고, 마지막 연결이었으면 사용자를 오프라인으로 바꿉니다."""
+        with self._lock:
+            connections = self._connections.get(user_id)
+            if connections is None or connection not in connections:
+                return
+            connections.remove(connection)
+            if not connections:
+                del self._connections[user_id]
+                self._online_users.discard(user_id)
+
+    def connection_count(self) -> int:
+        with self._lock:
+            return sum(len(connections) for connections in self._connections.values())
 
-    def send(self, user_id: int, message: str):
-        """특정 사용자에게 알림을 보냅니다."""
-        if user_id in self._online_users:
-            # 사용자가 온라인일 경우, 실시간 메시지 전송을 시뮬레이션
-            print(f"   L [WebSocket] 사용자(ID: {user_id})에게 전송: \"{message}\"")
+    def send(self, user_id: int, message: str, coalesce: bool = False):
+        """특정 사용자에게 알림을 보냅니다. 큐에 넣기만 하고 바로 반환합니다."""
+        notification = Notification(user_id=user_id, message=message, coalesce=coalesce)
+        self.sent += 1
+        loop = self._loop
+        if loop is None:
+            with self._lock:
+                self._early.append(notification)
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._enqueue(notification)
         else:
-            # 사용자가 오프라인일 경우, 나중에 전송하기 위해 큐에 저장함을 시뮬레이션
-            print(f"  L [Offline] 사용자(ID: {user_id})의 알림을 큐에 저장: \"{message}\"")
+            loop.call_soon_threadsafe(self._enqueue, notification)
+
+    def mailbox(self, user_id: int) -> List[Notification]:
+        with self._lock:
+            return list(self._mailboxes.get(user_id, ()))
+
+    def _enqueue(self, notification: Notification):
+        queue = self._queues[hash(notification.user_id) % len(self._queues)]
+        try:
+            queue.put_nowait(notification)
+        except asyncio.QueueFull:
+            # 요청 경로를 막지 않기 위해 큐가 가득 차면 버리고 기록만 남깁니다.
+            self.dropped += 1
+
+    async def _work(self, queue: asyncio.Queue):
+        while True:
+            batch = [await queue.get()]
+            if self.batch_window:
+                # 잠시 기다려 같은 사용자에게 몰리는 알림이 한 묶음에 들어오게 합니다.
+                await asyncio.sleep(self.batch_window)
+            while len(batch) < self.batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            try:
+                await self._dispatch(batch)
+            except Exception as e:
+                print(f"[Notification] 알림 전달 실패: {e!r}")
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def _dispatch(self, batch: List[Notification]):
+        # 사용자별로 모으되, 사용자가 처음 나온 순서와 사용자 안의 순서는 유지합니다.
+        by_user: "OrderedDict[int, List[Notification]]" = OrderedDict()
+        for notification in batch:
+            by_user.setdefault(notification.user_id, []).append(notification)
+        for user_id, notifications in by_user.items():
+            with self._lock:
+                online = user_id in self._online_users
+                if not online:
+                    self._store(user_id, notifications)
+            if online:
+                await self._call_deliver(user_id, self._coalesce(notifications))
+
+    def _store(self, user_id: int, notifications: List[Notification]):
+        """오프라인 사용자의 메일박스에 알림을 넣습니다. self._lock을 잡은 채로 호출합니다."""
+        mailbox = self._mailboxes.setdefault(user_id, deque())
+        for notification in notifications:
+            if len(mailbox) >= self.mailbox_size:
+                mailbox.popleft()
+                self.dropped += 1
+            mailbox.append(notification)
+            print(f"  L [Offline] 사용자(ID: {user_id})의 알림을 큐에 저장: \"{notification.message}\"")
+
+    async def _call_deliver(self, user_id: int, notifications: List[Notification]):
+        with self._lock:
+            connections = list(self._connections.get(user_id, ()))
+        if connections:
+            # 송신 버퍼에 넣기만 하므로 연결 수나 느린 클라이언트와 무관하게 바로 끝납니다.
+            rejected = []
+            for notification in notifications:
+                accepted = [connection.push(notification) for connection in connections]
+                if not any(accepted):
+                    rejected.append(notification)
+            if rejected:
+                # 버퍼가 넘쳐 모든 연결이 닫혔다면 사용자는 이제 오프라인이므로 메일박스에 보관합니다.
+                with self._lock:
+                    if user_id not in self._online_users:
+                        self._store(user_id, rejected)
+            self.delivered += len(notifications) - len(rejected)
+        else:
+            result = self._deliver(user_id, notifications)
+            if inspect.isawaitable(result):
+                await result
+            self.delivered += len(notifications)
+
+    def _schedule_delivery(self, user_id: int, notifications: List[Notification]):
+        # 작업자가 돌고 있지 않으면 connect의 반환값으로만 전달됩니다.
+        if self._loop is not None:
+            asyncio.run_coroutine_threadsafe(self._call_deliver(user_id, notifications), self._loop)
 
+    @staticmethod
+    def _coalesce(notifications: List[Notification]) -> List[Notification]:
+        """묶을 수 있는 알림이 두 개 이상이면 요약 알림 하나로 합쳐 첫 번째 알림 자리에 둡니다."""
+        coalescible = [notification for notification in notifications if notification.coalesce]
+        if len(coalescible) < 2:
+            return notifications
+        first = coalescible[0]
+        digest = Notification(
+            user_id=first.user_id,
+            message=f"새 알림 {len(coalescible)}건: " + " / ".join(n.message for n in coalescible),
+            coalesce=True,
+            created_at=first.created_at,
+        )
+        merged = []
+        for notification in notifications:
+            if notification is first:
+                merged.append(digest)
+            elif not notification.coalesce:
+                merged.append(notification)
+        return merged
 
+    @staticmethod
+    def _print(user_id: int, notifications: List[Notification]):
+        for notification in notifications:
+            print(f"   L [WebSocket] 사용자(ID: {user_id})에게 전송: \"{notification.message}\"")
@@ -0,0 +1,89 @@
+import asyncio
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from passlib.context import CryptContext
+
+class PasswordHasherBusy(Exception):
+    """처리 중인 해시 작업이 한도에 도달해 새 작업을 받을 수 없을 때 발생하는 예외"""
+    pass
+
+
+@lru_cache(maxsize=None)
+def _context(rounds: int) -> CryptContext:
+    # min/max를 기본 비용과 같게 두어, 비용이 다른 해시는 verify_and_update가 새 해시를 돌려주게 합니다.
+    return CryptContext(
+        schemes=["bcrypt"], deprecated="auto",
+        bcrypt__default_rounds=rounds, bcrypt__min_rounds=rounds, bcrypt__max_rounds=rounds,
+    )
+
+
+def hash_password(password: str, rounds: int) -> str:
+    """bcrypt 해시를 만듭니다. 작업 프로세스에서 실행할 수 있는 최상위 함수입니다."""
+    return _context(rounds).hash(password)
+
+
+def verify_password(password: str, hashed_password: str, rounds: int) -> Tuple[bool, Optional[str]]:
+    """
+    비밀번호를 검증합니다. 작업 프로세스에서 실행할 수 있는 최상위 함수입니다.
+    (일치 여부, 새 해시)를 돌려주며, 새 해시는 일치하고 저장된 해시의 비용이 rounds와 다를 때만 만들어집니다.
+    """
+    return _context(rounds).verify_and_update(password, hashed_password)
+
+
+class PasswordHasher:
+    """
+    bcrypt 해시/검증을 작업 프로세스 풀에서 실행하는 비동기 래퍼.
+    요청 스레드가 해시 계산(비용 12 기준 수백 ms의 CPU)을 기다리며 묶이지 않고,
+    GIL과 무관하게 작업자 수만큼 병렬로 계산됩니다.
+    처리 중(대기 포함)인 작업이 max_pending개에 도달하면 큐에 쌓지 않고 즉시 PasswordHasherBusy를 발생시켜,
+    로그인 폭주 시 지연이 끝없이 늘어나는 대신 호출자가 바로 거절(503)할 수 있게 합니다.
+    """
+    def __init__(
+        self,
+        rounds: int = 12,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        executor: Optional[Executor] = None,
+    ):
+        self.rounds = rounds
+        self.max_workers = max_workers
+        self.max_pending = max_pending or (max_workers or 4) * 4
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._executor_lock = threading.Lock()
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password, self.rounds)
+
+    async def verify(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """(일치 여부, 비용이 바뀌었을 때의 새 해시 또는 None)"""
+        return await self._run(verify_password, password, hashed_password, self.rounds)
+
+    def close(self):
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHasherBusy("Too many password hashing requests in progress.")
+        try:
+            future = self._pool().submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        # 기다리던 요청이 취소되어도 작업이 실제로 끝날 때 자리를 반납합니다.
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, future: Future):
+        self._slots.release()
+
+    def _pool(self) -> Executor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._executor
@@ -1,47 +1,144 @@
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
 
-from typing import List
 from src.models.caravan import Caravan
 from src.repositories.base_repository import BaseRepository
+from src.services.co_booking_service import CoBookingRecommender
 
 class RecommendationService:
-    """콘텐츠 기반 추천 로직을 처리하는 서비스"""
-    def __init__(self, caravan_repo: BaseRepository[Caravan]):
+    """
+    콘텐츠 기반 추천 로직을 처리하는 서비스.
+    카라반마다 특징 벡터(타입/지역 one-hot, 정규화된 가격/인원/평점)를 NumPy 배열로 보관하고,
+    대상 카라반과 모든 카라반의 코사인 유사도를 벡터 연산 한 번으로 계산합니다.
+    행렬과 카라반별 추천 결과는 저장소 버전이 바뀌면(카라반이 저장/삭제되면) 다시 만듭니다.
+    co_booking이 주어지면 예약 이력 기반 추천("함께 예약한 카라반", 사용자별 추천)도 제공합니다.
+    """
+    # 특징 그룹별 가중치. 행 벡터를 정규화하기 전에 곱합니다.
+    FEATURE_WEIGHTS = {
+        'type': 1.0,
+        'location': 1.0,
+        'price_per_day': 0.5,
+        'sleeps': 0.5,
+        'average_rating': 0.5,
+    }
+
+    def __init__(self, caravan_repo: BaseRepository[Caravan], co_booking: Optional[CoBookingRecommender] = None):
         self.caravan_repo = caravan_repo
+        self.co_booking = co_booking
+        self._lock = threading.Lock()
+        self._version = None
+        self._features = self._build_features([])
+        self._rows: Dict[int, int] = {}
+        # caravan_id -> 유사도 순 카라반 ID (지금까지 요청된 가장 큰 top_n 만큼)
+        self._cache: Dict[int, List[int]] = {}
 
     def recommend_similar_caravans(self, target_caravan_id: int, top_n: int = 3) -> List[Caravan]:
-        """
-        특정 카라반과 유사한 다른 카라반을 추천합니다.
-        - 타입이 같으면 +2점
-        - 소유주가 같으면 +1점 (같은 호스트의 다른 카라반)
-        """
-        all_caravans = self.caravan_repo.get_all()
-        target_caravan = self.caravan_repo.find_by_id(target_caravan_id)
-
-        if not target_caravan or len(all_caravans) <= 1:
+        """특정 카라반과 특징이 가장 비슷한 다른 카라반을 유사도 순으로 top_n개 추천합니다."""
+        return self._caravans(self._similar_ids(target_caravan_id, top_n)[:top_n])
+
+    def recommend_also_booked(self, caravan_id: int, top_n: int = 5) -> List[Caravan]:
+        """이 카라반을 예약한 사용자들이 함께 많이 예약한 카라반을 추천합니다."""
+        if self.co_booking is None:
             return []
+        return self._caravans(self.co_booking.also_booked(caravan_id, top_n))
+
+    def recommend_for_user(self, user_id: int, top_n: int = 5) -> List[Caravan]:
+        """사용자의 예약 이력을 바탕으로 아직 예약하지 않은 카라반을 추천합니다."""
+        if self.co_booking is None:
+            return []
+        return self._caravans(self.co_booking.for_user(user_id, top_n))
+
+    def _caravans(self, caravan_ids: List[int]) -> List[Caravan]:
+        caravans = (self.caravan_repo.find_by_id(caravan_id) for caravan_id in caravan_ids)
+        return [caravan for caravan in caravans if caravan is not None]
+
+    def _similar_ids(self, target_caravan_id: int, top_n: int) -> List[int]:
+        with self._lock:
+            self._refresh()
+            cached = self._cache.get(target_caravan_id)
+            if cached is not None and (len(cached) >= top_n or len(cached) == len(self._rows) - 1):
+                return cached
+            row = self._rows.get(target_caravan_id)
+            if row is None or top_n <= 0:
+                return []
 
-        scores = []
-        for caravan in all_caravans:
+            scores = self._features.cosine_similarity(row, self.FEATURE_WEIGHTS)
             # 자기 자신은 추천에서 제외
-            if caravan.caravan_id == target_caravan_id:
-                continue
-
-            score = 0
-            # 1. 타입 유사도
-            if caravan.type == target_caravan.type:
-                score += 2
-            
-            # 2. 소유주 유사도
-            if caravan.owner_id == target_caravan.owner_id:
-                score += 1
-            
-            if score > 0:
-                scores.append((score, caravan))
-
-        # 점수가 높은 순으로 정렬
-        scores.sort(key=lambda x: x[0], reverse=True)
-
-        # 상위 N개의 카라반 객체만 반환
-        recommended_caravans = [caravan for score, caravan in scores[:top_n]]
-        
-        return recommended_caravans
+            scores[row] = -np.inf
+            count = min(top_n, len(scores) - 1)
+            if count <= 0:
+                return []
+            # 전체 정렬 대신 상위 count개만 고른 뒤 그것만 정렬합니다.
+            top = np.argpartition(-scores, count - 1)[:count]
+            top = top[np.argsort(-scores[top], kind='stable')]
+            ranked = self._features.ids[top].tolist()
+            self._cache[target_caravan_id] = ranked
+            return ranked
+
+    def _refresh(self):
+        """저장소 버전이 바뀌었으면 특징 행렬을 다시 만들고 추천 캐시를 비웁니다."""
+        version = getattr(self.caravan_repo, 'version', None)
+        if version is not None and version == self._version:
+            return
+        self._features = self._build_features(self.caravan_repo.get_all())
+        self._rows = {caravan_id: row for row, caravan_id in enumerate(self._features.ids.tolist())}
+        self._cache.clear()
+        self._version = version
+
+    @classmethod
+    def _build_features(cls, caravans: List[Caravan]) -> "_CaravanFeatures":
+        """카라반 목록으로 특징 배열을 만듭니다."""
+        weights = cls.FEATURE_WEIGHTS
+        numeric = np.column_stack([
+            # 가격은 분포가 치우쳐 있으므로 로그를 취한 뒤 표준화합니다.
+            cls._standardize(np.log1p([caravan.price_per_day for caravan in caravans])) * weights['price_per_day'],
+            cls._standardize([caravan.sleeps for caravan in caravans]) * weights['sleeps'],
+            np.array([caravan.average_rating for caravan in caravans], dtype=np.float64) / 5 * weights['average_rating'],
+        ]) if caravans else np.empty((0, 3))
+        type_codes = cls._codes([caravan.type for caravan in caravans])
+        location_codes = cls._codes([caravan.location for caravan in caravans])
+        # one-hot 블록은 행마다 1이 하나뿐이므로 각 블록이 노름 제곱에 weight^2씩 더합니다.
+        norms = np.sqrt(weights['type'] ** 2 + weights['location'] ** 2 + (numeric ** 2).sum(axis=1))
+        return _CaravanFeatures(
+            ids=np.array([caravan.caravan_id for caravan in caravans], dtype=np.int64),
+            type_codes=type_codes,
+            location_codes=location_codes,
+            numeric=numeric,
+            norms=norms,
+        )
+
+    @staticmethod
+    def _codes(values: List[str]) -> np.ndarray:
+        """범주 값을 정수 코드로 바꿉니다 (one-hot 열 번호)."""
+        lookup: Dict[str, int] = {}
+        return np.array([lookup.setdefault(value, len(lookup)) for value in values], dtype=np.int32)
+
+    @staticmethod
+    def _standardize(values) -> np.ndarray:
+        values = np.asarray(values, dtype=np.float64)
+        std = values.std()
+        return (values - values.mean()) / (std if std > 0 else 1)
+
+
+@dataclass
+class _CaravanFeatures:
+    """
+    카라반 특징 행렬 [타입 one-hot | 지역 one-hot | 가격, 인원, 평점].
+    one-hot 블록은 0/1 열 대신 열 번호(코드)로 보관합니다. 카라반 수 x 지역 수 크기의 행렬을 만들지 않고도
+    두 행의 내적이 '코드가 같으면 weight^2'로 정확히 계산됩니다.
+    """
+    ids: np.ndarray
+    type_codes: np.ndarray
+    location_codes: np.ndarray
+    numeric: np.ndarray
+    norms: np.ndarray
+
+    def cosine_similarity(self, row: int, weights: Dict[str, float]) -> np.ndarray:
+        """row번째 카라반과 모든 카라반의 코사인 유사도를 한 번에 계산합니다."""
+        dot = self.numeric @ self.numeric[row]
+        dot += (self.type_codes == self.type_codes[row]) * weights['type'] ** 2
+        dot += (self.location_codes == self.location_codes[row]) * weights['location'] ** 2
+        return dot / (self.norms * self.norms[row])
@@ -1,9 +1,11 @@
 
 from datetime import date
+from typing import List, Optional
 
 # Models and Repositories
 from src.models.user import User
 from src.models.caravan import Caravan
+from src.models.reservation import Reservation, ReservationCreate
 from src.repositories.base_repository import BaseRepository
 from src.repositories.reservation_repository import ReservationRepository
 
@@ -16,12 +18,16 @@ from src.patterns.observers import Observable
 from src.patterns.strategies import DiscountStrategy, NoDiscount
 from src.patterns.factories import ReservationFactory
 
+# Concurrency
+from src.services.lock_manager import StripedLockManager
+
 
 class ReservationService(Observable):
     """
     예약 생성의 전체 비즈니스 로직을 조정(Orchestrate)합니다.
     의존성 주입을 통해 모든 외부 종속성을 받으며, 테스트 가능한 구조입니다.
     Observable을 상속받아 예약 생성 시 관련 옵저버들에게 알림을 보냅니다.
+    검증부터 저장까지는 카라반/사용자 단위의 잠금 안에서 실행되어, 동시 요청에도 중복 예약이나 잔액 초과 결제가 발생하지 않습니다.
     """
     def __init__(
         self,
@@ -29,7 +35,8 @@ class ReservationService(Observable):
         caravan_repo: BaseRepository[Caravan],
         reservation_repo: ReservationRepository,
         validator: ReservationValidator,
-        discount_strategy: DiscountStrategy = NoDiscount()
+        discount_strategy: DiscountStrategy = NoDiscount(),
+        lock_manager: Optional[StripedLockManager] = None
     ):
         super().__init__()
         self.user_repo = user_repo
@@ -37,6 +44,7 @@ class ReservationService(Observable):
         self.reservation_repo = reservation_repo
         self.validator = validator
         self.discount_strategy = discount_strategy
+        self.lock_manager = lock_manager or StripedLockManager()
 
     def create_reservation(self, user_id: int, caravan_id: int, start_date: date, end_date: date):
         try:
@@ -45,29 +53,32 @@ class ReservationService(Observable):
             # 기본 가격 계산 (여기서는 간단히 일당 100으로 가정)
             base_price = 100 * (end_date - start_date).days
 
-            # 1. 모든 비즈니스 규칙 검증 (Validator에 위임)
-            self.validator.validate(user_id, caravan_id, start_date, end_date, base_price)
-            print("검증 통과.")
+            # 같은 카라반 또는 같은 사용자에 대한 요청은 직렬화하고, 나머지는 병렬로 처리합니다.
+            with self.lock_manager.acquire(('caravan', caravan_id), ('user', user_id)):
+                # 1. 모든 비즈니스 규칙 검증 (Validator에 위임)
+                self.validator.validate(user_id, caravan_id, start_date, end_date, base_price)
+                print("검증 통과.")
 
-            # 2. 할인 적용 (Strategy Pattern)
-            discount = self.discount_strategy.calculate_discount(base_price, start_date, end_date)
-            final_price = base_price - discount
-            print(f"가격 계산: 기본 {base_price} - 할인 {discount:.2f} = 최종 {final_price:.2f}")
+                # 2. 할인 적용 (Strategy Pattern)
+                discount = self.discount_strategy.calculate_discount(base_price, start_date, end_date)
+                final_price = base_price - discount
+                print(f"가격 계산: 기본 {base_price} - 할인 {discount:.2f} = 최종 {final_price:.2f}")
 
-            # 3. 결제 처리 (User 모델의 책임)
-            user = self.user_repo.find_by_id(user_id)
-            user.deduct_balance(final_price)
-            print(f"결제 처리 완료. (남은 잔액: {user.balance})")
+                # 3. 결제 처리 (User 모델의 책임)
+                user = self.user_repo.find_by_id(user_id)
+                user.deduct_balance(final_price)
+                self.user_repo.save(user)
+                print(f"결제 처리 완료. (남은 잔액: {user.balance})")
 
-            # 4. 예약 객체 생성 (Factory Pattern)
-            reservation = ReservationFactory.create_reservation(
-                user_id, caravan_id, start_date, end_date, final_price
-            )
-            print(f"예약 객체 생성 (ID: {reservation.reservation_id}, 상태: {reservation.status}).")
+                # 4. 예약 객체 생성 (Factory Pattern)
+                reservation = ReservationFactory.create_reservation(
+                    user_id, caravan_id, start_date, end_date, final_price
+                )
+                print(f"예약 객체 생성 (ID: {reservation.reservation_id}, 상태: {reservation.status}).")
 
-            # 5. 예약 정보 저장 (Repository에 위임)
-            self.reservation_repo.save(reservation)
-            print("예약 정보 저장 완료.")
+                # 5. 예약 정보 저장 (Repository에 위임)
+                self.reservation_repo.save(reservation)
+                print("예약 정보 저장 완료.")
 
             # 6. 옵저버들에게 알림 (Observer Pattern)
             caravan = self.caravan_repo.find_by_id(caravan_id)
@@ -81,3 +92,64 @@ class ReservationService(Observable):
         except Exception as e:
             print(f"[알 수 없는 에러] {e}")
             return None
+
+    def create_reservations_batch(self, user_id: int, items: List[ReservationCreate]) -> Optional[List[Reservation]]:
+        """
+        여러 카라반을 한 번에 예약합니다 (전부 성공하거나 전부 실패).
+        검증, 가격 계산, 결제는 배치 전체에 대해 한 번씩 수행하고,
+        알림은 항목별이 아니라 배치 단위로 한 번만 보냅니다.
+        """
+        try:
+            print(f"\n--- {user_id}번 사용자의 카라반 {len(items)}건 일괄 예약 요청 ---")
+            stays = [(item.caravan_id, item.start_date, item.end_date) for item in items]
+            base_prices = [100 * (end_date - start_date).days for _, start_date, end_date in stays]
+
+            lock_keys = [('caravan', caravan_id) for caravan_id in sorted({stay[0] for stay in stays})]
+            with self.lock_manager.acquire(('user', user_id), *lock_keys):
+                # 1. 배치 전체 검증 (배치 내부 날짜 충돌 포함)
+                self.validator.validate_batch(user_id, stays, sum(base_prices))
+                print("일괄 검증 통과.")
+
+                # 2. 할인 적용 및 총액 계산
+                final_prices = [
+                    base_price - self.discount_strategy.calculate_discount(base_price, start_date, end_date)
+                    for base_price, (_, start_date, end_date) in zip(base_prices, stays)
+                ]
+                total_price = sum(final_prices)
+                print(f"가격 계산: 기본 {sum(base_prices)} → 최종 {total_price:.2f}")
+
+                # 3. 총액을 한 번에 결제
+                user = self.user_repo.find_by_id(user_id)
+                user.deduct_balance(total_price)
+                self.user_repo.save(user)
+                print(f"결제 처리 완료. (남은 잔액: {user.balance})")
+
+                # 4. 예약 생성 및 저장 - 중간에 실패하면 저장된 예약을 지우고 환불합니다.
+                reservations = []
+                try:
+                    for (caravan_id, start_date, end_date), final_price in zip(stays, final_prices):
+                        reservation = ReservationFactory.create_reservation(
+                            user_id, caravan_id, start_date, end_date, final_price
+                        )
+                        self.reservation_repo.save(reservation)
+                        reservations.append(reservation)
+                except Exception:
+                    for reservation in reservations:
+                        self.reservation_repo.delete(reservation.reservation_id)
+                    user.balance += total_price
+                    self.user_repo.save(user)
+                    raise
+                print(f"예약 {len(reservations)}건 저장 완료. (ID: {[r.reservation_id for r in reservations]})")
+
+            # 5. 배치 단위로 한 번만 알림 (호스트별 묶음은 옵저버가 처리)
+            caravans = {caravan_id: self.caravan_repo.find_by_id(caravan_id) for caravan_id in {s[0] for s in stays}}
+            self.notify(reservations=reservations, caravans=caravans)
+
+            return reservations
+
+        except ReservationException as e:
+            print(f"[일괄 예약 실패] {e}")
+            return None
+        except Exception as e:
+            print(f"[알 수 없는 에러] {e}")
+            return None
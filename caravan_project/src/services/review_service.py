@@ -1,46 +1,55 @@
 
+from typing import List, Optional
+
 from src.models.review import Review
 from src.models.caravan import Caravan
 from src.repositories.base_repository import BaseRepository
 from src.repositories.reservation_repository import ReservationRepository
+from src.repositories.review_repository import ReviewRepository
+from src.services.lock_manager import StripedLockManager
 
 class ReviewService:
-    """리뷰 및 평가 관련 비즈니스 로직을 처리하는 서비스"""
+    """
+    리뷰 및 평가 관련 비즈니스 로직을 처리하는 서비스.
+    자격 확인, 리뷰 저장, 카라반 평점 갱신이 모두 인덱스 조회와 상수 시간 갱신이라 전체 데이터 양과 무관합니다.
+    """
     def __init__(
         self,
-        review_repo: BaseRepository[Review],
+        review_repo: ReviewRepository,
         reservation_repo: ReservationRepository,
-        caravan_repo: BaseRepository[Caravan]
+        caravan_repo: BaseRepository[Caravan],
+        lock_manager: Optional[StripedLockManager] = None
     ):
         self.review_repo = review_repo
         self.reservation_repo = reservation_repo
         self.caravan_repo = caravan_repo
+        self.lock_manager = lock_manager or StripedLockManager()
 
     def submit_review(self, user_id: int, caravan_id: int, rating: int, comment: str) -> Review:
         """
         사용자가 카라반에 대한 리뷰를 제출합니다.
-        실제로는 사용자가 해당 카라반을 이용했는지 검증하는 로직이 필요합니다.
+        해당 카라반을 확정 예약한 적이 있는 사용자만 리뷰를 남길 수 있습니다.
         """
-        # 1. (검증) 사용자가 해당 카라반을 예약했었는지 확인 (여기서는 간단히 시뮬레이션)
-        reservations = self.reservation_repo.get_all()
-        can_review = any(
-            res.user_id == user_id and res.caravan_id == caravan_id and res.status == 'confirmed'
-            for res in reservations
-        )
-        if not can_review:
+        # 1. (검증) 사용자가 해당 카라반을 예약했었는지 확인 (보조 인덱스로 O(1) 조회)
+        confirmed = self.reservation_repo.find_one_by(user_id=user_id, caravan_id=caravan_id, status='confirmed')
+        if confirmed is None:
             raise PermissionError("User has not made a confirmed reservation for this caravan.")
 
-        # 2. 리뷰 객체 생성 및 저장
+        # 2. 리뷰 객체 생성 및 저장, 3. 카라반 평균 별점/분포 업데이트
+        # 같은 카라반의 동시 리뷰가 서로의 평점 갱신을 덮어쓰지 않도록 직렬화합니다.
         review = Review(review_id=None, user_id=user_id, caravan_id=caravan_id, rating=rating, comment=comment)
-        self.review_repo.save(review)
-        print(f"[Review] 사용자(ID:{user_id})가 카라반(ID:{caravan_id})에 리뷰를 남겼습니다: \"{comment}\" (별점: {rating})")
-
-        # 3. 카라반 평균 별점 업데이트
-        caravan = self.caravan_repo.find_by_id(caravan_id)
-        if caravan:
-            caravan.update_rating(rating)
-            self.caravan_repo.save(caravan) # 변경된 caravan 정보 다시 저장
-            print(f"   L [Rating] 카라반(ID:{caravan_id})의 평균 별점이 업데이트되었습니다: {caravan.average_rating:.2f} (리뷰 {caravan.review_count}개)")
-        
+        with self.lock_manager.acquire(('caravan', caravan_id)):
+            self.review_repo.save(review)
+            print(f"[Review] 사용자(ID:{user_id})가 카라반(ID:{caravan_id})에 리뷰를 남겼습니다: \"{comment}\" (별점: {rating})")
+
+            caravan = self.caravan_repo.find_by_id(caravan_id)
+            if caravan:
+                caravan.update_rating(rating)
+                self.caravan_repo.save(caravan) # 변경된 caravan 정보 다시 저장
+                print(f"   L [Rating] 카라반(ID:{caravan_id})의 평균 별점이 업데이트되었습니다: {caravan.average_rating:.2f} (리뷰 {caravan.review_count}개)")
+
         return review
 
+    def list_reviews(self, caravan_id: int, before: Optional[int] = None, limit: int = 20) -> List[Review]:
+        """카라반의 리뷰를 최신순으로 한 페이지 조회합니다. before는 이전 페이지 마지막 리뷰의 ID입니다."""
+        return self.review_repo.page_by_caravan(caravan_id, before=before, limit=limit)
@@ -0,0 +1,216 @@
+
+import base64
+import json
+import math
+from datetime import date
+from typing import Any, Callable, Iterable, List, Optional, Set, Tuple
+
+from src.models.caravan import Caravan
+from src.repositories.base_repository import BaseRepository
+from src.repositories.reservation_repository import ReservationRepository
+from src.services.trending_service import TrendingTracker
+
+# 정렬 기준별 커서 값의 타입. 정렬 열은 모두 null을 허용하지 않는 숫자입니다.
+_CURSOR_VALUE_TYPES = {
+    'price_per_day': (int, float),
+    'average_rating': (int, float),
+    'sleeps': int,
+    'caravan_id': int,
+    'trending': (int, float),
+}
+
+# 검색 조건: (맞는 카라반 수, 맞는 ID 조회, 카라반 하나가 맞는지 확인)
+_Condition = Tuple[int, Callable[[], List[int]], Callable[[Caravan], bool]]
+
+def _is_number(value: Any, types) -> bool:
+    # bool은 int의 하위 타입이므로 따로 거르고, NaN/무한대는 정렬 위치를 정할 수 없으므로 거부합니다.
+    return (
+        isinstance(value, types) and not isinstance(value, bool)
+        and (not isinstance(value, float) or math.isfinite(value))
+    )
+
+def encode_cursor(sort_by: str, descending: bool, value: Any, caravan_id: int) -> str:
+    """목록의 마지막 항목 위치 (정렬 기준, 방향, 값, ID)를 URL에 안전한 불투명 문자열로 만듭니다."""
+    raw = json.dumps([sort_by, descending, value, caravan_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+def decode_cursor(cursor: str, sort_by: str, descending: bool) -> Tuple[Any, int]:
+    """encode_cursor로 만든 커서를 (값, ID)로 되돌립니다. 형식이나 정렬 조건이 맞지 않으면 ValueError를 발생시킵니다."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        cursor_sort, cursor_descending, value, caravan_id = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor.") from e
+    if cursor_sort != sort_by or cursor_descending != descending:
+        raise ValueError("Cursor does not match the requested sort order.")
+    types = _CURSOR_VALUE_TYPES.get(sort_by)
+    if types is None or not _is_number(value, types) or not _is_number(caravan_id, int):
+        raise ValueError("Invalid cursor.")
+    return value, caravan_id
+
+class CaravanSearchService:
+    """
+    날짜/속성 조건으로 전체 카라반을 검색하는 서비스.
+    1. 속성 인덱스로 후보 ID 집합을 만들고 작은 집합부터 교집합을 구합니다.
+    2. 정렬 인덱스 순서대로 후보를 순회하며, 날짜 충돌 검사는 후보에게만 수행합니다.
+    3. 요청한 페이지(+ 다음 페이지 존재 여부 확인용 1건)가 채워지면 순회를 멈춥니다.
+    """
+    SORT_FIELDS = ('price_per_day', 'average_rating', 'sleeps', 'caravan_id')
+    # 후보가 이 수 이하이면 정렬 인덱스 전체를 훑는 대신 후보만 직접 정렬합니다.
+    SMALL_CANDIDATE_SET = 512
+
+    def __init__(
+        self,
+        caravan_repo: BaseRepository[Caravan],
+        reservation_repo: ReservationRepository,
+        trending: Optional[TrendingTracker] = None,
+    ):
+        self.caravan_repo = caravan_repo
+        self.reservation_repo = reservation_repo
+        self.trending = trending
+
+    def search(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        location: Optional[str] = None,
+        caravan_type: Optional[str] = None,
+        min_sleeps: Optional[int] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        sort_by: str = 'price_per_day',
+        descending: bool = False,
+        page: int = 1,
+        page_size: int = 20,
+    ) -> Tuple[List[Caravan], bool]:
+        """
+        조건에 맞는 카라반의 한 페이지와 다음 페이지 존재 여부를 반환합니다.
+        start_date/end_date가 주어지면 해당 기간 전체를 예약할 수 있는 카라반만 포함합니다.
+        """
+        if sort_by not in self.SORT_FIELDS:
+            raise ValueError(f"Unsupported sort field: {sort_by}")
+        if (start_date is None) != (end_date is None):
+            raise ValueError("start_date and end_date must be given together.")
+        if start_date is not None and start_date >= end_date:
+            raise ValueError("End date must be after start date.")
+
+        candidates = self._candidate_ids(location, caravan_type, min_sleeps, min_price, max_price)
+        skip = (page - 1) * page_size
+        wanted = skip + page_size + 1
+
+        matched: List[int] = []
+        for caravan_id in self._ordered(candidates, sort_by, descending):
+            if start_date is not None and not self.reservation_repo.check_caravan_availability(caravan_id, start_date, end_date):
+                continue
+            matched.append(caravan_id)
+            if len(matched) == wanted:
+                break
+
+        page_ids = matched[skip:skip + page_size]
+        caravans = [self.caravan_repo.find_by_id(caravan_id) for caravan_id in page_ids]
+        return [caravan for caravan in caravans if caravan is not None], len(matched) == wanted
+
+    def list_page(
+        self,
+        sort_by: str = 'caravan_id',
+        descending: bool = False,
+        cursor: Optional[str] = None,
+        limit: int = 20,
+    ) -> Tuple[List[Caravan], Optional[str]]:
+        """
+        전체 카라반을 (정렬 값, ID) 순서의 키셋 페이지네이션으로 조회합니다.
+        한 페이지와, 다음 페이지가 있으면 그 위치를 가리키는 커서를 반환합니다.
+        sort_by='trending'이면 인기 순(항상 높은 순)으로, TrendingTracker가 유지하는 순위를 그대로 잘라 씁니다.
+        """
+        if sort_by == 'trending' and self.trending is not None:
+            return self._trending_page(cursor, limit)
+        if sort_by not in self.SORT_FIELDS:
+            raise ValueError(f"Unsupported sort field: {sort_by}")
+        after = decode_cursor(cursor, sort_by, descending) if cursor else None
+        # 다음 페이지 존재 여부를 알기 위해 1건 더 조회합니다.
+        ids = self.caravan_repo.page_ids(sort_by, after=after, limit=limit + 1, descending=descending)
+        caravans = [caravan for caravan in map(self.caravan_repo.find_by_id, ids[:limit]) if caravan is not None]
+
+        next_cursor = None
+        if len(ids) > limit and caravans:
+            last = caravans[-1]
+            next_cursor = encode_cursor(sort_by, descending, getattr(last, sort_by), last.caravan_id)
+        return caravans, next_cursor
+
+    def _trending_page(self, cursor: Optional[str], limit: int) -> Tuple[List[Caravan], Optional[str]]:
+        after = decode_cursor(cursor, 'trending', True) if cursor else None
+        entries = self.trending.page(after=after, limit=limit + 1)
+        caravans = [caravan for caravan in map(self.caravan_repo.find_by_id, (e[0] for e in entries[:limit])) if caravan]
+
+        next_cursor = None
+        if len(entries) > limit and caravans:
+            caravan_id, stored = entries[limit - 1]
+            next_cursor = encode_cursor('trending', True, stored, caravan_id)
+        return caravans, next_cursor
+
+    def _candidate_ids(
+        self,
+        location: Optional[str],
+        caravan_type: Optional[str],
+        min_sleeps: Optional[int],
+        min_price: Optional[float],
+        max_price: Optional[float],
+    ) -> Set[int]:
+        """
+        조건별 개수를 인덱스에서 세어 가장 작은 조건의 ID만 가져오고,
+        나머지 조건은 각 카라반의 속성으로 확인합니다. (조건별 ID 목록을 모두 복사하지 않음)
+        """
+        conditions = [self._equal_condition('is_available', True)]
+        if location is not None:
+            conditions.append(self._equal_condition('location', location))
+        if caravan_type is not None:
+            conditions.append(self._equal_condition('type', caravan_type))
+        if min_sleeps is not None:
+            conditions.append(self._range_condition('sleeps', min_sleeps, None))
+        if min_price is not None or max_price is not None:
+            conditions.append(self._range_condition('price_per_day', min_price, max_price))
+
+        conditions.sort(key=lambda condition: condition[0])
+        _, fetch_ids, _ = conditions[0]
+        checks = [check for _, _, check in conditions[1:]]
+        candidates = set()
+        for caravan_id in fetch_ids():
+            caravan = self.caravan_repo.find_by_id(caravan_id)
+            if caravan is not None and all(check(caravan) for check in checks):
+                candidates.add(caravan_id)
+        return candidates
+
+    def _equal_condition(self, field: str, value: Any) -> _Condition:
+        """필드 값이 value와 같은 조건"""
+        return (
+            self.caravan_repo.count_by(**{field: value}),
+            lambda: self.caravan_repo.find_ids_by(**{field: value}),
+            lambda caravan: getattr(caravan, field) == value,
+        )
+
+    def _range_condition(self, field: str, low: Any, high: Any) -> _Condition:
+        """필드 값이 [low, high] 범위(양 끝 포함, None이면 제한 없음)인 조건"""
+        def check(caravan: Caravan) -> bool:
+            value = getattr(caravan, field)
+            return value is not None and (low is None or value >= low) and (high is None or value <= high)
+
+        return (
+            self.caravan_repo.count_in_range(field, low, high),
+            lambda: self.caravan_repo.find_ids_in_range(field, low=low, high=high),
+            check,
+        )
+
+    def _ordered(self, candidates: Set[int], sort_by: str, descending: bool) -> Iterable[int]:
+        """후보 ID를 정렬 기준 순서로 돌려줍니다."""
+        if len(candidates) <= self.SMALL_CANDIDATE_SET:
+            caravans = [self.caravan_repo.find_by_id(caravan_id) for caravan_id in candidates]
+            keyed = sorted(
+                (getattr(caravan, sort_by), caravan.caravan_id) for caravan in caravans if caravan is not None
+            )
+            if descending:
+                keyed.reverse()
+            return [caravan_id for _, caravan_id in keyed]
+        return (
+            caravan_id for caravan_id in self.caravan_repo.iter_sorted_ids(sort_by, descending=descending)
+            if caravan_id in candidates
+        )
@@ -0,0 +1,124 @@
+import math
+import threading
+import time
+from bisect import bisect_right, insort
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.patterns.observers import Observer
+
+class TrendingTracker(Observer):
+    """
+    카라반별 인기도(예약/조회 수)를 시간에 따라 지수적으로 감쇠시켜 관리하는 옵저버.
+
+    forward decay 방식으로, 이벤트 하나를 weight * e^(rate * (t - landmark))로 더해 둡니다.
+    현재 점수는 저장된 값 * e^(-rate * (now - landmark))이고, 모든 카라반에 같은 배율이 곱해지므로
+    저장된 값의 순서가 곧 현재 인기 순서입니다. 그래서 시간이 지나도 전체를 다시 계산하거나 정렬할 필요가 없고,
+    이벤트마다 카라반 하나의 값만 바뀝니다.
+    순위는 (-저장 값, ID) 정렬 리스트로 유지하여 상위 K개와 키셋 페이지를 요청마다 집계 없이 바로 잘라 냅니다.
+    """
+    # 지수가 이 값을 넘으면 기준 시각(landmark)을 옮겨 float 범위를 벗어나지 않게 합니다.
+    RESCALE_EXPONENT = 600.0
+
+    def __init__(
+        self,
+        half_life_hours: float = 72.0,
+        booking_weight: float = 5.0,
+        view_weight: float = 1.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.rate = math.log(2) / (half_life_hours * 3600)
+        self.booking_weight = booking_weight
+        self.view_weight = view_weight
+        self._clock = clock
+        self._landmark = clock()
+        self._scores: Dict[int, float] = {}
+        # (-저장 값, caravan_id) 오름차순 = 인기 순
+        self._ranking: List[Tuple[float, int]] = []
+        self._lock = threading.Lock()
+        # 순위가 바뀔 때마다 증가 (응답 캐시 무효화용)
+        self.version = 0
+
+    def update(self, subject, **kwargs):
+        """ReservationService 옵저버: 새 예약마다 해당 카라반의 예약 점수를 올립니다."""
+        reservation = kwargs.get('reservation')
+        reservations = kwargs.get('reservations') or ([reservation] if reservation else [])
+        for reservation in reservations:
+            self.record_booking(reservation.caravan_id)
+
+    def on_repository_event(self, event: str, entity_id: Optional[int], entity):
+        """카라반 저장소 리스너: 순위에 올릴 카라반 목록을 저장소와 맞춥니다."""
+        if event == 'clear':
+            with self._lock:
+                self._scores.clear()
+                self._ranking.clear()
+                self.version += 1
+        elif event == 'delete':
+            self.remove(entity_id)
+        else:
+            self.add(entity_id)
+
+    def add(self, caravan_id: int):
+        """점수 0으로 카라반을 순위에 올립니다. 이미 있으면 그대로 둡니다."""
+        with self._lock:
+            if caravan_id not in self._scores:
+                self._scores[caravan_id] = 0.0
+                insort(self._ranking, (-0.0, caravan_id))
+                self.version += 1
+
+    def remove(self, caravan_id: int):
+        with self._lock:
+            stored = self._scores.pop(caravan_id, None)
+            if stored is not None:
+                self._ranking.pop(bisect_right(self._ranking, (-stored, caravan_id)) - 1)
+                self.version += 1
+
+    def record_booking(self, caravan_id: int):
+        self._bump(caravan_id, self.booking_weight)
+
+    def record_view(self, caravan_id: int):
+        self._bump(caravan_id, self.view_weight)
+
+    def score(self, caravan_id: int) -> float:
+        """현재 시각 기준으로 감쇠된 인기 점수"""
+        with self._lock:
+            return self._scores.get(caravan_id, 0.0) * math.exp(-self.rate * (self._clock() - self._landmark))
+
+    def top(self, k: int) -> List[Tuple[int, float]]:
+        """인기 상위 k개 (caravan_id, 현재 점수)"""
+        with self._lock:
+            decay = math.exp(-self.rate * (self._clock() - self._landmark))
+            return [(caravan_id, -key * decay) for key, caravan_id in self._ranking[:k]]
+
+    def page(self, after: Optional[Tuple[float, int]] = None, limit: int = 20) -> List[Tuple[int, float]]:
+        """
+        인기 순 목록의 한 페이지 (caravan_id, 저장 값).
+        after는 이전 페이지 마지막 항목의 (저장 값, caravan_id)입니다. 저장 값은 시간이 지나도 바뀌지 않으므로 커서로 쓸 수 있습니다.
+        """
+        with self._lock:
+            start = 0 if after is None else bisect_right(self._ranking, (-after[0], after[1]))
+            return [(caravan_id, -key) for key, caravan_id in self._ranking[start:start + limit]]
+
+    def _bump(self, caravan_id: int, weight: float):
+        with self._lock:
+            stored = self._scores.get(caravan_id)
+            # 저장소에 없는 카라반(삭제됨 또는 잘못된 ID)은 무시합니다.
+            if stored is None:
+                return
+            now = self._clock()
+            exponent = self.rate * (now - self._landmark)
+            if exponent > self.RESCALE_EXPONENT:
+                self._rescale(now)
+                stored, exponent = self._scores[caravan_id], 0.0
+            updated = stored + weight * math.exp(exponent)
+            # 같은 (값, ID) 항목을 찾아 빼고 새 위치에 넣습니다.
+            self._ranking.pop(bisect_right(self._ranking, (-stored, caravan_id)) - 1)
+            insort(self._ranking, (-updated, caravan_id))
+            self._scores[caravan_id] = updated
+            self.version += 1
+
+    def _rescale(self, now: float):
+        """기준 시각을 now로 옮기고 모든 저장 값에 같은 배율을 곱합니다. 순서는 바뀌지 않습니다."""
+        factor = math.exp(-self.rate * (now - self._landmark))
+        self._scores = {caravan_id: stored * factor for caravan_id, stored in self._scores.items()}
+        self._ranking = [(key * factor, caravan_id) for key, caravan_id in self._ranking]
+        self._landmark = now
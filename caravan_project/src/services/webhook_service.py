@@ -0,0 +1,407 @@
+import asyncio
+import hashlib
+import hmac
+import json
+import random
+import socket
+import time
+from dataclasses import dataclass
+from typing import Collection, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import httpcore
+import httpx
+
+from src.models.webhook import Webhook
+from src.patterns.observers import Observer
+from src.repositories.base_repository import BaseRepository
+from src.repositories.sqlite_repository import SqliteDatabase
+from src.security import check_outbound_url, is_public_address
+
+SIGNATURE_HEADER = "X-CaravanShare-Signature"
+
+def sign_payload(secret: str, timestamp: int, body: bytes) -> str:
+    """
+    웹훅 서명 헤더 값 't=<timestamp>,v1=<hex>'를 만듭니다.
+    서명은 '<timestamp>.<본문>'의 HMAC-SHA256이며, 수신 측은 같은 방식으로 계산해 비교하고 오래된 timestamp를 거부하면 됩니다.
+    """
+    digest = hmac.new(secret.encode("utf-8"), f"{timestamp}.".encode("utf-8") + body, hashlib.sha256).hexdigest()
+    return f"t={timestamp},v1={digest}"
+
+
+class PublicAddressBackend(httpcore.AsyncNetworkBackend):
+    """
+    공인 주소로만 연결하는 httpcore 네트워크 백엔드.
+    연결 직전에 호스트 이름을 직접 조회하고, 조회된 주소 중 하나라도 사설/루프백/링크 로컬 등이면 연결을 거부합니다.
+    검사한 주소로 바로 연결하므로 검사와 연결 사이에 DNS 응답이 바뀌어도(DNS rebinding) 내부망에 닿지 않습니다.
+    TLS의 SNI와 인증서 검증은 원래 호스트 이름으로 이루어집니다.
+    """
+    def __init__(self, backend: Optional[httpcore.AsyncNetworkBackend] = None):
+        self._backend = backend or httpcore.AnyIOBackend()
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        try:
+            infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        except socket.gaierror as e:
+            raise httpcore.ConnectError(f"Could not resolve {host}: {e}")
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        blocked = [address for address in addresses if not is_public_address(address)]
+        if not addresses or blocked:
+            raise httpcore.ConnectError(f"Refusing to connect to {host}: resolves to non-public address {blocked}")
+        error: Optional[Exception] = None
+        for address in addresses:
+            try:
+                return await self._backend.connect_tcp(
+                    address, port, timeout=timeout, local_address=local_address, socket_options=socket_options,
+                )
+            except httpcore.ConnectError as e:
+                error = e
+        raise error
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        raise httpcore.ConnectError("Unix sockets are not allowed for webhook deliveries")
+
+    async def sleep(self, seconds: float):
+        await self._backend.sleep(seconds)
+
+
+def create_webhook_client(
+    max_connections: int = 100, timeout: float = 10.0, allow_private_networks: bool = False,
+) -> httpx.AsyncClient:
+    """
+    웹훅 전달용 공용 클라이언트를 만듭니다.
+    allow_private_networks가 거짓이면 PublicAddressBackend로 연결해 내부망(SSRF) 요청을 막고,
+    환경 변수의 프록시 설정도 따르지 않습니다. 리다이렉트는 따라가지 않습니다.
+    """
+    limits = httpx.Limits(max_connections=max_connections)
+    transport = httpx.AsyncHTTPTransport(limits=limits, trust_env=False)
+    if not allow_private_networks:
+        transport._pool = httpcore.AsyncConnectionPool(
+            ssl_context=httpx.create_ssl_context(),
+            max_connections=limits.max_connections,
+            max_keepalive_connections=limits.max_keepalive_connections,
+            keepalive_expiry=limits.keepalive_expiry,
+            network_backend=PublicAddressBackend(),
+        )
+    return httpx.AsyncClient(transport=transport, timeout=httpx.Timeout(timeout), trust_env=False)
+
+
+@dataclass
+class WebhookDelivery:
+    """재시도 큐의 전달 작업 하나"""
+    delivery_id: int
+    webhook_id: int
+    event: str
+    body: bytes
+    attempts: int
+
+
+class WebhookRetryQueue:
+    """
+    웹훅 전달 작업을 SQLite에 보관하는 영속 큐.
+    작업은 next_attempt_at 순으로 꺼내며, 꺼낼 때 lease_seconds만큼 다음 시도 시각을 미뤄 두므로
+    전달 중 프로세스가 죽어도 작업이 사라지지 않고 임대 시간이 지나면 다시 시도됩니다.
+    """
+    def __init__(self, database: SqliteDatabase):
+        self._db = database
+        conn = self._db.connection()
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS webhook_deliveries ("
+                "id INTEGER PRIMARY KEY, webhook_id INTEGER NOT NULL, event TEXT NOT NULL, body BLOB NOT NULL, "
+                "attempts INTEGER NOT NULL DEFAULT 0, next_attempt_at REAL NOT NULL, "
+                "status TEXT NOT NULL DEFAULT 'pending', last_error TEXT)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_webhook_deliveries_due "
+                "ON webhook_deliveries (next_attempt_at) WHERE status = 'pending'"
+            )
+
+    def enqueue(self, webhook_id: int, event: str, body: bytes, now: float) -> int:
+        conn = self._db.connection()
+        with conn:
+            cursor = conn.execute(
+                "INSERT INTO webhook_deliveries (webhook_id, event, body, next_attempt_at) VALUES (?, ?, ?, ?)",
+                (webhook_id, event, body, now),
+            )
+        return cursor.lastrowid
+
+    def claim_due(
+        self, now: float, limit: int, lease_seconds: float, exclude: Collection[int] = (),
+    ) -> List[WebhookDelivery]:
+        """
+        시도 시각이 된 작업을 최대 limit개 꺼내고, 임대 시간만큼 다음 시도 시각을 미룹니다.
+        exclude의 작업(이 프로세스에서 아직 전달 중인 작업)은 임대 시간이 지났어도 다시 꺼내지 않습니다.
+        """
+        conn = self._db.connection()
+        with conn:
+            rows = conn.execute(
+                "SELECT id, webhook_id, event, body, attempts FROM webhook_deliveries "
+                f"WHERE status = 'pending' AND next_attempt_at <= ?{self._not_in(exclude)} "
+                "ORDER BY next_attempt_at LIMIT ?",
+                (now, *exclude, limit),
+            ).fetchall()
+            conn.executemany(
+                "UPDATE webhook_deliveries SET next_attempt_at = ? WHERE id = ?",
+                [(now + lease_seconds, row[0]) for row in rows],
+            )
+        return [WebhookDelivery(*row) for row in rows]
+
+    def extend_lease(self, delivery_id: int, until: float):
+        """전달을 실제로 시작할 때 임대 시간을 다시 잡아, 차례를 기다린 시간 때문에 임대가 끝나지 않게 합니다."""
+        conn = self._db.connection()
+        with conn:
+            conn.execute(
+                "UPDATE webhook_deliveries SET next_attempt_at = ? WHERE id = ? AND status = 'pending'",
+                (until, delivery_id),
+            )
+
+    def next_due_at(self, exclude: Collection[int] = ()) -> Optional[float]:
+        row = self._db.connection().execute(
+            f"SELECT MIN(next_attempt_at) FROM webhook_deliveries WHERE status = 'pending'{self._not_in(exclude)}",
+            tuple(exclude),
+        ).fetchone()
+        return row[0]
+
+    @staticmethod
+    def _not_in(ids: Collection[int]) -> str:
+        return f" AND id NOT IN ({','.join('?' * len(ids))})" if ids else ""
+
+    def complete(self, delivery_id: int):
+        conn = self._db.connection()
+        with conn:
+            conn.execute("DELETE FROM webhook_deliveries WHERE id = ?", (delivery_id,))
+
+    def retry(self, delivery_id: int, attempts: int, next_attempt_at: float, error: str):
+        conn = self._db.connection()
+        with conn:
+            conn.execute(
+                "UPDATE webhook_deliveries SET attempts = ?, next_attempt_at = ?, last_error = ? WHERE id = ?",
+                (attempts, next_attempt_at, error, delivery_id),
+            )
+
+    def give_up(self, delivery_id: int, attempts: int, error: str):
+        """재시도 한도를 넘긴 작업은 지우지 않고 'dead'로 남겨 확인할 수 있게 합니다."""
+        conn = self._db.connection()
+        with conn:
+            conn.execute(
+                "UPDATE webhook_deliveries SET status = 'dead', attempts = ?, last_error = ? WHERE id = ?",
+                (attempts, error, delivery_id),
+            )
+
+    def counts(self) -> Dict[str, int]:
+        rows = self._db.connection().execute(
+            "SELECT status, COUNT(*) FROM webhook_deliveries GROUP BY status"
+        ).fetchall()
+        return dict(rows)
+
+
+class WebhookDispatcher(Observer):
+    """
+    호스트 웹훅으로 예약 이벤트를 보내는 옵저버.
+    update는 예약 요청 경로에서 호출되므로 호스트 서버를 호출하지 않고, 서명할 본문을 영속 큐에 넣고 작업자를 깨우기만 합니다.
+    백그라운드 작업자는 공용 커넥션 풀(httpx.AsyncClient)로 전달하며, 목적지(host:port)마다 동시 요청 수를 제한해
+    느린 호스트 서버 하나가 다른 호스트로의 전달을 막지 않게 합니다.
+    실패(연결 오류, 2xx 외 응답)한 작업은 지수 백오프(지터 포함)로 다시 시도하고, max_attempts번 실패하면 포기합니다.
+    allow_private_networks가 거짓이면 사설/루프백/링크 로컬 주소로는 보내지 않습니다 (전송 시 DNS 조회 결과까지 검사).
+    전달 중인(목적지 차례를 기다리는 것 포함) 작업은 다시 꺼내지 않고, 임대는 실제로 보내기 직전에 새로 잡으므로
+    느린 목적지에 작업이 밀려도 같은 작업이 여러 번 전송되지 않습니다. 들고 있는 작업 수는 max_in_flight로 제한합니다.
+    """
+    def __init__(
+        self,
+        webhook_repo: BaseRepository[Webhook],
+        queue: WebhookRetryQueue,
+        max_attempts: int = 8,
+        base_delay: float = 1.0,
+        max_delay: float = 3600.0,
+        per_destination: int = 4,
+        max_connections: int = 100,
+        timeout: float = 10.0,
+        batch_size: int = 50,
+        lease_seconds: float = 60.0,
+        poll_interval: float = 5.0,
+        max_in_flight: int = 1000,
+        allow_private_networks: bool = False,
+    ):
+        self.webhook_repo = webhook_repo
+        self.queue = queue
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.per_destination = per_destination
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.batch_size = batch_size
+        self.lease_seconds = lease_seconds
+        self.max_in_flight = max_in_flight
+        self.poll_interval = poll_interval
+        self.allow_private_networks = allow_private_networks
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        # delivery_id -> 전달 작업 (목적지 세마포어를 기다리는 중인 것 포함)
+        self._in_flight: Dict[int, asyncio.Task] = {}
+        # 목적지(host:port) -> 동시 요청 제한 세마포어, 그 세마포어를 쓰는(대기 포함) 전달 수
+        self._destinations: Dict[str, asyncio.Semaphore] = {}
+        self._destination_users: Dict[str, int] = {}
+        self.delivered = 0
+        self.failed = 0
+
+    def update(self, subject, **kwargs):
+        reservation = kwargs.get('reservation')
+        caravan = kwargs.get('caravan')
+        if reservation and caravan:
+            pairs = [(reservation, caravan)]
+        else:
+            caravans = kwargs.get('caravans') or {}
+            pairs = [(r, caravans.get(r.caravan_id)) for r in kwargs.get('reservations') or []]
+        for reservation, caravan in pairs:
+            if caravan is None:
+                continue
+            self.publish(caravan.owner_id, "reservation.confirmed", {
+                "reservation": reservation.model_dump(mode="json"),
+                "caravan": {"caravan_id": caravan.caravan_id, "name": caravan.name},
+            })
+
+    def publish(self, host_id: int, event: str, data: dict) -> int:
+        """호스트의 해당 이벤트 구독마다 전달 작업을 큐에 넣습니다. 넣은 작업 수를 반환합니다."""
+        webhooks = [
+            webhook for webhook in self.webhook_repo.find_by(host_id=host_id)
+            if webhook.active and event in webhook.events
+        ]
+        now = time.time()
+        for webhook in webhooks:
+            body = json.dumps(
+                {"event": event, "created_at": now, "data": data}, ensure_ascii=False, separators=(",", ":")
+            ).encode("utf-8")
+            self.queue.enqueue(webhook.webhook_id, event, body, now)
+        if webhooks:
+            self._notify_worker()
+        return len(webhooks)
+
+    async def start(self, client: Optional[httpx.AsyncClient] = None):
+        """현재 이벤트 루프에서 전달 작업자를 시작합니다. 이전 실행에서 남은 작업도 이어서 보냅니다."""
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._client = client or create_webhook_client(
+            self.max_connections, self.timeout, self.allow_private_networks,
+        )
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """작업자를 멈춥니다. 진행 중인 전달은 끝까지 기다리고, 남은 작업은 큐에 그대로 둡니다."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight.values(), return_exceptions=True)
+        if self._client is not None:
+            await self._client.aclose()
+        self._loop = self._wake = self._task = self._client = None
+
+    def _notify_worker(self):
+        loop, wake = self._loop, self._wake
+        if loop is None or wake is None:
+            return  # 작업자가 시작되면 큐에서 이어서 꺼냅니다.
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            wake.set()
+        else:
+            loop.call_soon_threadsafe(wake.set)
+
+    async def _run(self):
+        while True:
+            self._wake.clear()
+            # 한 프로세스가 메모리에 들고 있는 작업 수를 max_in_flight로 제한합니다.
+            # 자리가 없으면 진행 중인 전달이 끝날 때(_finished가 깨움)까지 기다립니다.
+            room = min(self.batch_size, self.max_in_flight - len(self._in_flight))
+            due = []
+            if room > 0:
+                due = self.queue.claim_due(time.time(), room, self.lease_seconds, exclude=self._in_flight.keys())
+            for delivery in due:
+                task = asyncio.create_task(self._deliver(delivery))
+                self._in_flight[delivery.delivery_id] = task
+                task.add_done_callback(lambda _, delivery_id=delivery.delivery_id: self._finished(delivery_id))
+            if due and len(due) == room:
+                await asyncio.sleep(0)
+                continue
+            timeout = self.poll_interval
+            if room > 0:
+                next_due = self.queue.next_due_at(exclude=self._in_flight.keys())
+                if next_due is not None:
+                    timeout = min(timeout, max(next_due - time.time(), 0))
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def _finished(self, delivery_id: int):
+        self._in_flight.pop(delivery_id, None)
+        if len(self._in_flight) == self.max_in_flight - 1 and self._wake is not None:
+            self._wake.set()
+
+    async def _deliver(self, delivery: WebhookDelivery):
+        # 어떤 예외든 실패한 시도로 기록합니다. 작업이 여기서 죽으면 임대 시간마다 다시 꺼내지기만 하고
+        # 시도 횟수가 늘지 않아 영원히 포기되지 않습니다.
+        try:
+            webhook = self.webhook_repo.find_by_id(delivery.webhook_id)
+            if webhook is None or not webhook.active:
+                # 구독이 삭제/비활성화되었으면 보내지 않고 버립니다.
+                self.queue.complete(delivery.delivery_id)
+                return
+            error = await self._send(webhook, delivery)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+
+        if error is None:
+            self.queue.complete(delivery.delivery_id)
+            self.delivered += 1
+            return
+        attempts = delivery.attempts + 1
+        self.failed += 1
+        if attempts >= self.max_attempts:
+            print(f"[Webhook] 전달 포기 (웹훅 ID: {delivery.webhook_id}, 시도 {attempts}회): {error}")
+            self.queue.give_up(delivery.delivery_id, attempts, error)
+        else:
+            self.queue.retry(delivery.delivery_id, attempts, time.time() + self._backoff(attempts), error)
+            self._notify_worker()
+
+    async def _send(self, webhook: Webhook, delivery: WebhookDelivery) -> Optional[str]:
+        """한 번 보내고, 성공하면 None, 아니면 오류 설명을 반환합니다."""
+        # 등록 뒤 정책이 바뀌었거나 저장소에 직접 들어온 주소도 보내기 전에 다시 검사합니다.
+        check_outbound_url(webhook.url, self.allow_private_networks)
+        destination = urlsplit(webhook.url).netloc
+        semaphore = self._destinations.get(destination)
+        if semaphore is None:
+            semaphore = self._destinations[destination] = asyncio.Semaphore(self.per_destination)
+        self._destination_users[destination] = self._destination_users.get(destination, 0) + 1
+        try:
+            async with semaphore:
+                # 차례를 기다리는 동안 claim 때의 임대가 끝났을 수 있으므로, 보내기 직전에 다시 잡습니다.
+                self.queue.extend_lease(delivery.delivery_id, time.time() + self.lease_seconds)
+                # 서명 시각도 기다린 뒤에 정해야 수신 측의 오래된 timestamp 거부에 걸리지 않습니다.
+                timestamp = int(time.time())
+                headers = {
+                    "Content-Type": "application/json",
+                    "X-CaravanShare-Event": delivery.event,
+                    # 같은 작업의 재시도는 같은 ID로 보내므로 수신 측에서 중복을 걸러낼 수 있습니다.
+                    "X-CaravanShare-Delivery": str(delivery.delivery_id),
+                    SIGNATURE_HEADER: sign_payload(webhook.secret, timestamp, delivery.body),
+                }
+                response = await self._client.post(webhook.url, content=delivery.body, headers=headers)
+        finally:
+            # 전달 중인 작업이 없는 목적지의 세마포어는 지워, 목적지 수만큼 계속 쌓이지 않게 합니다.
+            self._destination_users[destination] -= 1
+            if not self._destination_users[destination]:
+                del self._destination_users[destination]
+                del self._destinations[destination]
+        return None if response.is_success else f"HTTP {response.status_code}"
+
+    def _backoff(self, attempts: int) -> float:
+        """base_delay * 2^(attempts-1)을 max_delay로 자른 뒤, 재시도가 한꺼번에 몰리지 않게 50~100% 사이로 흔듭니다."""
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempts - 1))
+        return delay * random.uniform(0.5, 1.0)
@@ -0,0 +1,92 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Set, Tuple
+
+class TokenCache:
+    """
+    서명 검증을 마친 JWT를 보관하는 LRU 캐시.
+    키는 토큰 원문 대신 SHA-256 다이제스트이고, 항목에는 토큰이 가리키는 user_id와 만료 시각(exp)만 담습니다.
+    적중하면 jwt.decode와 이메일 조회를 건너뛰고, 만료 시각이 지난 항목은 조회 시 버립니다.
+    사용자가 변경/삭제되면(user_repo 리스너) 그 사용자의 항목을 모두 지우고, 폐기된 토큰은 revoke로 지웁니다.
+    """
+    def __init__(self, max_entries: int = 10000, clock: Callable[[], float] = time.time):
+        self.max_entries = max_entries
+        self._clock = clock
+        # digest -> (user_id, exp)
+        self._entries: "OrderedDict[bytes, Tuple[int, float]]" = OrderedDict()
+        # user_id -> 그 사용자의 digest 집합 (사용자 단위 무효화용)
+        self._by_user: Dict[int, Set[bytes]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str) -> Optional[int]:
+        """캐시된 토큰의 user_id를 반환합니다. 없거나 만료되었으면 None."""
+        digest = self._digest(token)
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is not None and entry[1] > self._clock():
+                self._entries.move_to_end(digest)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                self._remove(digest)
+            self.misses += 1
+            return None
+
+    def put(self, token: str, user_id: int, expires_at: float):
+        """검증된 토큰을 저장합니다. 가장 오래 쓰이지 않은 항목부터 밀려납니다."""
+        digest = self._digest(token)
+        with self._lock:
+            self._remove(digest)
+            self._entries[digest] = (user_id, expires_at)
+            self._by_user.setdefault(user_id, set()).add(digest)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def revoke(self, token: str):
+        with self._lock:
+            self._remove(self._digest(token))
+
+    def invalidate_user(self, user_id: int):
+        with self._lock:
+            for digest in self._by_user.pop(user_id, ()):
+                self._entries.pop(digest, None)
+
+    def on_user_event(self, event: str, entity_id: Optional[int], entity):
+        """사용자 저장소 리스너: 사용자가 저장/삭제되면 그 사용자의 토큰을 다시 검증하게 합니다."""
+        if event == 'clear':
+            self.clear()
+        else:
+            self.invalidate_user(entity_id)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def _remove(self, digest: bytes):
+        entry = self._entries.pop(digest, None)
+        if entry is None:
+            return
+        digests = self._by_user.get(entry[0])
+        if digests is not None:
+            digests.discard(digest)
+            if not digests:
+                del self._by_user[entry[0]]
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
@@ -0,0 +1,127 @@
+import hashlib
+import heapq
+import math
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+class BloomFilter:
+    """
+    문자열 집합의 근사 소속 검사용 Bloom 필터.
+    '없음' 응답은 항상 정확하고, '있음' 응답은 설정한 오탐률 이내로 틀릴 수 있습니다.
+    해시는 blake2b 다이제스트 하나를 두 값으로 나눈 이중 해싱(h1 + i * h2)으로 k개 위치를 만듭니다.
+    """
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.capacity = max(capacity, 1)
+        self.error_rate = error_rate
+        self.size = max(8, math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def add(self, key: str):
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        # 없는 키는 대개 첫 몇 비트에서 0을 만나므로 그 자리에서 끝냅니다.
+        bits, size = self._bits, self.size
+        h1, h2 = self._hashes(key)
+        for i in range(self.hash_count):
+            position = (h1 + i * h2) % size
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def _positions(self, key: str):
+        h1, h2 = self._hashes(key)
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    @staticmethod
+    def _hashes(key: str):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+
+
+class TokenRevocationStore:
+    """
+    폐기된 JWT(jti) 저장소.
+    요청마다 하는 검사는 대부분 '폐기되지 않음'이므로 Bloom 필터로 먼저 걸러 해시 몇 번으로 끝내고,
+    필터가 '있음'이라고 할 때만 정확한 집합(jti -> exp)에서 확인합니다.
+    항목은 토큰의 exp가 지나면 의미가 없으므로 만료 순 힙으로 정리하고, 정리된 항목이 쌓이면 필터를 다시 만듭니다.
+    비밀번호 변경처럼 사용자의 모든 토큰을 폐기할 때는 사용자별 기준 시각을 두어 그 이전에 발급된(iat) 토큰을 거부합니다.
+    """
+    def __init__(
+        self,
+        capacity: int = 10000,
+        error_rate: float = 0.001,
+        token_lifetime_seconds: float = 3600,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.error_rate = error_rate
+        # 사용자 단위 폐기 기준은 이 시간이 지나면 그 이전 토큰이 모두 만료되므로 지웁니다.
+        self.token_lifetime_seconds = token_lifetime_seconds
+        self._clock = clock
+        self._filter = BloomFilter(capacity, error_rate)
+        # jti -> exp
+        self._revoked: Dict[str, float] = {}
+        # (exp, jti) 최소 힙
+        self._expiry: List[Tuple[float, str]] = []
+        # 필터에 남아 있지만 정확한 집합에서는 정리된 항목 수
+        self._stale = 0
+        # user_id -> (기준 시각, 기준 만료 시각)
+        self._users_revoked_at: Dict[int, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def revoke(self, jti: str, expires_at: float):
+        """토큰 하나를 exp까지 폐기합니다."""
+        with self._lock:
+            now = self._clock()
+            self._prune(now)
+            if expires_at <= now or jti in self._revoked:
+                return
+            self._revoked[jti] = expires_at
+            heapq.heappush(self._expiry, (expires_at, jti))
+            if len(self._revoked) + self._stale > self._filter.capacity:
+                self._rebuild_filter()
+            else:
+                self._filter.add(jti)
+
+    def revoke_user(self, user_id: int):
+        """사용자에게 지금까지 발급된 모든 토큰을 폐기합니다."""
+        with self._lock:
+            now = self._clock()
+            self._users_revoked_at[user_id] = (now, now + self.token_lifetime_seconds)
+
+    def is_revoked(self, jti: Optional[str], user_id: Optional[int] = None, issued_at: Optional[float] = None) -> bool:
+        if user_id is not None and user_id in self._users_revoked_at:
+            with self._lock:
+                cutoff = self._users_revoked_at.get(user_id)
+                if cutoff is not None and cutoff[1] <= self._clock():
+                    del self._users_revoked_at[user_id]
+                elif cutoff is not None and (issued_at is None or issued_at <= cutoff[0]):
+                    return True
+        # 대부분의 요청은 여기서 끝납니다 (잠금 없이 비트 검사만).
+        if jti is None or jti not in self._filter:
+            return False
+        with self._lock:
+            expires_at = self._revoked.get(jti)
+            return expires_at is not None and expires_at > self._clock()
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+    def _prune(self, now: float):
+        while self._expiry and self._expiry[0][0] <= now:
+            _, jti = heapq.heappop(self._expiry)
+            del self._revoked[jti]
+            self._stale += 1
+        # 정리된 항목이 남은 항목보다 많아지면 오탐률이 올라가므로 필터를 새로 만듭니다.
+        if self._stale and self._stale > len(self._revoked):
+            self._rebuild_filter()
+
+    def _rebuild_filter(self):
+        capacity = max(self._filter.capacity, 2 * len(self._revoked))
+        self._filter = BloomFilter(capacity, self.error_rate)
+        for jti in self._revoked:
+            self._filter.add(jti)
+        self._stale = 0
@@ -1,5 +1,6 @@
 
 from datetime import date
+from typing import Iterable, List, Tuple
 
 from src.repositories.base_repository import BaseRepository
 from src.repositories.reservation_repository import ReservationRepository
@@ -31,6 +32,20 @@ class ReservationValidator:
         self._validate_caravan_availability(caravan_id, start_date, end_date)
         self._validate_user_funds(user, price)
 
+    def validate_batch(self, user_id: int, items: List[Tuple[int, date, date]], total_price: float):
+        """
+        여러 예약 (caravan_id, start_date, end_date)을 한 번에 검증합니다.
+        사용자/카라반 조회는 한 번씩만 수행하고, 배치 내부의 날짜 충돌도 함께 검사합니다.
+        """
+        user = self._validate_user_existence(user_id)
+        for caravan_id in {caravan_id for caravan_id, _, _ in items}:
+            self._validate_caravan_existence(caravan_id)
+        for caravan_id, start_date, end_date in items:
+            self._validate_dates(start_date, end_date)
+            self._validate_caravan_availability(caravan_id, start_date, end_date)
+        self._validate_no_conflicts_within_batch(items)
+        self._validate_user_funds(user, total_price)
+
     def _validate_user_existence(self, user_id: int) -> User:
         """사용자 존재 여부를 검증합니다."""
         user = self.user_repo.find_by_id(user_id)
@@ -57,6 +72,14 @@ class ReservationValidator:
         if not self.reservation_repo.check_caravan_availability(caravan_id, start_date, end_date):
             raise CaravanNotAvailableException(caravan_id, start_date, end_date)
 
+    def _validate_no_conflicts_within_batch(self, items: Iterable[Tuple[int, date, date]]):
+        """같은 배치 안에서 같은 카라반의 날짜가 서로 겹치지 않는지 검증합니다."""
+        previous = None
+        for caravan_id, start_date, end_date in sorted(items):
+            if previous and previous[0] == caravan_id and start_date < previous[2]:
+                raise CaravanNotAvailableException(caravan_id, start_date, end_date)
+            previous = (caravan_id, start_date, end_date)
+
     def _validate_user_funds(self, user: User, price: float):
         """사용자의 잔액이 충분한지 검증합니다."""
         if not user.has_sufficient_balance(price):
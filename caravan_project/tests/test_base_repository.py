@@ -0,0 +1,90 @@
+
+import unittest
+
+# Test Target
+from src.repositories.base_repository import BaseRepository, Index
+from src.repositories.caravan_repository import CaravanRepository
+from src.repositories.user_repository import UserRepository
+
+# Models
+from src.models.caravan import Caravan
+from src.models.user import User
+
+class TestBaseRepositoryIndexes(unittest.TestCase):
+    """BaseRepository 보조 인덱스에 대한 단위 테스트"""
+
+    def setUp(self):
+        """각 테스트 전에 인덱스가 선언된 저장소를 초기화합니다."""
+        self.repo = BaseRepository[Caravan](indexes=[Index(('owner_id',)), Index(('type', 'location'))])
+        for caravan_id, owner_id, caravan_type in [(1, 101, 'Campervan'), (2, 102, 'Motorhome'), (3, 101, 'Motorhome')]:
+            self.repo.save(Caravan(
+                caravan_id=caravan_id, name=f"Caravan {caravan_id}", owner_id=owner_id, type=caravan_type,
+                price_per_day=100.0, location="강원도 인제", sleeps=2, description=""
+            ))
+
+    def test_find_by_single_and_composite_fields(self):
+        """단일/복합 필드 인덱스 조회"""
+        self.assertEqual([c.caravan_id for c in self.repo.find_by(owner_id=101)], [1, 3])
+        self.assertEqual([c.caravan_id for c in self.repo.find_by(location="강원도 인제", type='Motorhome')], [2, 3])
+        self.assertEqual(self.repo.find_by(owner_id=999), [])
+
+    def test_index_follows_update_and_delete(self):
+        """변경 후 재저장 및 삭제 시 인덱스 갱신"""
+        caravan = self.repo.find_by_id(1)
+        caravan.owner_id = 102
+        self.repo.save(caravan)
+        self.assertEqual([c.caravan_id for c in self.repo.find_by(owner_id=101)], [3])
+        self.assertEqual([c.caravan_id for c in self.repo.find_by(owner_id=102)], [2, 1])
+
+        self.assertTrue(self.repo.delete(3))
+        self.assertFalse(self.repo.delete(3))
+        self.assertEqual(self.repo.find_by(owner_id=101), [])
+
+    def test_unindexed_criteria_fall_back_to_scan(self):
+        """인덱스가 없는 필드 조합도 조회 가능"""
+        self.assertEqual([c.caravan_id for c in self.repo.find_by(type='Campervan')], [1])
+
+    def test_sorted_iteration_survives_concurrent_changes(self):
+        """정렬 순회 중 저장/삭제가 일어나도 지나간 항목은 반복하지 않고 남은 항목은 정렬 순서대로 돌려줌"""
+        def caravan(caravan_id, price):
+            return Caravan(
+                caravan_id=caravan_id, name=f"Caravan {caravan_id}", owner_id=101, type='Campervan',
+                price_per_day=price, location="강원도 인제", sleeps=2, description=""
+            )
+
+        for descending in (False, True):
+            repo = CaravanRepository()
+            for caravan_id in range(1, 21):
+                repo.save(caravan(caravan_id, caravan_id * 10.0))
+            seen = []
+            for caravan_id in repo.iter_sorted_ids('price_per_day', descending=descending, chunk=3):
+                seen.append(caravan_id)
+                if len(seen) == 5:
+                    # 지나간 항목을 더 앞으로 옮기고, 남은 항목 하나를 지우고, 끝에 하나를 추가
+                    repo.save(caravan(seen[0], 500.0 if descending else 1.0))
+                    repo.delete(10)
+                    repo.save(caravan(21, 1.0 if descending else 500.0))
+
+            expected = [caravan_id for caravan_id in range(1, 21) if caravan_id != 10]
+            if descending:
+                expected.reverse()
+            self.assertEqual(seen, expected + [21])
+
+    def test_unique_email_index(self):
+        """이메일 unique 인덱스: 조회, 변경, 중복 거부"""
+        user_repo = UserRepository()
+        user = user_repo.save(User(name="Kim", email="kim@example.com"))
+        user_repo.save(User(name="Lee", email="lee@example.com"))
+        self.assertIs(user_repo.find_by_email("kim@example.com"), user)
+
+        with self.assertRaises(ValueError):
+            user_repo.save(User(name="Other", email="kim@example.com"))
+
+        user.email = "kim2@example.com"
+        user_repo.save(user)
+        self.assertIsNone(user_repo.find_by_email("kim@example.com"))
+        self.assertIs(user_repo.find_by_email("kim2@example.com"), user)
+
+
+if __name__ == '__main__':
+    unittest.main()
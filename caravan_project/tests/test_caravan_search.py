@@ -0,0 +1,158 @@
+
+import os
+import tempfile
+import unittest
+from datetime import date, timedelta
+
+# Test Target
+from src.services.search_service import CaravanSearchService, encode_cursor
+
+# Repositories and Models
+from src.repositories.caravan_repository import CaravanRepository
+from src.repositories.reservation_repository import ReservationRepository
+from src.repositories.sqlite_repository import SqliteCaravanRepository, SqliteDatabase, SqliteReservationRepository
+from src.models.caravan import Caravan
+from src.models.reservation import Reservation
+
+class TestCaravanSearch(unittest.TestCase):
+    """CaravanSearchService에 대한 단위 테스트 (메모리 저장소)"""
+
+    def make_repositories(self):
+        return CaravanRepository(), ReservationRepository()
+
+    def setUp(self):
+        """다양한 속성의 카라반과 확정 예약을 준비합니다."""
+        self.caravan_repo, self.reservation_repo = self.make_repositories()
+        self.service = CaravanSearchService(self.caravan_repo, self.reservation_repo)
+        fleet = [
+            # (id, location, type, sleeps, price)
+            (1, "강원도 인제", "Motorhome", 5, 250.0),
+            (2, "강원도 인제", "Campervan", 2, 90.0),
+            (3, "강원도 인제", "Motorhome", 6, 180.0),
+            (4, "제주도 애월", "Motorhome", 4, 150.0),
+            (5, "강원도 인제", "Motorhome", 4, 120.0),
+        ]
+        for caravan_id, location, caravan_type, sleeps, price in fleet:
+            self.caravan_repo.save(Caravan(
+                caravan_id=caravan_id, name=f"Caravan {caravan_id}", owner_id=100, type=caravan_type,
+                price_per_day=price, location=location, sleeps=sleeps, description=""
+            ))
+        self.start = date.today() + timedelta(days=7)
+        # 5번 카라반은 검색 기간과 겹치는 확정 예약이 있음
+        self.reservation_repo.save(Reservation(
+            reservation_id=1, user_id=1, caravan_id=5, start_date=self.start + timedelta(days=1),
+            end_date=self.start + timedelta(days=4), total_price=360.0, status='confirmed'
+        ))
+
+    def _ids(self, caravans):
+        return [caravan.caravan_id for caravan in caravans]
+
+    def test_filters_by_attributes_and_availability(self):
+        """속성 조건 + 기간 예약 가능 여부로 필터링 후 가격순 정렬"""
+        caravans, has_more = self.service.search(
+            start_date=self.start, end_date=self.start + timedelta(days=3),
+            location="강원도 인제", caravan_type="Motorhome", min_sleeps=4,
+        )
+        self.assertEqual(self._ids(caravans), [3, 1])
+        self.assertFalse(has_more)
+
+    def test_price_range_and_sort_order(self):
+        """가격 범위 필터와 내림차순 정렬"""
+        caravans, _ = self.service.search(min_price=100, max_price=200, sort_by='price_per_day', descending=True)
+        self.assertEqual(self._ids(caravans), [3, 4, 5])
+
+    def test_pagination(self):
+        """페이지 단위로 나누어 반환하고 다음 페이지 여부를 알려줌"""
+        first, has_more = self.service.search(page=1, page_size=2)
+        second, _ = self.service.search(page=2, page_size=2)
+        last, more_after_last = self.service.search(page=3, page_size=2)
+        self.assertEqual(self._ids(first), [2, 5])
+        self.assertTrue(has_more)
+        self.assertEqual(self._ids(second), [4, 3])
+        self.assertEqual(self._ids(last), [1])
+        self.assertFalse(more_after_last)
+
+    def test_large_candidate_set_uses_sorted_index(self):
+        """후보가 많을 때 정렬 인덱스를 순회해도 같은 결과"""
+        self.service.SMALL_CANDIDATE_SET = 0
+        caravans, _ = self.service.search(location="강원도 인제", sort_by='sleeps', descending=True)
+        self.assertEqual(self._ids(caravans), [3, 1, 5, 2])
+
+    def test_repository_counts_and_sorted_iteration(self):
+        """조건별 개수와 정렬 순회가 ID 목록 조회와 일치"""
+        self.assertEqual(self.caravan_repo.count_by(location="강원도 인제"), 4)
+        self.assertEqual(self.caravan_repo.count_by(type="Trailer"), 0)
+        self.assertEqual(self.caravan_repo.count_in_range('price_per_day', 100, 200), 3)
+        self.assertEqual(self.caravan_repo.count_in_range('sleeps', low=5), 2)
+        self.assertEqual(list(self.caravan_repo.iter_sorted_ids('price_per_day', descending=True)), [1, 3, 4, 5, 2])
+        self.assertEqual(self.caravan_repo.sorted_ids('sleeps'), [2, 4, 5, 1, 3])
+
+    def test_reindexes_changed_attributes(self):
+        """카라반 속성이 변경되면 인덱스도 갱신"""
+        caravan = self.caravan_repo.find_by_id(2)
+        caravan.price_per_day = 500.0
+        self.caravan_repo.save(caravan)
+        caravans, _ = self.service.search(max_price=200)
+        self.assertNotIn(2, self._ids(caravans))
+
+    def test_keyset_pages_cover_fleet_once(self):
+        """커서를 따라가면 모든 카라반을 정렬 순서대로 한 번씩 조회"""
+        for descending, expected in [(False, [2, 5, 4, 3, 1]), (True, [1, 3, 4, 5, 2])]:
+            seen, cursor = [], None
+            while True:
+                caravans, cursor = self.service.list_page('price_per_day', descending, cursor, limit=2)
+                seen.extend(self._ids(caravans))
+                if cursor is None:
+                    break
+            self.assertEqual(seen, expected)
+
+    def test_cursor_is_stable_when_earlier_rows_change(self):
+        """앞 페이지에 새 카라반이 추가되어도 다음 페이지가 밀리지 않음"""
+        first, cursor = self.service.list_page('price_per_day', limit=2)
+        self.caravan_repo.save(Caravan(
+            caravan_id=6, name="Cheap", owner_id=100, type="Campervan",
+            price_per_day=10.0, location="제주도 애월", sleeps=2, description=""
+        ))
+        second, _ = self.service.list_page('price_per_day', cursor=cursor, limit=2)
+        self.assertEqual(self._ids(first) + self._ids(second), [2, 5, 4, 3])
+
+    def test_cursor_must_match_sort(self):
+        """다른 정렬 기준의 커서나 손상된 커서는 ValueError"""
+        _, cursor = self.service.list_page('price_per_day', limit=1)
+        with self.assertRaises(ValueError):
+            self.service.list_page('sleeps', cursor=cursor)
+        with self.assertRaises(ValueError):
+            self.service.list_page('price_per_day', cursor="not-a-cursor")
+
+    def test_cursor_value_must_match_sort_type(self):
+        """정렬 열의 타입과 맞지 않는 커서 값(문자열, null, 배열, bool, NaN)은 TypeError가 아닌 ValueError"""
+        for sort_by, value in [
+            ('price_per_day', "abc"), ('price_per_day', None), ('price_per_day', [1]), ('price_per_day', float('nan')),
+            ('sleeps', 2.5), ('sleeps', True), ('average_rating', {}), ('caravan_id', "1"),
+        ]:
+            with self.subTest(sort_by=sort_by, value=value), self.assertRaises(ValueError):
+                self.service.list_page(sort_by, cursor=encode_cursor(sort_by, False, value, 1))
+        caravans, _ = self.service.list_page('price_per_day', cursor=encode_cursor('price_per_day', False, 100, 1))
+        self.assertTrue(all(caravan.price_per_day >= 100 for caravan in caravans))
+
+    def test_invalid_date_range(self):
+        """종료일이 시작일보다 빠르면 ValueError"""
+        with self.assertRaises(ValueError):
+            self.service.search(start_date=self.start, end_date=self.start)
+
+
+class TestSqliteCaravanSearch(TestCaravanSearch):
+    """같은 검색 시나리오를 SQLite 저장소로 실행합니다."""
+
+    def make_repositories(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db = SqliteDatabase(os.path.join(self.tmpdir.name, "test.db"))
+        return SqliteCaravanRepository(self.db), SqliteReservationRepository(self.db)
+
+    def tearDown(self):
+        self.db.close()
+        self.tmpdir.cleanup()
+
+
+if __name__ == '__main__':
+    unittest.main()
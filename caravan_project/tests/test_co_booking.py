@@ -0,0 +1,110 @@
+import threading
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+
+# Test Target
+from src.services.co_booking_service import CoBookingRecommender, build_co_booking_model
+
+# Repositories and Models
+from src.repositories.reservation_repository import ReservationRepository
+from src.models.reservation import Reservation
+
+class TestCoBooking(unittest.TestCase):
+    """예약 이력 기반 동시 예약 추천 모델에 대한 단위 테스트"""
+
+    HISTORY = [
+        # (user_id, caravan_id)
+        (1, 10), (1, 20), (1, 30),
+        (2, 10), (2, 20),
+        (3, 10), (3, 40),
+        (4, 20), (4, 30),
+    ]
+
+    def setUp(self):
+        self.reservation_repo = ReservationRepository()
+        self.next_id = 1
+        for user_id, caravan_id in self.HISTORY:
+            self.book(user_id, caravan_id)
+
+    def book(self, user_id, caravan_id, status='confirmed'):
+        start = date.today() + timedelta(days=self.next_id * 10)
+        reservation = Reservation(
+            reservation_id=self.next_id, user_id=user_id, caravan_id=caravan_id,
+            start_date=start, end_date=start + timedelta(days=2), total_price=200, status=status
+        )
+        self.next_id += 1
+        return self.reservation_repo.save(reservation)
+
+    def test_also_booked_ranked_by_shared_guests(self):
+        """함께 예약한 사용자 수가 많은 순서 (같으면 ID 순)"""
+        model = build_co_booking_model(self.HISTORY)
+        self.assertEqual(model.also_booked(10), [20, 30, 40])
+        self.assertEqual(model.also_booked(20), [10, 30])
+        self.assertEqual(model.counts[20][30], 2)
+        self.assertEqual(model.also_booked(99), [])
+
+    def test_user_recommendations_exclude_booked(self):
+        """사용자 추천에는 이미 예약한 카라반이 없음"""
+        model = build_co_booking_model(self.HISTORY)
+        self.assertEqual(model.for_user(2), [30, 40])
+        self.assertEqual(model.for_user(4), [10])
+
+    def test_incremental_update_matches_full_rebuild(self):
+        """옵저버로 들어온 예약을 반영한 결과가 전체 재계산 결과와 같음"""
+        recommender = CoBookingRecommender(self.reservation_repo)
+        recommender.rebuild()
+        self.assertEqual(recommender.for_user(3), [20, 30])
+
+        new = [self.book(3, 30), self.book(5, 40), self.book(5, 30)]
+        recommender.update(None, reservation=new[0])
+        recommender.update(None, reservations=new[1:])
+
+        expected = build_co_booking_model(self.HISTORY + [(3, 30), (5, 40), (5, 30)])
+        for caravan_id in (10, 20, 30, 40):
+            self.assertEqual(recommender.also_booked(caravan_id, 10), expected.also_booked(caravan_id))
+        for user_id in (1, 2, 3, 4, 5):
+            self.assertEqual(recommender.for_user(user_id, 10), expected.for_user(user_id))
+
+    def test_background_rebuild_keeps_bookings_made_meanwhile(self):
+        """작업 프로세스에서 재계산하는 동안 들어온 예약도 교체된 모델에 남음"""
+        self.book(2, 30, status='cancelled')
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            recommender = CoBookingRecommender(self.reservation_repo, executor=executor)
+            future = recommender.rebuild_in_background()
+            # 재계산이 시작된 뒤 들어온 예약 (저장소 목록에는 포함되지 않음)
+            recommender.record(4, 40)
+            future.result(timeout=30)
+        self.assertEqual(recommender.also_booked(40, 10), [10, 20, 30])
+        # 취소된 예약은 재계산에서 빠짐
+        self.assertEqual(recommender.for_user(2, 10), [30, 40])
+
+    def test_background_rebuild_reads_bookings_without_lock(self):
+        """재계산이 예약 목록을 읽는 동안에도 새 예약 반영과 추천 조회가 막히지 않음"""
+        reading, release = threading.Event(), threading.Event()
+        get_all = self.reservation_repo.get_all
+
+        def slow_get_all():
+            reading.set()
+            release.wait(timeout=30)
+            return get_all()
+        self.reservation_repo.get_all = slow_get_all
+
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            recommender = CoBookingRecommender(self.reservation_repo, executor=executor)
+            result = {}
+            starter = threading.Thread(target=lambda: result.setdefault("future", recommender.rebuild_in_background()))
+            starter.start()
+            self.assertTrue(reading.wait(timeout=30))
+            # 목록을 읽는 중인데도 잠금을 기다리지 않고 바로 끝남
+            done = threading.Event()
+            threading.Thread(target=lambda: (recommender.record(4, 40), recommender.also_booked(40), done.set())).start()
+            self.assertTrue(done.wait(timeout=5))
+            release.set()
+            starter.join(timeout=30)
+            result["future"].result(timeout=30)
+        self.assertIn(10, recommender.also_booked(40, 10))
+
+
+if __name__ == '__main__':
+    unittest.main()
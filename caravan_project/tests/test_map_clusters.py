@@ -0,0 +1,80 @@
+
+import unittest
+
+import numpy as np
+
+# Test Target
+from src.repositories.map_clusters import ClusterPyramid, IncrementalClusterGrid
+from src.repositories.caravan_repository import CaravanRepository
+from src.models.caravan import Caravan
+
+class TestMapClusters(unittest.TestCase):
+    """지도 클러스터(ClusterPyramid, IncrementalClusterGrid)에 대한 단위 테스트"""
+
+    KOREA = (33.0, 124.5, 38.6, 130.0)
+
+    def setUp(self):
+        rng = np.random.default_rng(11)
+        self.lat = rng.uniform(33.0, 38.6, 2_000)
+        self.lon = rng.uniform(124.5, 130.0, 2_000)
+
+    def test_pyramid_counts_cover_all_points_at_every_zoom(self):
+        """모든 줌 레벨에서 클러스터 개수의 합이 전체 점 수와 같음"""
+        pyramid = ClusterPyramid(self.lat, self.lon)
+        for zoom in range(pyramid.max_zoom + 1):
+            hits = pyramid.query(zoom, *self.KOREA)
+            self.assertEqual(sum(hit.count for hit in hits), len(self.lat), zoom)
+        # 충분히 확대하면 대부분 단일 점 클러스터가 되고, 그 점의 ID를 돌려줌
+        singles = [hit for hit in pyramid.query(16, *self.KOREA) if hit.count == 1]
+        for hit in singles[:50]:
+            self.assertAlmostEqual(self.lat[hit.member], hit.latitude)
+            self.assertAlmostEqual(self.lon[hit.member], hit.longitude)
+
+    def test_incremental_grid_matches_pyramid(self):
+        """같은 점으로 만든 증분 격자와 피라미드의 클러스터가 일치"""
+        pyramid = ClusterPyramid(self.lat, self.lon)
+        grid = IncrementalClusterGrid()
+        for point_id, (lat, lon) in enumerate(zip(self.lat, self.lon)):
+            grid.add(point_id, lat, lon)
+        box = (35.0, 126.0, 37.0, 128.5)
+        for zoom in (0, 5, 9, 14):
+            expected = pyramid.query(zoom, *box)
+            actual = grid.query(zoom, *box)
+            self.assertEqual([hit.count for hit in actual], [hit.count for hit in expected])
+            self.assertEqual([hit.member for hit in actual], [hit.member for hit in expected])
+            for a, e in zip(actual, expected):
+                self.assertAlmostEqual(a.latitude, e.latitude)
+
+    def test_incremental_grid_move_and_remove(self):
+        """점 이동/삭제가 모든 줌 레벨에 반영됨"""
+        grid = IncrementalClusterGrid()
+        grid.add(1, 37.49, 127.49)
+        grid.add(2, 37.50, 127.50)
+        self.assertEqual([hit.count for hit in grid.query(5, *self.KOREA)], [2])
+
+        grid.add(2, 33.46, 126.31)  # 제주로 이동
+        hits = grid.query(5, *self.KOREA)
+        self.assertEqual(sorted(hit.member for hit in hits), [1, 2])
+
+        grid.remove(1)
+        self.assertEqual([(hit.count, hit.member) for hit in grid.query(0, -80, -180, 80, 180)], [(1, 2)])
+        self.assertEqual(grid.query(5, 37.0, 127.0, 38.0, 128.0), [])
+
+    def test_grid_follows_repository_events(self):
+        """저장소 리스너로 연결하면 저장/삭제가 클러스터에 반영됨"""
+        repo = CaravanRepository()
+        grid = IncrementalClusterGrid()
+        repo.add_listener(grid.on_repository_event)
+        caravan = Caravan(caravan_id=0, name="카라반", type="카라반", location="경기도 양평",
+                          latitude=37.49, longitude=127.49, sleeps=2, description="",
+                          price_per_day=100000, owner_id=1)
+        saved = repo.save(caravan)
+        self.assertEqual(len(grid), 1)
+        self.assertEqual(grid.query(3, *self.KOREA)[0].member, saved.caravan_id)
+
+        repo.delete(saved.caravan_id)
+        self.assertEqual(len(grid), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,192 @@
+
+import asyncio
+import threading
+import unittest
+
+# Test Target
+from src.services.notification_service import Notification, NotificationConnection, NotificationService
+
+class TestNotificationService(unittest.TestCase):
+    """비동기 알림 전달 파이프라인에 대한 단위 테스트"""
+
+    def setUp(self):
+        self.delivered = []
+        self.service = NotificationService(
+            deliver=lambda user_id, notifications: self.delivered.append(
+                (user_id, [n.message for n in notifications])
+            ),
+            workers=2, mailbox_size=3,
+        )
+
+    def run_scenario(self, scenario):
+        async def wrapped():
+            await self.service.start()
+            try:
+                await scenario()
+            finally:
+                await self.service.stop()
+        asyncio.run(wrapped())
+
+    def test_send_from_request_thread_is_delivered_in_order(self):
+        """요청 스레드에서 보낸 알림이 작업자를 통해 순서대로 전달되고, 묶을 수 없는 알림은 합쳐지지 않음"""
+        self.service.connect(1)
+
+        async def scenario():
+            thread = threading.Thread(target=lambda: [self.service.send(1, f"m{i}") for i in range(5)])
+            thread.start()
+            thread.join()
+            await asyncio.sleep(0.05)
+
+        self.run_scenario(scenario)
+        messages = [message for user_id, batch in self.delivered for message in batch]
+        self.assertEqual(messages, ["m0", "m1", "m2", "m3", "m4"])
+
+    def test_host_notifications_coalesce_into_digest(self):
+        """같은 묶음에 들어온 호스트 알림 여러 건은 요약 하나로 합쳐짐"""
+        self.service.connect(101)
+
+        async def scenario():
+            for i in range(3):
+                self.service.send(101, f"예약 {i}", coalesce=True)
+            self.service.send(101, "일반 알림")
+
+        self.run_scenario(scenario)
+        self.assertEqual(self.delivered, [(101, ["새 알림 3건: 예약 0 / 예약 1 / 예약 2", "일반 알림"])])
+
+    def test_offline_mailbox_is_bounded_and_drained_on_connect(self):
+        """오프라인 알림은 최대 개수만 보관(오래된 것부터 버림)되고, connect 때 요약되어 전달됨"""
+        async def scenario():
+            for i in range(5):
+                self.service.send(7, f"n{i}", coalesce=True)
+            await asyncio.sleep(0.05)
+            self.assertEqual([n.message for n in self.service.mailbox(7)], ["n2", "n3", "n4"])
+            pending = self.service.connect(7)
+            self.assertEqual([n.message for n in pending], ["새 알림 3건: n2 / n3 / n4"])
+            await asyncio.sleep(0.05)
+
+        self.run_scenario(scenario)
+        self.assertEqual(self.delivered, [(7, ["새 알림 3건: n2 / n3 / n4"])])
+        self.assertEqual(self.service.mailbox(7), [])
+        self.assertEqual(self.service.dropped, 2)
+
+    def test_notifications_sent_before_start_are_kept(self):
+        """작업자 시작 전에 보낸 알림은 시작할 때 큐에 들어감"""
+        self.service.send(3, "early")
+        self.service.connect(3)
+
+        async def scenario():
+            await asyncio.sleep(0.05)
+
+        self.run_scenario(scenario)
+        self.assertEqual(self.delivered, [(3, ["early"])])
+
+
+class _FakeClient:
+    """WebSocket 클라이언트 흉내: 받은 메시지를 모으고, slow면 전송마다 오래 기다림"""
+    def __init__(self, slow: bool = False):
+        self.slow = slow
+        self.received = []
+
+    async def send(self, payload: dict):
+        if self.slow:
+            await asyncio.sleep(60)
+        self.received.append(payload["message"])
+
+
+class TestNotificationConnections(unittest.TestCase):
+    """실시간 연결 등록과 연결별 송신 버퍼에 대한 테스트"""
+
+    def test_fan_out_to_many_clients_with_slow_consumer(self):
+        """연결 2000개에 알림을 뿌려도, 느린 연결은 버퍼가 차면 끊기고 나머지는 모두 받음"""
+        service = NotificationService(workers=4)
+        clients = [_FakeClient(slow=(i == 0)) for i in range(2000)]
+
+        async def scenario():
+            await service.start()
+            connections = []
+            for i, client in enumerate(clients):
+                connection = NotificationConnection(client.send, buffer_size=5)
+                service.connect(i % 500, connection)  # 사용자 500명이 각각 연결 4개
+                connections.append(connection)
+            runners = [asyncio.create_task(connection.run()) for connection in connections]
+
+            for round_number in range(10):
+                for user_id in range(500):
+                    service.send(user_id, f"r{round_number}")
+                await asyncio.sleep(0)
+            await service.stop()
+            for _ in range(50):
+                await asyncio.sleep(0)
+
+            slow = connections[0]
+            self.assertTrue(slow.closed)
+            self.assertGreater(slow.dropped, 0)
+            # 끊긴 연결은 바로 목록에서 빠지고, 느린 전송에 묶여 있던 송신 루프도 끝나 있음
+            self.assertEqual(service.connection_count(), 1999)
+            self.assertTrue(runners[0].done())
+            for connection in connections:
+                connection.close()
+            await asyncio.gather(*runners)
+            self.assertEqual(service.connection_count(), 0)
+
+        asyncio.run(scenario())
+        for client in clients[1:]:
+            self.assertEqual(client.received, [f"r{i}" for i in range(10)])
+
+    def test_drop_policy_keeps_connection(self):
+        """'drop' 정책은 버퍼가 차면 새 알림만 버리고 연결은 유지"""
+        async def scenario():
+            connection = NotificationConnection(_FakeClient().send, buffer_size=2, policy='drop')
+            results = [connection.push(Notification(user_id=1, message=f"n{i}")) for i in range(3)]
+            return connection, results
+
+        connection, results = asyncio.run(scenario())
+        self.assertEqual(results, [True, True, False])
+        self.assertFalse(connection.closed)
+        self.assertEqual(connection.dropped, 1)
+
+    def test_last_disconnect_goes_offline(self):
+        """사용자의 마지막 연결이 끊기면 이후 알림은 메일박스에 쌓임"""
+        service = NotificationService()
+
+        async def scenario():
+            await service.start()
+            first = NotificationConnection(_FakeClient().send)
+            second = NotificationConnection(_FakeClient().send)
+            service.connect(1, first)
+            service.connect(1, second)
+            service.disconnect(1, first)
+            self.assertTrue(first.closed)
+            service.send(1, "still online")
+            await asyncio.sleep(0.01)
+            service.disconnect(1, second)
+            service.send(1, "offline")
+            await service.stop()
+
+        asyncio.run(scenario())
+        self.assertEqual([n.message for n in service.mailbox(1)], ["offline"])
+
+    def test_notifications_after_slow_disconnect_go_to_mailbox(self):
+        """느린 소비자로 끊긴 사용자의 이후 알림은 버려지지 않고 메일박스에 쌓임"""
+        service = NotificationService()
+        slow = _FakeClient(slow=True)
+
+        async def scenario():
+            await service.start()
+            connection = NotificationConnection(slow.send, buffer_size=1)
+            service.connect(1, connection)
+            runner = asyncio.create_task(connection.run())
+            for i in range(4):
+                service.send(1, f"n{i}")
+                await asyncio.sleep(0.01)
+            await service.stop()
+            self.assertTrue(connection.closed)
+            await asyncio.wait_for(runner, 1)
+            self.assertEqual(service.connection_count(), 0)
+
+        asyncio.run(scenario())
+        self.assertEqual([n.message for n in service.mailbox(1)], ["n2", "n3"])
+
+
+if __name__ == '__main__':
+    unittest.main()
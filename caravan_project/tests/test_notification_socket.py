@@ -0,0 +1,125 @@
+
+import base64
+import os
+import socket
+import struct
+import threading
+import time
+import unittest
+
+# 앱을 불러오기 전에 테스트용 설정을 정합니다.
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+os.environ["WS_SEND_BUFFER_SIZE"] = "8"
+os.environ["WS_SLOW_CONSUMER_POLICY"] = "disconnect"
+
+import uvicorn
+
+# Test Target
+import main
+
+class TestNotificationSocket(unittest.TestCase):
+    """실제 서버(uvicorn) 위의 /ws/notifications 엔드포인트 테스트"""
+
+    @classmethod
+    def setUpClass(cls):
+        # AuthService가 먼저 불러와졌으면 환경 변수가 아닌 클래스 속성으로 키를 정해야 합니다.
+        cls.secret_key = main.AuthService.SECRET_KEY
+        main.AuthService.SECRET_KEY = cls.secret_key or "test-secret"
+        config = uvicorn.Config(main.app, host="127.0.0.1", port=0, ws="websockets", log_level="warning")
+        cls.server = uvicorn.Server(config)
+        cls.thread = threading.Thread(target=cls.server.run, daemon=True)
+        cls.thread.start()
+        for _ in range(200):
+            if cls.server.started:
+                break
+            time.sleep(0.05)
+        cls.port = cls.server.servers[0].sockets[0].getsockname()[1]
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.should_exit = True
+        cls.thread.join(timeout=30)
+        main.AuthService.SECRET_KEY = cls.secret_key
+
+    def _connect(self, email):
+        token = main.auth_service.create_access_token({"sub": email})
+        client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        # 받는 쪽 버퍼를 작게 두어, 읽지 않으면 서버 전송이 곧바로 막히게 합니다.
+        client.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+        client.connect(("127.0.0.1", self.port))
+        key = base64.b64encode(os.urandom(16)).decode()
+        client.sendall((
+            f"GET /ws/notifications HTTP/1.1\r\nHost: 127.0.0.1:{self.port}\r\n"
+            f"Upgrade: websocket\r\nConnection: Upgrade\r\nSec-WebSocket-Key: {key}\r\n"
+            f"Sec-WebSocket-Version: 13\r\nCookie: access_token=Bearer {token}\r\n\r\n"
+        ).encode())
+        response = b""
+        while b"\r\n\r\n" not in response:
+            response += client.recv(1)
+        self.assertIn(b" 101 ", response)
+        return client
+
+    @staticmethod
+    def _read_close_code(client):
+        """서버가 보낸 프레임을 끝까지 읽어 닫기 프레임의 코드를 반환합니다."""
+        client.settimeout(30)
+        buffer = b""
+
+        def take(n):
+            nonlocal buffer
+            while len(buffer) < n:
+                chunk = client.recv(65536)
+                if not chunk:
+                    raise ConnectionError("closed without a close frame")
+                buffer += chunk
+            data, buffer = buffer[:n], buffer[n:]
+            return data
+
+        while True:
+            opcode, length = take(2)
+            opcode &= 0x0F
+            length &= 0x7F
+            if length == 126:
+                length = struct.unpack("!H", take(2))[0]
+            elif length == 127:
+                length = struct.unpack("!Q", take(8))[0]
+            payload = take(length)
+            if opcode == 0x8:
+                return struct.unpack("!H", payload[:2])[0]
+
+    def _wait_for(self, condition):
+        for _ in range(400):
+            if condition():
+                return True
+            time.sleep(0.025)
+        return False
+
+    def test_client_that_never_reads_is_closed_and_goes_offline(self):
+        """읽지 않는 클라이언트는 버퍼가 넘치면 1013으로 닫히고, 이후 알림은 메일박스에 쌓임"""
+        user = main.user_repo.find_by_id(101)
+        service = main.notification_service
+        client = self._connect(user.email)
+        try:
+            self.assertTrue(self._wait_for(lambda: service.connection_count() == 1))
+            # 큰 알림을 천천히 계속 보내, 서버 전송이 소켓에서 막힌 뒤 송신 버퍼가 넘치게 합니다.
+            big = "x" * 500_000
+            for _ in range(200):
+                service.send(user.user_id, big)
+                time.sleep(0.02)
+                if service.connection_count() == 0:
+                    break
+            self.assertTrue(self._wait_for(lambda: service.connection_count() == 0))
+
+            service.send(user.user_id, "after disconnect")
+            self.assertTrue(self._wait_for(
+                lambda: "after disconnect" in [n.message for n in service.mailbox(user.user_id)]
+            ))
+            self.assertEqual(self._read_close_code(client), 1013)
+        finally:
+            client.close()
+            service.connect(user.user_id)
+            service.disconnect(user.user_id)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+
+import asyncio
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+# Test Target
+from src.services.auth_service import AuthService
+
+# Dependencies
+from src.repositories.user_repository import UserRepository
+
+class _StandInOAuthHandler(BaseHTTPRequestHandler):
+    """토큰 교환과 사용자 정보 엔드포인트만 흉내 내는 로컬 OAuth 제공자"""
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_POST(self):
+        form = parse_qs(self.rfile.read(int(self.headers["Content-Length"])).decode())
+        self._reply({"access_token": f"access-{form['code'][0]}", "token_type": "Bearer"})
+
+    def do_GET(self):
+        code = self.headers["Authorization"].removeprefix("Bearer access-")
+        self._reply({"sub": f"google-{code}", "email": f"{code}@example.com", "name": code})
+
+    def _reply(self, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestOAuthLogin(unittest.TestCase):
+    """로컬 OAuth 제공자를 상대로 한 Google 로그인 흐름과 커넥션 재사용 테스트"""
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInOAuthHandler)
+        self.server.lock = threading.Lock()
+        self.server.connections = 0
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+        self.repo = UserRepository()
+        self.auth = AuthService(self.repo)
+        self.auth.SECRET_KEY = "test-secret"
+        self.auth.GOOGLE_TOKEN_URL = f"{base}/token"
+        self.auth.GOOGLE_USERINFO_URL = f"{base}/userinfo"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_concurrent_logins_share_pooled_connections(self):
+        """동시 로그인 40건(요청 80건)이 커넥션 풀 크기 이내의 연결만 사용하고, 사용자를 한 번씩 생성"""
+        async def scenario():
+            self.auth.http_client = AuthService.create_http_client(max_connections=4, max_keepalive_connections=4)
+            try:
+                return await asyncio.gather(*(self.auth.handle_google_login(f"guest{i}") for i in range(40)))
+            finally:
+                await self.auth.aclose()
+
+        tokens = asyncio.run(scenario())
+
+        self.assertEqual(len(tokens), 40)
+        self.assertLessEqual(self.server.connections, 4)
+        user = self.repo.find_by_email("guest7@example.com")
+        self.assertEqual((user.provider, user.social_id), ("google", "google-guest7"))
+        self.assertEqual(len(self.repo.get_all()), 40)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+
+import asyncio
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+# Test Target
+from src.services.password_hasher import PasswordHasher, PasswordHasherBusy
+from src.services.auth_service import AuthService
+
+# Dependencies
+from src.repositories.user_repository import UserRepository
+
+class TestPasswordHasher(unittest.TestCase):
+    """작업 프로세스 풀 기반 비밀번호 해시에 대한 단위 테스트 (테스트 속도를 위해 최소 비용 4 사용)"""
+
+    def setUp(self):
+        self.hasher = PasswordHasher(rounds=4, max_workers=1)
+
+    def tearDown(self):
+        self.hasher.close()
+
+    def test_hash_and_verify_in_worker_process(self):
+        """작업 프로세스에서 만든 해시를 검증하고, 비용이 같으면 새 해시를 만들지 않음"""
+        hashed = asyncio.run(self.hasher.hash("s3cret"))
+        self.assertTrue(hashed.startswith("$2b$04$"))
+        self.assertEqual(asyncio.run(self.hasher.verify("s3cret", hashed)), (True, None))
+        self.assertEqual(asyncio.run(self.hasher.verify("wrong", hashed)), (False, None))
+
+    def test_rehash_on_login_when_cost_changes(self):
+        """비용 설정이 바뀌면 로그인 성공 시 새 비용의 해시로 교체하여 저장"""
+        repo = UserRepository()
+        user = asyncio.run(AuthService(repo, self.hasher).register_user("Kim", "kim@example.com", "s3cret"))
+        old_hash = user.hashed_password
+
+        stronger = PasswordHasher(rounds=5, max_workers=1)
+        self.addCleanup(stronger.close)
+        auth = AuthService(repo, stronger)
+        self.assertIsNone(asyncio.run(auth.authenticate_user("kim@example.com", "wrong")))
+        self.assertEqual(repo.find_by_email("kim@example.com").hashed_password, old_hash)
+
+        self.assertIsNotNone(asyncio.run(auth.authenticate_user("kim@example.com", "s3cret")))
+        new_hash = repo.find_by_email("kim@example.com").hashed_password
+        self.assertTrue(new_hash.startswith("$2b$05$"))
+        self.assertEqual(asyncio.run(stronger.verify("s3cret", new_hash)), (True, None))
+
+    def test_rejects_when_saturated(self):
+        """처리 중인 작업이 max_pending개면 대기열에 쌓지 않고 즉시 거절하고, 작업이 끝나면 다시 받음"""
+        release = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=1)
+        executor.submit(release.wait)  # 작업자를 붙잡아 두어 해시 작업이 대기하게 함
+        hasher = PasswordHasher(rounds=4, max_pending=1, executor=executor)
+
+        async def scenario():
+            queued = asyncio.ensure_future(hasher.hash("first"))
+            await asyncio.sleep(0)
+            with self.assertRaises(PasswordHasherBusy):
+                await hasher.hash("second")
+            release.set()
+            await queued
+            return await hasher.hash("third")
+
+        self.assertTrue(asyncio.run(scenario()).startswith("$2b$04$"))
+        executor.shutdown()
+
+
+if __name__ == '__main__':
+    unittest.main()
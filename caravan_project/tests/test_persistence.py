@@ -0,0 +1,136 @@
+
+import os
+import tempfile
+import threading
+import unittest
+from datetime import date, timedelta
+
+# Test Target
+from src.repositories.persistence import RepositoryPersistence
+
+# Repositories and Models
+from src.repositories.reservation_repository import ReservationRepository
+from src.repositories.user_repository import UserRepository
+from src.models.reservation import Reservation
+from src.models.user import User
+
+class TestRepositoryPersistence(unittest.TestCase):
+    """스냅샷 + 저널 영속화 계층에 대한 단위 테스트"""
+
+    def setUp(self):
+        """각 테스트마다 임시 디렉터리를 생성합니다."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.directory = self.tmpdir.name
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _open_users(self, **options):
+        store = RepositoryPersistence(self.directory, "users", User, **options)
+        repo = UserRepository()
+        stats = store.attach(repo)
+        return store, repo, stats
+
+    def test_journal_replay_restores_saves_and_deletes(self):
+        """저널 재생으로 저장/변경/삭제 상태 복구"""
+        store, repo, _ = self._open_users()
+        kim = repo.save(User(name="Kim", email="kim@example.com"))
+        lee = repo.save(User(name="Lee", email="lee@example.com"))
+        kim.balance = 300.0
+        repo.save(kim)
+        repo.delete(lee.user_id)
+        store.close()
+
+        store, restored, stats = self._open_users()
+        self.assertEqual(stats.journal_records, 4)
+        self.assertEqual(restored.find_by_email("kim@example.com").balance, 300.0)
+        self.assertIsNone(restored.find_by_email("lee@example.com"))
+        # 복구 후 새로 할당되는 ID는 기존 ID와 겹치지 않아야 함
+        self.assertEqual(restored.save(User(name="Park", email="park@example.com")).user_id, 3)
+        store.close()
+
+    def test_snapshot_bounds_journal_replay(self):
+        """스냅샷 이후에는 저널 꼬리만 재생"""
+        store, repo, _ = self._open_users(snapshot_every=1_000_000)
+        for i in range(50):
+            repo.save(User(name=f"User {i}", email=f"user{i}@example.com"))
+        store.snapshot()
+        repo.save(User(name="Tail", email="tail@example.com"))
+        store.close()
+
+        store, restored, stats = self._open_users()
+        self.assertEqual(stats.snapshot_entities, 50)
+        self.assertEqual(stats.journal_records, 1)
+        self.assertEqual(len(restored.get_all()), 51)
+        self.assertEqual(len([name for name in os.listdir(self.directory) if ".journal." in name]), 1)
+        store.close()
+
+    def test_snapshot_during_concurrent_saves(self):
+        """저장이 계속되는 동안 스냅샷을 찍어도 모든 변경이 스냅샷 또는 저널 중 한 곳에 남음"""
+        store, repo, _ = self._open_users(snapshot_every=1_000_000)
+        errors = []
+
+        def writer(offset):
+            try:
+                for i in range(300):
+                    repo.save(User(name=f"User {offset + i}", email=f"user{offset + i}@example.com"))
+            except Exception as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=writer, args=(offset,)) for offset in (0, 1000, 2000)]
+        for thread in threads:
+            thread.start()
+        while any(thread.is_alive() for thread in threads):
+            store.snapshot()
+        for thread in threads:
+            thread.join()
+        store.close()
+
+        self.assertEqual(errors, [])
+        store, restored, _ = self._open_users()
+        self.assertEqual(len(restored.get_all()), 900)
+        store.close()
+
+    def test_torn_journal_tail_is_discarded(self):
+        """쓰다 중단된 마지막 레코드는 버리고 나머지를 복구"""
+        store, repo, _ = self._open_users()
+        repo.save(User(name="Kim", email="kim@example.com"))
+        repo.save(User(name="Lee", email="lee@example.com"))
+        store.close()
+        path = os.path.join(self.directory, "users.journal.0")
+        with open(path, 'r+b') as f:
+            f.truncate(os.path.getsize(path) - 5)
+
+        store, restored, stats = self._open_users()
+        self.assertEqual(stats.journal_records, 1)
+        self.assertIsNotNone(restored.find_by_email("kim@example.com"))
+        repo_after = restored.save(User(name="Lee", email="lee@example.com"))
+        store.close()
+
+        store, restored, stats = self._open_users()
+        self.assertEqual(restored.find_by_email("lee@example.com").user_id, repo_after.user_id)
+        store.close()
+
+    def test_reservation_indexes_are_rebuilt(self):
+        """복구 시 하위 저장소의 숙박 인덱스도 재구성"""
+        store = RepositoryPersistence(self.directory, "reservations", Reservation)
+        repo = ReservationRepository()
+        store.attach(repo)
+        start = date.today() + timedelta(days=3)
+        repo.save(Reservation(
+            reservation_id=1, user_id=1, caravan_id=7, start_date=start,
+            end_date=start + timedelta(days=2), total_price=200.0, status='confirmed'
+        ))
+        store.snapshot()
+        store.close()
+
+        store = RepositoryPersistence(self.directory, "reservations", Reservation)
+        restored = ReservationRepository()
+        store.attach(restored)
+        self.assertFalse(restored.check_caravan_availability(7, start, start + timedelta(days=1)))
+        self.assertEqual(len(restored.find_by_user_id(1)), 1)
+        store.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
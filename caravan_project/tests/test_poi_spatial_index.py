@@ -0,0 +1,100 @@
+
+import unittest
+
+import numpy as np
+
+# Test Target
+from src.repositories import poi_spatial_index
+from src.repositories.poi_spatial_index import KM_PER_DEGREE, PoiSpatialIndex, haversine_km
+
+class TestPoiSpatialIndex(unittest.TestCase):
+    """PoiSpatialIndex에 대한 단위 테스트 (전체 순회 결과와 비교)"""
+
+    def setUp(self):
+        """한반도 범위에 무작위 POI를 생성합니다."""
+        rng = np.random.default_rng(7)
+        self.count = 20_000
+        self.lat = rng.uniform(33.0, 38.6, self.count)
+        self.lon = rng.uniform(124.5, 130.0, self.count)
+        self.types = rng.integers(0, 2, self.count)
+        self.index = PoiSpatialIndex(self.lat, self.lon, self.types, ['campground', 'toilet'])
+
+    def test_radius_matches_brute_force(self):
+        """반경 조회 결과가 전체 거리 계산과 일치하고 가까운 순으로 정렬"""
+        indices, distances = self.index.radius(37.5, 127.0, 15, poi_type='toilet')
+        full = haversine_km(37.5, 127.0, self.lat, self.lon)
+        expected = np.where((full <= 15) & (self.types == 1))[0]
+        self.assertEqual(sorted(indices.tolist()), sorted(expected.tolist()))
+        self.assertTrue(np.all(np.diff(distances) >= 0))
+
+    def test_nearest_matches_brute_force(self):
+        """최근접 k개 조회 결과가 전체 정렬 결과와 일치"""
+        indices, _ = self.index.nearest(35.1, 129.0, 25, poi_type='campground')
+        full = haversine_km(35.1, 129.0, self.lat, self.lon)
+        campgrounds = np.where(self.types == 0)[0]
+        expected = campgrounds[np.argsort(full[campgrounds], kind='stable')[:25]]
+        self.assertEqual(indices.tolist(), expected.tolist())
+
+    def test_bbox_matches_brute_force(self):
+        """경계 상자 조회 결과가 좌표 비교 결과와 일치"""
+        indices = self.index.bbox(36.0, 127.0, 36.5, 128.0)
+        expected = np.where(
+            (self.lat >= 36.0) & (self.lat <= 36.5) & (self.lon >= 127.0) & (self.lon <= 128.0)
+        )[0]
+        self.assertEqual(indices.tolist(), expected.tolist())
+
+    def test_queries_across_antimeridian(self):
+        """경도 180도를 가로지르는 조회"""
+        index = PoiSpatialIndex([0.0, 0.0, 0.0], [179.99, -179.99, 10.0], [0, 0, 0], ['campground'])
+        self.assertEqual(sorted(index.radius(0.0, 180.0, 5)[0].tolist()), [0, 1])
+        self.assertEqual(index.bbox(-1.0, 179.0, 1.0, -179.0).tolist(), [0, 1])
+
+    def test_corridor_matches_brute_force(self):
+        """경로 주변 조회 결과가 모든 구간에 대한 거리 계산과 일치하고 경로 진행 순으로 정렬"""
+        steps = np.linspace(0, 1, 400)
+        route_lat = 37.56 - 2.38 * steps + 0.05 * np.sin(steps * 40)
+        route_lon = 126.98 + 2.09 * steps
+        indices, along, offsets = self.index.corridor(route_lat, route_lon, 4.0, poi_type='campground')
+
+        best = np.full(self.count, np.inf)
+        for i in range(len(steps) - 1):
+            scale = KM_PER_DEGREE * np.cos(np.radians((route_lat[i] + route_lat[i + 1]) / 2))
+            ax, ay = route_lon[i] * scale, route_lat[i] * KM_PER_DEGREE
+            dx, dy = route_lon[i + 1] * scale - ax, route_lat[i + 1] * KM_PER_DEGREE - ay
+            px, py = self.lon * scale - ax, self.lat * KM_PER_DEGREE - ay
+            t = np.clip((px * dx + py * dy) / (dx * dx + dy * dy), 0, 1)
+            best = np.minimum(best, np.hypot(px - t * dx, py - t * dy))
+        expected = np.where((best <= 4.0) & (self.types == 0))[0]
+
+        self.assertGreater(len(expected), 0)
+        self.assertEqual(sorted(indices.tolist()), expected.tolist())
+        np.testing.assert_allclose(offsets, best[indices])
+        self.assertTrue(np.all(np.diff(along) >= 0))
+
+    def test_corridor_in_small_chunks_matches(self):
+        """(POI, 구간) 쌍을 작은 묶음으로 나눠 계산해도 결과가 같음"""
+        steps = np.linspace(0, 1, 400)
+        route_lat = 37.56 - 2.38 * steps + 0.05 * np.sin(steps * 40)
+        route_lon = 126.98 + 2.09 * steps
+        expected = self.index.corridor(route_lat, route_lon, 6.0)
+
+        self.addCleanup(setattr, poi_spatial_index, 'ROUTE_PAIR_BUDGET', poi_spatial_index.ROUTE_PAIR_BUDGET)
+        poi_spatial_index.ROUTE_PAIR_BUDGET = 37
+        actual = self.index.corridor(route_lat, route_lon, 6.0)
+
+        self.assertGreater(len(expected[0]), 0)
+        for got, want in zip(actual, expected):
+            np.testing.assert_array_equal(got, want)
+
+    def test_corridor_single_vertex_is_a_radius(self):
+        """꼭짓점 하나짜리 경로는 반경 조회와 같음"""
+        indices, along, _ = self.index.corridor([36.0], [128.0], 10)
+        self.assertEqual(sorted(indices.tolist()), sorted(self.index.radius(36.0, 128.0, 10)[0].tolist()))
+        self.assertTrue(np.all(along == 0))
+
+    def test_unknown_type_returns_nothing(self):
+        self.assertEqual(len(self.index.radius(37.5, 127.0, 50, poi_type='restaurant')[0]), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
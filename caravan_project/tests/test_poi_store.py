@@ -0,0 +1,101 @@
+
+import csv
+import json
+import os
+import tempfile
+import unittest
+
+# Test Target
+from src.data.poi_loader import iter_geojson_features, load_poi_file, load_poi_store
+from src.repositories.poi_store import PoiStore, PoiStoreBuilder
+
+class TestPoiStore(unittest.TestCase):
+    """POI 스트리밍 적재와 열 저장소에 대한 단위 테스트"""
+
+    ROWS = [
+        {"name": "양평 스타 캠핑장", "type": "campground", "latitude": "37.501", "longitude": "127.51",
+         "address": "경기도 양평군 용문면", "region": "경기도 양평"},
+        {"name": "두물머리 공중화장실", "type": "toilet", "latitude": "37.53", "longitude": "127.31",
+         "address": "경기도 양평군 양서면", "region": "경기도 양평"},
+        {"name": "새별오름 공중화장실", "type": "toilet", "latitude": "33.36", "longitude": "126.35",
+         "address": "제주특별자치도 제주시 애월읍", "region": "제주도 애월"},
+        # 건너뛸 행: 허용되지 않는 종류, 잘못된 좌표
+        {"name": "식당", "type": "restaurant", "latitude": "37.0", "longitude": "127.0", "address": "", "region": ""},
+        {"name": "좌표 없음", "type": "toilet", "latitude": "", "longitude": "127.0", "address": "", "region": ""},
+    ]
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _path(self, name):
+        return os.path.join(self.tmpdir.name, name)
+
+    def _write_csv(self):
+        path = self._path("pois.csv")
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=list(self.ROWS[0]))
+            writer.writeheader()
+            writer.writerows(self.ROWS)
+        return path
+
+    def _write_geojson(self):
+        path = self._path("pois.geojson")
+        features = [{
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [float(row["longitude"] or 0), float(row["latitude"] or 0)]}
+            if row["latitude"] else None,
+            "properties": {key: row[key] for key in ("name", "type", "address", "region")},
+        } for row in self.ROWS]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"type": "FeatureCollection", "features": features}, f, ensure_ascii=False, indent=2)
+        return path
+
+    def _assert_store(self, store):
+        self.assertEqual(len(store), 3)
+        self.assertEqual(store.poi(1).name, "두물머리 공중화장실")
+        self.assertEqual(store.poi(1).latitude, 37.53)
+        self.assertEqual(store.poi(2).type, "toilet")
+        self.assertEqual(store.region_indices("경기도 양평").tolist(), [0, 1])
+        self.assertEqual(store.region_indices("서울").tolist(), [])
+
+    def test_csv_loads_in_chunks_and_skips_invalid_rows(self):
+        """CSV를 작은 청크로 적재하고, 잘못된 행은 건너뜀"""
+        builder = PoiStoreBuilder()
+        stats = load_poi_file(self._write_csv(), builder, chunk_size=2)
+        self.assertEqual((stats.rows, stats.skipped), (3, 2))
+        self._assert_store(builder.build())
+
+    def test_geojson_streams_across_buffer_boundaries(self):
+        """작은 버퍼로 읽어도 Feature가 경계에서 잘리지 않음"""
+        path = self._write_geojson()
+        self.assertEqual(len(list(iter_geojson_features(path, buffer_size=7))), len(self.ROWS))
+        builder = PoiStoreBuilder()
+        stats = load_poi_file(path, builder)
+        self.assertEqual((stats.rows, stats.skipped), (3, 2))
+        self._assert_store(builder.build())
+
+    def test_binary_cache_round_trip(self):
+        """바이너리 캐시로 저장 후 다시 열면 같은 내용이고, 원본보다 최신이면 캐시를 사용"""
+        source, cache = self._write_csv(), self._path("pois.bin")
+        store, stats = load_poi_store(source, cache)
+        self.assertFalse(stats.from_cache)
+
+        reloaded, stats = load_poi_store(source, cache)
+        self.assertTrue(stats.from_cache)
+        self._assert_store(reloaded)
+        self.assertEqual(reloaded.latitudes.tolist(), store.latitudes.tolist())
+        self.assertEqual(reloaded.type_names, store.type_names)
+
+    def test_rejects_foreign_cache_file(self):
+        path = self._path("bogus.bin")
+        with open(path, "wb") as f:
+            f.write(b"not a cache file")
+        with self.assertRaises(ValueError):
+            PoiStore.load(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
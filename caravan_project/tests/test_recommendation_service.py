@@ -0,0 +1,78 @@
+import unittest
+
+import numpy as np
+
+# Test Target
+from src.services.recommendation_service import RecommendationService
+
+# Repositories and Models
+from src.repositories.caravan_repository import CaravanRepository
+from src.models.caravan import Caravan
+
+class TestRecommendationService(unittest.TestCase):
+    """RecommendationService(콘텐츠 기반 유사 카라반 추천)에 대한 단위 테스트"""
+
+    def setUp(self):
+        self.caravan_repo = CaravanRepository()
+        self.service = RecommendationService(self.caravan_repo)
+        fleet = [
+            # (id, location, type, sleeps, price)
+            (1, "강원도 인제", "Motorhome", 4, 150.0),
+            (2, "강원도 인제", "Motorhome", 4, 160.0),
+            (3, "강원도 인제", "Campervan", 2, 80.0),
+            (4, "제주도 애월", "Motorhome", 4, 150.0),
+            (5, "제주도 애월", "Campervan", 2, 70.0),
+        ]
+        for caravan_id, location, caravan_type, sleeps, price in fleet:
+            self.save(caravan_id, location, caravan_type, sleeps, price)
+
+    def save(self, caravan_id, location, caravan_type, sleeps, price):
+        self.caravan_repo.save(Caravan(
+            caravan_id=caravan_id, name=f"Caravan {caravan_id}", owner_id=100, type=caravan_type,
+            price_per_day=price, location=location, sleeps=sleeps, description=""
+        ))
+
+    def ids(self, caravans):
+        return [caravan.caravan_id for caravan in caravans]
+
+    def test_most_similar_first_and_excludes_target(self):
+        """타입/지역/가격이 모두 비슷한 카라반이 먼저 오고, 대상 자신은 제외"""
+        result = self.ids(self.service.recommend_similar_caravans(1, top_n=4))
+        self.assertEqual(result[0], 2)
+        self.assertNotIn(1, result)
+        self.assertEqual(result[-1], 5)
+
+    def test_matches_dense_cosine_similarity(self):
+        """one-hot 행렬을 직접 만들어 계산한 코사인 유사도 순위와 일치"""
+        caravans = self.caravan_repo.get_all()
+        features = RecommendationService._build_features(caravans)
+        weights = RecommendationService.FEATURE_WEIGHTS
+        dense = np.hstack([
+            np.eye(features.type_codes.max() + 1)[features.type_codes] * weights['type'],
+            np.eye(features.location_codes.max() + 1)[features.location_codes] * weights['location'],
+            features.numeric,
+        ])
+        for row in range(len(caravans)):
+            expected = dense @ dense[row] / (np.linalg.norm(dense, axis=1) * np.linalg.norm(dense[row]))
+            np.testing.assert_allclose(features.cosine_similarity(row, weights), expected)
+
+    def test_cache_invalidated_when_caravan_changes(self):
+        """카라반이 바뀌면 캐시된 추천 결과를 다시 계산"""
+        before = self.ids(self.service.recommend_similar_caravans(4, top_n=2))
+        # 속성이 완전히 같은 카라반은 유사도 1로 가장 먼저 추천됨
+        self.save(6, "제주도 애월", "Motorhome", 4, 150.0)
+        self.assertEqual(self.ids(self.service.recommend_similar_caravans(4, top_n=1)), [6])
+
+        self.caravan_repo.delete(6)
+        self.assertEqual(self.ids(self.service.recommend_similar_caravans(4, top_n=2)), before)
+
+    def test_unknown_or_single_caravan(self):
+        self.assertEqual(self.service.recommend_similar_caravans(999), [])
+        repo = CaravanRepository()
+        repo.save(Caravan(caravan_id=1, name="Only", owner_id=1, type="Motorhome", price_per_day=100.0,
+                          location="서울", sleeps=2, description=""))
+        self.assertEqual(RecommendationService(repo).recommend_similar_caravans(1), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+
+import unittest
+from datetime import date, timedelta
+from unittest.mock import Mock
+
+# Test Target
+from src.services.reservation_service import ReservationService
+
+# Repositories, Validators, Patterns and Models
+from src.repositories.base_repository import BaseRepository
+from src.repositories.reservation_repository import ReservationRepository
+from src.repositories.user_repository import UserRepository
+from src.validators.reservation_validator import ReservationValidator
+from src.patterns.observers import HostNotifier, UserNotifier
+from src.models.caravan import Caravan
+from src.models.reservation import ReservationCreate
+from src.models.user import User
+
+class TestReservationBatch(unittest.TestCase):
+    """ReservationService.create_reservations_batch에 대한 단위 테스트"""
+
+    def setUp(self):
+        """실제 저장소와 Mock 알림 서비스로 서비스를 구성합니다."""
+        self.user_repo = UserRepository()
+        self.caravan_repo = BaseRepository[Caravan]()
+        self.reservation_repo = ReservationRepository()
+        validator = ReservationValidator(self.user_repo, self.caravan_repo, self.reservation_repo)
+        self.service = ReservationService(self.user_repo, self.caravan_repo, self.reservation_repo, validator)
+
+        self.notification_service = Mock()
+        self.service.attach(UserNotifier(self.notification_service))
+        self.service.attach(HostNotifier(self.notification_service))
+
+        self.user = self.user_repo.save(User(user_id=1, name="Organizer", email="org@example.com", balance=2000.0))
+        for caravan_id, owner_id in [(1, 101), (2, 101), (3, 102)]:
+            self.caravan_repo.save(Caravan(
+                caravan_id=caravan_id, name=f"Caravan {caravan_id}", owner_id=owner_id, type="Campervan",
+                price_per_day=100.0, location="경기도 양평", sleeps=2, description=""
+            ))
+        self.start = date.today() + timedelta(days=5)
+
+    def _item(self, caravan_id, start_offset, nights):
+        start_date = self.start + timedelta(days=start_offset)
+        return ReservationCreate(caravan_id=caravan_id, start_date=start_date, end_date=start_date + timedelta(days=nights))
+
+    def test_batch_success_charges_once_and_coalesces_notifications(self):
+        """일괄 예약 성공: 총액 결제, 사용자 1회 + 호스트별 1회 알림"""
+        result = self.service.create_reservations_batch(1, [
+            self._item(1, 0, 2), self._item(2, 0, 3), self._item(3, 0, 2), self._item(1, 2, 1),
+        ])
+
+        self.assertEqual(len(result), 4)
+        self.assertEqual(self.user.balance, 2000.0 - 800.0)
+        self.assertEqual(len(self.reservation_repo.find_by_user_id(1)), 4)
+
+        recipients = sorted(call.kwargs['user_id'] for call in self.notification_service.send.call_args_list)
+        self.assertEqual(recipients, [1, 101, 102])
+
+    def test_conflict_within_batch_rejects_everything(self):
+        """배치 내부 날짜 충돌 시 전체 거절"""
+        result = self.service.create_reservations_batch(1, [self._item(1, 0, 3), self._item(2, 0, 1), self._item(1, 2, 2)])
+
+        self.assertIsNone(result)
+        self.assertEqual(self.reservation_repo.get_all(), [])
+        self.assertEqual(self.user.balance, 2000.0)
+        self.notification_service.send.assert_not_called()
+
+    def test_conflict_with_existing_booking_rejects_everything(self):
+        """기존 예약과 충돌하는 항목이 있으면 전체 거절"""
+        self.service.create_reservation(1, 3, self.start, self.start + timedelta(days=2))
+        balance = self.user.balance
+
+        result = self.service.create_reservations_batch(1, [self._item(1, 0, 1), self._item(3, 1, 1)])
+
+        self.assertIsNone(result)
+        self.assertEqual(len(self.reservation_repo.get_all()), 1)
+        self.assertEqual(self.user.balance, balance)
+
+    def test_insufficient_funds_for_batch_total(self):
+        """총액이 잔액을 초과하면 전체 거절"""
+        result = self.service.create_reservations_batch(1, [self._item(1, 0, 10), self._item(2, 0, 11)])
+
+        self.assertIsNone(result)
+        self.assertEqual(self.reservation_repo.get_all(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
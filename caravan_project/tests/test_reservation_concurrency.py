@@ -0,0 +1,101 @@
+
+import contextlib
+import io
+import threading
+import time
+import unittest
+from datetime import date, timedelta
+
+# Test Target
+from src.services.reservation_service import ReservationService
+
+# Repositories, Validators and Models
+from src.repositories.base_repository import BaseRepository
+from src.repositories.reservation_repository import ReservationRepository
+from src.repositories.user_repository import UserRepository
+from src.validators.reservation_validator import ReservationValidator
+from src.models.caravan import Caravan
+from src.models.user import User
+
+class SlowValidator(ReservationValidator):
+    """검증과 저장 사이의 경쟁 구간을 넓히기 위해 검증 후 잠시 GIL을 양보하는 검증기"""
+    def validate(self, *args, **kwargs):
+        super().validate(*args, **kwargs)
+        time.sleep(0.001)
+
+class TestReservationConcurrency(unittest.TestCase):
+    """동시 예약 요청에 대한 스트레스 테스트 (실제 저장소 사용)"""
+
+    THREADS = 400
+    CARAVANS = 8
+
+    def setUp(self):
+        """실제 저장소와 검증기로 서비스를 구성합니다."""
+        self.user_repo = UserRepository()
+        self.caravan_repo = BaseRepository[Caravan]()
+        self.reservation_repo = ReservationRepository()
+        validator = SlowValidator(self.user_repo, self.caravan_repo, self.reservation_repo)
+        self.service = ReservationService(self.user_repo, self.caravan_repo, self.reservation_repo, validator)
+
+        for caravan_id in range(1, self.CARAVANS + 1):
+            self.caravan_repo.save(Caravan(
+                caravan_id=caravan_id, name=f"Caravan {caravan_id}", owner_id=1000, type="Campervan",
+                price_per_day=100.0, location="경기도 양평", sleeps=2, description=""
+            ))
+        self.base = date.today() + timedelta(days=1)
+
+    def _run_concurrently(self, requests):
+        """모든 스레드가 동시에 출발하도록 배리어를 사용해 예약을 요청합니다."""
+        barrier = threading.Barrier(len(requests))
+        results = [None] * len(requests)
+
+        def book(i, user_id, caravan_id, start_date, end_date):
+            barrier.wait()
+            results[i] = self.service.create_reservation(user_id, caravan_id, start_date, end_date)
+
+        threads = [threading.Thread(target=book, args=(i, *request)) for i, request in enumerate(requests)]
+        with contextlib.redirect_stdout(io.StringIO()):
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        return [result for result in results if result is not None]
+
+    def test_no_double_booking_under_contention(self):
+        """수백 개의 스레드가 겹치는 날짜를 요청해도 중복 예약이 없어야 함"""
+        requests = []
+        for i in range(self.THREADS):
+            user = self.user_repo.save(User(name=f"User {i}", email=f"user{i}@example.com", balance=10_000))
+            start_date = self.base + timedelta(days=i % 10)
+            requests.append((user.user_id, i % self.CARAVANS + 1, start_date, start_date + timedelta(days=3)))
+
+        created = self._run_concurrently(requests)
+
+        self.assertGreater(len(created), 0)
+        for caravan_id in range(1, self.CARAVANS + 1):
+            stays = sorted(
+                (r.start_date, r.end_date) for r in self.reservation_repo.find_by_caravan_id(caravan_id)
+                if r.status == 'confirmed'
+            )
+            for (_, previous_end), (next_start, _) in zip(stays, stays[1:]):
+                self.assertLessEqual(previous_end, next_start, f"caravan {caravan_id} double-booked")
+        self.assertEqual(len({r.reservation_id for r in created}), len(created))
+        self.assertEqual(len(self.reservation_repo.get_all()), len(created))
+
+    def test_no_overdraft_for_same_user(self):
+        """한 사용자의 동시 예약이 잔액을 초과하지 않아야 함"""
+        user = self.user_repo.save(User(name="Spender", email="spender@example.com", balance=1_000))
+        requests = []
+        for i in range(self.THREADS):
+            start_date = self.base + timedelta(days=3 * (i // self.CARAVANS))
+            requests.append((user.user_id, i % self.CARAVANS + 1, start_date, start_date + timedelta(days=2)))
+
+        created = self._run_concurrently(requests)
+
+        # 예약 1건당 200이므로 최대 5건만 성공해야 함
+        self.assertEqual(len(created), 5)
+        self.assertEqual(user.balance, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
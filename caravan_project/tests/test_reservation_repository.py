@@ -0,0 +1,110 @@
+
+import unittest
+from datetime import date, timedelta
+
+# Test Target
+from src.repositories.reservation_repository import ReservationRepository
+
+# Models
+from src.models.reservation import Reservation
+
+class TestReservationRepository(unittest.TestCase):
+    """ReservationRepository에 대한 단위 테스트"""
+
+    def setUp(self):
+        """각 테스트 전에 저장소와 기준 날짜를 초기화합니다."""
+        self.repo = ReservationRepository()
+        self.base = date.today() + timedelta(days=10)
+
+    def _reserve(self, reservation_id, caravan_id, start_offset, nights, status='confirmed', user_id=1):
+        start_date = self.base + timedelta(days=start_offset)
+        return self.repo.save(Reservation(
+            reservation_id=reservation_id, user_id=user_id, caravan_id=caravan_id,
+            start_date=start_date, end_date=start_date + timedelta(days=nights),
+            total_price=100.0, status=status
+        ))
+
+    def _available(self, caravan_id, start_offset, nights):
+        start_date = self.base + timedelta(days=start_offset)
+        return self.repo.check_caravan_availability(caravan_id, start_date, start_date + timedelta(days=nights))
+
+    def test_overlapping_dates_are_unavailable(self):
+        """확정된 예약과 겹치는 기간은 이용 불가능"""
+        self._reserve(1, 1, 0, 3)
+        self._reserve(2, 1, 10, 2)
+        self.assertFalse(self._available(1, 2, 2))
+        self.assertFalse(self._available(1, -1, 20))
+        self.assertFalse(self._available(1, 11, 1))
+
+    def test_adjacent_dates_are_available(self):
+        """체크아웃 날짜에 시작하는 예약은 겹치지 않음"""
+        self._reserve(1, 1, 0, 3)
+        self._reserve(2, 1, 10, 2)
+        self.assertTrue(self._available(1, 3, 7))
+        self.assertTrue(self._available(1, -2, 2))
+        self.assertTrue(self._available(1, 12, 5))
+        self.assertTrue(self._available(2, 0, 3))
+
+    def test_overlapping_confirmed_stays(self):
+        """겹치는 확정 숙박이 저장되어 있어도(불러오기/복구 등) 충돌 검사와 달력이 정확함"""
+        self._reserve(1, 1, 0, 10)
+        self._reserve(2, 1, 2, 2)
+        self._reserve(3, 1, 3, 1)
+        # 가장 늦게 시작한 숙박(3)은 이미 끝났지만, 더 일찍 시작한 숙박(1)이 아직 이어짐
+        self.assertFalse(self._available(1, 6, 2))
+        self.assertTrue(self._available(1, 10, 2))
+
+        self.repo.cancel(2)
+        self.assertFalse(self._available(1, 2, 1))
+        self.assertEqual(self.repo.find_free_ranges(1, self.base, 12), [
+            (self.base + timedelta(days=10), self.base + timedelta(days=12)),
+        ])
+        self.repo.cancel(1)
+        self.assertTrue(self._available(1, 6, 2))
+        self.assertFalse(self._available(1, 3, 1))
+        self.assertEqual(format(self.repo.availability_grid([1], self.base, 6)[0], '06b')[::-1], '111011')
+
+    def test_pending_and_cancelled_reservations_are_ignored(self):
+        """확정되지 않은 예약은 충돌 검사에서 제외"""
+        self._reserve(1, 1, 0, 3, status='pending')
+        self._reserve(2, 1, 5, 3, status='cancelled')
+        self.assertTrue(self._available(1, 0, 10))
+
+    def test_cancel_frees_dates(self):
+        """예약 취소 시 해당 기간이 다시 이용 가능"""
+        self._reserve(1, 1, 0, 3)
+        self.repo.cancel(1)
+        self.assertTrue(self._available(1, 0, 3))
+        self.assertEqual(self.repo.find_by_id(1).status, 'cancelled')
+
+    def test_changed_dates_are_reindexed(self):
+        """제자리에서 변경된 예약을 다시 저장하면 인덱스도 이동"""
+        reservation = self._reserve(1, 1, 0, 3)
+        reservation.start_date = self.base + timedelta(days=20)
+        reservation.end_date = self.base + timedelta(days=22)
+        self.repo.save(reservation)
+        self.assertTrue(self._available(1, 0, 3))
+        self.assertFalse(self._available(1, 21, 1))
+
+    def test_free_ranges_follow_bookings(self):
+        """비트맵 달력의 빈 기간이 예약/취소에 따라 갱신"""
+        self._reserve(1, 1, 2, 3)
+        self._reserve(2, 1, 7, 1)
+        day = lambda offset: self.base + timedelta(days=offset)
+
+        self.assertEqual(self.repo.find_free_ranges(1, self.base, 10), [
+            (day(0), day(2)), (day(5), day(7)), (day(8), day(10)),
+        ])
+        self.repo.cancel(1)
+        self.assertEqual(self.repo.find_free_ranges(1, self.base, 10), [(day(0), day(7)), (day(8), day(10))])
+
+    def test_availability_grid(self):
+        """여러 카라반의 빈 날 비트맵을 한 번에 조회"""
+        self._reserve(1, 1, 0, 2)
+        self._reserve(2, 2, 3, 1)
+        rows = self.repo.availability_grid([1, 2, 3], self.base, 5)
+        self.assertEqual([format(row, '05b')[::-1] for row in rows], ['00111', '11101', '11111'])
+
+
+if __name__ == '__main__':
+    unittest.main()
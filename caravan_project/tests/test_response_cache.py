@@ -0,0 +1,76 @@
+
+import gzip
+import unittest
+from unittest.mock import Mock
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+# Test Target
+from src.response_cache import ResponseCache
+
+# Repositories and Models
+from src.repositories.caravan_repository import CaravanRepository
+from src.models.caravan import Caravan
+
+class TestResponseCache(unittest.TestCase):
+    """ResponseCache에 대한 단위 테스트 (작은 FastAPI 앱 사용)"""
+
+    def setUp(self):
+        """저장소 버전으로 무효화되는 캐시 엔드포인트를 구성합니다."""
+        self.repo = CaravanRepository()
+        self.caravan = self.repo.save(Caravan(
+            caravan_id=1, name="Caravan " * 100, owner_id=100, type="Campervan",
+            price_per_day=100.0, location="경기도 양평", sleeps=2, description=""
+        ))
+        self.cache = ResponseCache()
+        self.build = Mock(side_effect=lambda: self.repo.find_by_id(1).model_dump(mode="json"))
+
+        app = FastAPI()
+
+        @app.get("/caravan")
+        def get_caravan(request: Request):
+            return self.cache.respond(request, ("caravan", 1), self.repo.version, self.build)
+
+        self.client = TestClient(app)
+
+    def test_repeat_reads_skip_serialization(self):
+        """같은 버전이면 두 번째 요청부터는 build를 호출하지 않음"""
+        first = self.client.get("/caravan")
+        second = self.client.get("/caravan")
+        self.assertEqual(first.json(), second.json())
+        self.assertEqual(self.build.call_count, 1)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_if_none_match_returns_304(self):
+        """ETag가 일치하면 본문 없이 304"""
+        etag = self.client.get("/caravan", headers={"Accept-Encoding": "identity"}).headers["ETag"]
+        response = self.client.get("/caravan", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+    def test_save_invalidates_entry(self):
+        """저장소에 저장하면 버전이 바뀌어 새 ETag와 내용으로 응답"""
+        etag = self.client.get("/caravan").headers["ETag"]
+        self.caravan.price_per_day = 150.0
+        self.repo.save(self.caravan)
+
+        response = self.client.get("/caravan", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["price_per_day"], 150.0)
+        self.assertEqual(self.build.call_count, 2)
+
+    def test_gzip_variant_has_its_own_etag(self):
+        """gzip 압축본은 미리 만들어 두고 표현별로 다른 ETag를 사용"""
+        response = self.client.get("/caravan", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertTrue(response.headers["ETag"].endswith('-gzip"'))
+
+        cached = self.cache.get(("caravan", 1), self.repo.version, self.build)
+        self.assertEqual(gzip.decompress(cached.encoded["gzip"]), cached.body)
+        identity = self.client.get("/caravan", headers={"Accept-Encoding": "gzip;q=0"})
+        self.assertNotIn("Content-Encoding", identity.headers)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+
+import os
+import tempfile
+import unittest
+from datetime import date, timedelta
+
+# Test Target
+from src.services.review_service import ReviewService
+from src.repositories.review_repository import ReviewRepository
+from src.repositories.sqlite_repository import SqliteDatabase, SqliteReviewRepository
+
+# Dependencies
+from src.repositories.base_repository import BaseRepository
+from src.repositories.reservation_repository import ReservationRepository
+from src.models.caravan import Caravan
+from src.models.reservation import Reservation
+from src.models.review import Review
+
+class TestReviewRepository(unittest.TestCase):
+    """카라반별 리뷰 목록과 최신순 키셋 페이지에 대한 단위 테스트"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db = SqliteDatabase(os.path.join(self.tmpdir.name, "test.db"))
+
+    def tearDown(self):
+        self.db.close()
+        self.tmpdir.cleanup()
+
+    def _repositories(self):
+        return [ReviewRepository(), SqliteReviewRepository(self.db)]
+
+    def test_page_by_caravan_newest_first(self):
+        """다른 카라반의 리뷰는 섞이지 않고, before 커서로 다음 페이지를 이어서 조회"""
+        for repo in self._repositories():
+            with self.subTest(repo=type(repo).__name__):
+                for i in range(7):
+                    repo.save(Review(review_id=None, user_id=i, caravan_id=1 + i % 2, rating=5, comment=str(i)))
+
+                first = repo.page_by_caravan(1, limit=2)
+                self.assertEqual([review.review_id for review in first], [7, 5])
+                second = repo.page_by_caravan(1, before=first[-1].review_id, limit=2)
+                self.assertEqual([review.review_id for review in second], [3, 1])
+                self.assertEqual(repo.page_by_caravan(1, before=1), [])
+                self.assertEqual([review.review_id for review in repo.page_by_caravan(2)], [6, 4, 2])
+
+    def test_delete_removes_from_page(self):
+        """삭제한 리뷰는 카라반 목록에서도 빠짐"""
+        for repo in self._repositories():
+            with self.subTest(repo=type(repo).__name__):
+                for i in range(3):
+                    repo.save(Review(review_id=None, user_id=i, caravan_id=1, rating=4, comment=""))
+                repo.delete(2)
+                self.assertEqual([review.review_id for review in repo.page_by_caravan(1)], [3, 1])
+
+
+class TestReviewService(unittest.TestCase):
+    """ReviewService의 자격 검사와 평점 집계에 대한 단위 테스트"""
+
+    def setUp(self):
+        self.caravan_repo = BaseRepository[Caravan]()
+        self.reservation_repo = ReservationRepository()
+        self.review_repo = ReviewRepository()
+        self.service = ReviewService(self.review_repo, self.reservation_repo, self.caravan_repo)
+        self.caravan_repo.save(Caravan(
+            name="별밤지기", owner_id=101, type="Campervan", price_per_day=120.0,
+            location="경기도 양평", sleeps=2, description="desc"
+        ))
+        start = date.today() - timedelta(days=10)
+        for user_id, status in [(1, 'confirmed'), (2, 'confirmed'), (3, 'cancelled')]:
+            self.reservation_repo.save(Reservation(
+                reservation_id=None, user_id=user_id, caravan_id=1,
+                start_date=start, end_date=start + timedelta(days=2), total_price=240.0, status=status
+            ))
+
+    def test_only_confirmed_guests_can_review(self):
+        """확정 예약이 없는 사용자(취소 포함)는 리뷰를 남길 수 없음"""
+        with self.assertRaises(PermissionError):
+            self.service.submit_review(3, 1, 5, "취소했지만 리뷰")
+        with self.assertRaises(PermissionError):
+            self.service.submit_review(4, 1, 5, "예약 없음")
+        self.assertEqual(self.service.list_reviews(1), [])
+
+    def test_rating_average_and_histogram(self):
+        """리뷰마다 평균 별점, 리뷰 수, 별점 분포가 함께 갱신됨"""
+        self.service.submit_review(1, 1, 5, "최고")
+        self.service.submit_review(2, 1, 2, "별로")
+
+        caravan = self.caravan_repo.find_by_id(1)
+        self.assertEqual(caravan.review_count, 2)
+        self.assertAlmostEqual(caravan.average_rating, 3.5)
+        self.assertEqual(caravan.rating_histogram, [0, 1, 0, 0, 1])
+        self.assertEqual([review.comment for review in self.service.list_reviews(1)], ["별로", "최고"])
+
+
+if __name__ == '__main__':
+    unittest.main()
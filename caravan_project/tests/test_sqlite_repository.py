@@ -0,0 +1,127 @@
+
+import os
+import tempfile
+import threading
+import unittest
+from datetime import date, timedelta
+
+# Test Target
+from src.repositories.sqlite_repository import (
+    SqliteDatabase, SqliteRepository, SqliteReservationRepository, SqliteUserRepository
+)
+
+# Models
+from src.models.caravan import Caravan
+from src.models.reservation import Reservation
+from src.models.review import Review
+from src.models.user import User
+
+class TestSqliteRepositories(unittest.TestCase):
+    """SQLite 저장소 구현에 대한 단위 테스트"""
+
+    def setUp(self):
+        """각 테스트마다 임시 파일 데이터베이스를 생성합니다."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "test.db")
+        self.db = SqliteDatabase(self.path)
+        self.base = date.today() + timedelta(days=10)
+
+    def tearDown(self):
+        self.db.close()
+        self.tmpdir.cleanup()
+
+    def _reservation(self, reservation_id, caravan_id, start_offset, nights, status='confirmed', user_id=1):
+        start_date = self.base + timedelta(days=start_offset)
+        return Reservation(
+            reservation_id=reservation_id, user_id=user_id, caravan_id=caravan_id,
+            start_date=start_date, end_date=start_date + timedelta(days=nights),
+            total_price=100.0, status=status
+        )
+
+    def test_save_assigns_id_and_round_trips(self):
+        """ID 자동 할당 및 저장/조회 왕복"""
+        repo = SqliteRepository[Caravan](self.db, Caravan, "caravans")
+        caravan = repo.save(Caravan(
+            name="별밤지기", owner_id=101, type="Campervan", price_per_day=120.0,
+            location="경기도 양평", sleeps=2, description="desc"
+        ))
+        self.assertEqual(caravan.caravan_id, 1)
+        self.assertEqual(repo.find_by_id(1), caravan)
+
+        reviews = SqliteRepository[Review](self.db, Review, "reviews")
+        review = reviews.save(Review(review_id=None, user_id=1, caravan_id=1, rating=5, comment="좋아요"))
+        self.assertEqual(reviews.find_by_id(review.review_id), review)
+
+    def test_user_email_index(self):
+        """이메일 조회와 UNIQUE 제약"""
+        repo = SqliteUserRepository(self.db)
+        user = repo.save(User(name="Kim", email="kim@example.com"))
+        self.assertEqual(repo.find_by_email("kim@example.com").user_id, user.user_id)
+        with self.assertRaises(ValueError):
+            repo.save(User(name="Other", email="kim@example.com"))
+
+        user.balance = 500.0
+        repo.save(user)
+        self.assertEqual(repo.find_by_id(user.user_id).balance, 500.0)
+        self.assertTrue(repo.delete(user.user_id))
+        self.assertIsNone(repo.find_by_email("kim@example.com"))
+
+    def test_availability_and_lookups(self):
+        """범위 조건 기반 가용성 검사와 보조 인덱스 조회"""
+        repo = SqliteReservationRepository(self.db)
+        repo.save(self._reservation(1, 1, 0, 3))
+        repo.save(self._reservation(2, 1, 10, 2, user_id=2))
+        repo.save(self._reservation(3, 1, 4, 3, status='cancelled'))
+
+        def available(start_offset, nights):
+            start_date = self.base + timedelta(days=start_offset)
+            return repo.check_caravan_availability(1, start_date, start_date + timedelta(days=nights))
+
+        self.assertFalse(available(2, 2))
+        self.assertFalse(available(11, 1))
+        self.assertTrue(available(3, 7))
+        self.assertTrue(available(4, 3))
+
+        repo.cancel(1)
+        self.assertTrue(available(0, 3))
+        self.assertEqual([r.reservation_id for r in repo.find_by_user_id(2)], [2])
+        self.assertEqual(len(repo.find_by_caravan_id(1)), 3)
+        self.assertEqual(repo.find_one_by(user_id=2, caravan_id=1, status='confirmed').reservation_id, 2)
+
+    def test_overlapping_confirmed_stays(self):
+        """겹치는 확정 숙박이 저장되어 있어도 충돌 검사와 시작 시 채운 달력이 정확함"""
+        repo = SqliteReservationRepository(self.db)
+        repo.save(self._reservation(1, 1, 0, 10))
+        repo.save(self._reservation(2, 1, 2, 2))
+        repo.save(self._reservation(3, 1, 3, 1))
+
+        reopened = SqliteReservationRepository(self.db)
+        start_date = self.base + timedelta(days=6)
+        self.assertFalse(reopened.check_caravan_availability(1, start_date, start_date + timedelta(days=2)))
+        start_date = self.base + timedelta(days=10)
+        self.assertTrue(reopened.check_caravan_availability(1, start_date, start_date + timedelta(days=2)))
+        reopened.cancel(2)
+        self.assertEqual(reopened.find_free_ranges(1, self.base, 12), [
+            (self.base + timedelta(days=10), self.base + timedelta(days=12)),
+        ])
+
+    def test_data_survives_reopen_and_threads(self):
+        """재시작(재연결) 후 데이터 유지 및 스레드별 연결 사용"""
+        repo = SqliteReservationRepository(self.db)
+        threads = [
+            threading.Thread(target=repo.save, args=(self._reservation(i, i, 0, 2),))
+            for i in range(1, 9)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.db.close()
+
+        reopened = SqliteReservationRepository(SqliteDatabase(self.path))
+        self.assertEqual(reopened.max_id(), 8)
+        self.assertEqual(len(reopened.get_all()), 8)
+
+
+if __name__ == '__main__':
+    unittest.main()
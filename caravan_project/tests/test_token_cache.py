@@ -0,0 +1,56 @@
+
+import unittest
+
+# Test Target
+from src.token_cache import TokenCache
+
+# Dependencies
+from src.repositories.user_repository import UserRepository
+from src.models.user import User
+
+class TestTokenCache(unittest.TestCase):
+    """검증된 JWT 캐시에 대한 단위 테스트"""
+
+    def setUp(self):
+        self.now = 1000.0
+        self.cache = TokenCache(max_entries=2, clock=lambda: self.now)
+
+    def test_hit_until_expiry(self):
+        """exp 전까지는 적중하고, exp가 지나면 항목을 버림"""
+        self.assertIsNone(self.cache.get("token-a"))
+        self.cache.put("token-a", 1, expires_at=1060)
+        self.assertEqual(self.cache.get("token-a"), 1)
+
+        self.now = 1060
+        self.assertIsNone(self.cache.get("token-a"))
+        self.assertEqual(self.cache.stats(), {"entries": 0, "hits": 1, "misses": 2, "hit_rate": 1 / 3})
+
+    def test_lru_eviction(self):
+        """최대 개수를 넘으면 가장 오래 쓰이지 않은 토큰부터 밀려남"""
+        self.cache.put("token-a", 1, 2000)
+        self.cache.put("token-b", 2, 2000)
+        self.cache.get("token-a")
+        self.cache.put("token-c", 3, 2000)
+        self.assertEqual(self.cache.get("token-a"), 1)
+        self.assertIsNone(self.cache.get("token-b"))
+        self.assertEqual(self.cache.get("token-c"), 3)
+
+    def test_revoke_and_user_update_invalidate(self):
+        """토큰 폐기와 사용자 변경(저장소 리스너) 시 해당 항목이 무효화됨"""
+        repo = UserRepository()
+        repo.add_listener(self.cache.on_user_event)
+        user = repo.save(User(name="Kim", email="kim@example.com"))
+        self.cache.put("token-a", user.user_id, 2000)
+        self.cache.put("token-b", user.user_id, 2000)
+
+        self.cache.revoke("token-a")
+        self.assertIsNone(self.cache.get("token-a"))
+        self.assertEqual(self.cache.get("token-b"), user.user_id)
+
+        user.name = "Lee"
+        repo.save(user)
+        self.assertIsNone(self.cache.get("token-b"))
+
+
+if __name__ == '__main__':
+    unittest.main()
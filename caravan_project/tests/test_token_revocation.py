@@ -0,0 +1,60 @@
+
+import unittest
+
+# Test Target
+from src.token_revocation import BloomFilter, TokenRevocationStore
+
+class TestBloomFilter(unittest.TestCase):
+    """Bloom 필터에 대한 단위 테스트"""
+
+    def test_no_false_negatives_and_bounded_false_positives(self):
+        """추가한 키는 항상 있음, 추가하지 않은 키의 오탐률은 설정값 근처"""
+        bloom = BloomFilter(capacity=2000, error_rate=0.01)
+        for i in range(2000):
+            bloom.add(f"jti-{i}")
+        self.assertTrue(all(f"jti-{i}" in bloom for i in range(2000)))
+        false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+        self.assertLess(false_positives, 300)
+
+
+class TestTokenRevocationStore(unittest.TestCase):
+    """토큰 폐기 저장소에 대한 단위 테스트"""
+
+    def setUp(self):
+        self.now = 1000.0
+        self.store = TokenRevocationStore(capacity=4, token_lifetime_seconds=3600, clock=lambda: self.now)
+
+    def test_revoked_until_expiry(self):
+        """폐기한 토큰은 exp 전까지 거부되고, exp가 지난 항목은 정리됨"""
+        self.store.revoke("a", expires_at=1060)
+        self.store.revoke("b", expires_at=2000)
+        self.assertTrue(self.store.is_revoked("a"))
+        self.assertFalse(self.store.is_revoked("c"))
+        self.assertFalse(self.store.is_revoked(None))
+
+        self.now = 1060
+        self.assertFalse(self.store.is_revoked("a"))
+        self.store.revoke("d", expires_at=2000)
+        self.assertEqual(len(self.store), 2)
+        self.assertTrue(self.store.is_revoked("b"))
+
+    def test_filter_grows_past_capacity(self):
+        """용량을 넘게 폐기해도 모두 정확히 거부됨"""
+        for i in range(50):
+            self.store.revoke(f"jti-{i}", expires_at=2000)
+        self.assertTrue(all(self.store.is_revoked(f"jti-{i}") for i in range(50)))
+        self.assertFalse(self.store.is_revoked("jti-50"))
+
+    def test_revoke_user_rejects_tokens_issued_before(self):
+        """사용자 단위 폐기 시각 이전에 발급된 토큰만 거부하고, 토큰 수명이 지나면 기준을 지움"""
+        self.store.revoke_user(7)
+        self.assertTrue(self.store.is_revoked("x", user_id=7, issued_at=999.5))
+        self.assertFalse(self.store.is_revoked("y", user_id=7, issued_at=1000.25))
+        self.assertFalse(self.store.is_revoked("x", user_id=8, issued_at=999.5))
+
+        self.now = 1000 + 3600
+        self.assertFalse(self.store.is_revoked("x", user_id=7, issued_at=999.5))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+
+# Test Target
+from src.services.trending_service import TrendingTracker
+from src.services.search_service import CaravanSearchService
+
+# Repositories and Models
+from src.repositories.caravan_repository import CaravanRepository
+from src.repositories.reservation_repository import ReservationRepository
+from src.models.caravan import Caravan
+from src.models.reservation import Reservation
+
+HOUR = 3600
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+class TestTrendingTracker(unittest.TestCase):
+    """TrendingTracker(시간 감쇠 인기 순위)에 대한 단위 테스트"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.tracker = TrendingTracker(half_life_hours=24, booking_weight=5, view_weight=1, clock=self.clock)
+        for caravan_id in (1, 2, 3, 4):
+            self.tracker.add(caravan_id)
+
+    def ranked_ids(self):
+        return [caravan_id for caravan_id, _ in self.tracker.top(10)]
+
+    def test_scores_halve_every_half_life(self):
+        """점수는 반감기마다 절반이 됨"""
+        self.tracker.record_booking(1)
+        self.assertAlmostEqual(self.tracker.score(1), 5.0)
+        self.clock.now += 24 * HOUR
+        self.assertAlmostEqual(self.tracker.score(1), 2.5)
+
+    def test_recent_activity_outranks_older_activity(self):
+        """오래된 예약 2건보다 최근 예약 1건 + 조회가 앞설 수 있음"""
+        self.tracker.record_booking(1)
+        self.tracker.record_booking(1)
+        self.clock.now += 48 * HOUR
+        self.tracker.record_booking(2)
+        self.tracker.record_view(3)
+        # 1: 10 / 4 = 2.5, 2: 5, 3: 1, 4: 0 (활동이 없으면 ID 순)
+        self.assertEqual(self.ranked_ids(), [2, 1, 3, 4])
+
+    def test_observer_and_repository_events(self):
+        """예약 알림은 예약 점수로, 삭제된 카라반과 모르는 ID는 순위에서 제외"""
+        reservation = Reservation(reservation_id=1, user_id=1, caravan_id=4, start_date="2030-01-01",
+                                  end_date="2030-01-03", total_price=200, status='confirmed')
+        self.tracker.update(None, reservation=reservation)
+        self.assertEqual(self.ranked_ids()[0], 4)
+
+        self.tracker.on_repository_event('delete', 4, None)
+        self.tracker.record_view(4)
+        self.tracker.record_view(99)
+        self.assertEqual(self.ranked_ids(), [1, 2, 3])
+
+    def test_rescale_keeps_order_and_scores(self):
+        """기준 시각을 옮겨도 순서와 현재 점수가 유지됨"""
+        self.tracker.record_booking(2)
+        self.tracker.record_view(3)
+        self.clock.now += 10 * 24 * HOUR
+        before = self.tracker.top(10)
+        self.tracker._rescale(self.clock.now)
+        after = self.tracker.top(10)
+        self.assertEqual([caravan_id for caravan_id, _ in after], [caravan_id for caravan_id, _ in before])
+        for (_, expected), (_, actual) in zip(before, after):
+            self.assertAlmostEqual(actual, expected)
+
+
+class TestTrendingListing(unittest.TestCase):
+    """sort=trending 목록 페이지네이션"""
+
+    def test_list_page_by_trending(self):
+        caravan_repo = CaravanRepository()
+        tracker = TrendingTracker(clock=FakeClock())
+        caravan_repo.add_listener(tracker.on_repository_event)
+        for caravan_id in range(1, 8):
+            caravan_repo.save(Caravan(
+                caravan_id=caravan_id, name=f"Caravan {caravan_id}", owner_id=100, type="Motorhome",
+                price_per_day=100.0, location="강원도 인제", sleeps=4, description=""
+            ))
+        for caravan_id, views in ((5, 3), (2, 2), (7, 1)):
+            for _ in range(views):
+                tracker.record_view(caravan_id)
+        service = CaravanSearchService(caravan_repo, ReservationRepository(), tracker)
+
+        seen, cursor = [], None
+        while True:
+            caravans, cursor = service.list_page(sort_by='trending', cursor=cursor, limit=3)
+            seen.extend(caravan.caravan_id for caravan in caravans)
+            if cursor is None:
+                break
+        self.assertEqual(seen, [5, 2, 7, 1, 3, 4, 6])
+
+        with self.assertRaises(ValueError):
+            service.list_page(sort_by='price_per_day', cursor=service.list_page(sort_by='trending', limit=1)[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,236 @@
+
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Test Target
+from src.services.webhook_service import SIGNATURE_HEADER, WebhookDispatcher, WebhookRetryQueue
+from src.security import check_outbound_url, is_public_address
+
+# Dependencies
+from src.models.caravan import Caravan
+from src.models.reservation import Reservation
+from src.models.webhook import Webhook
+from src.repositories.base_repository import BaseRepository, Index
+from src.repositories.sqlite_repository import SqliteDatabase
+
+class _StandInReceiver(BaseHTTPRequestHandler):
+    """호스트 서버 흉내: 서명을 검증해 기록하고, 처음 fail_first번은 503으로 응답"""
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        server = self.server
+        with server.lock:
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+            server.attempts += 1
+            failing = server.attempts <= server.fail_first
+        time.sleep(server.delay)
+        timestamp, signature = [part.split("=", 1)[1] for part in self.headers[SIGNATURE_HEADER].split(",")]
+        expected = hmac.new(server.secret.encode(), f"{timestamp}.".encode() + body, hashlib.sha256).hexdigest()
+        with server.lock:
+            server.active -= 1
+            if not failing:
+                server.received.append((
+                    self.headers["X-CaravanShare-Delivery"], hmac.compare_digest(signature, expected), json.loads(body)
+                ))
+        self.send_response(503 if failing else 204)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestWebhookDispatcher(unittest.TestCase):
+    """로컬 수신 서버를 상대로 한 웹훅 전달, 재시도, 영속 큐 테스트"""
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInReceiver)
+        self.server.lock = threading.Lock()
+        self.server.secret = "s3cret"
+        self.server.received, self.server.attempts, self.server.fail_first = [], 0, 0
+        self.server.active = self.server.max_active = 0
+        self.server.delay = 0.0
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db = SqliteDatabase(os.path.join(self.tmpdir.name, "queue.db"))
+        self.webhooks = BaseRepository[Webhook](indexes=(Index(('host_id',)),))
+        self.webhooks.save(Webhook(
+            url=f"http://127.0.0.1:{self.server.server_address[1]}/hooks", host_id=101, secret="s3cret"
+        ))
+        self.caravan = Caravan(
+            caravan_id=1, name="별밤지기", owner_id=101, type="Campervan", price_per_day=120.0,
+            location="경기도 양평", sleeps=2, description="desc"
+        )
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.db.close()
+        self.tmpdir.cleanup()
+
+    def _dispatcher(self, **options):
+        options.setdefault("base_delay", 0.01)
+        options.setdefault("poll_interval", 0.05)
+        # 수신 서버가 127.0.0.1에 있으므로 테스트에서는 내부망 전송을 허용합니다.
+        options.setdefault("allow_private_networks", True)
+        return WebhookDispatcher(self.webhooks, WebhookRetryQueue(self.db), **options)
+
+    def _reservation(self, reservation_id):
+        start = date.today() + timedelta(days=10)
+        return Reservation(
+            reservation_id=reservation_id, user_id=7, caravan_id=1, start_date=start,
+            end_date=start + timedelta(days=2), total_price=240.0, status='confirmed'
+        )
+
+    def _run_until(self, dispatcher, condition, before=None):
+        async def scenario():
+            await dispatcher.start()
+            try:
+                if before:
+                    before()
+                for _ in range(200):
+                    if condition():
+                        return
+                    await asyncio.sleep(0.025)
+            finally:
+                await dispatcher.stop()
+        asyncio.run(scenario())
+
+    def test_signed_delivery_with_retries(self):
+        """503 응답은 백오프 후 재시도되고, 같은 전달 ID와 올바른 서명으로 결국 전달됨"""
+        self.server.fail_first = 2
+        dispatcher = self._dispatcher()
+        self._run_until(
+            dispatcher, lambda: self.server.received,
+            before=lambda: dispatcher.update(None, reservation=self._reservation(5), caravan=self.caravan),
+        )
+
+        self.assertEqual(self.server.attempts, 3)
+        delivery_id, signature_ok, payload = self.server.received[0]
+        self.assertTrue(signature_ok)
+        self.assertEqual(payload["event"], "reservation.confirmed")
+        self.assertEqual(payload["data"]["reservation"]["reservation_id"], 5)
+        self.assertEqual(dispatcher.queue.counts(), {})
+
+    def test_queue_survives_restart(self):
+        """작업자가 없을 때 넣은 작업은 SQLite에 남고, 새 프로세스(새 큐 객체)가 이어서 보냄"""
+        self._dispatcher().update(None, reservations=[self._reservation(1), self._reservation(2)],
+                                  caravans={1: self.caravan})
+        self.db.close()
+        self.db = SqliteDatabase(os.path.join(self.tmpdir.name, "queue.db"))
+        self.assertEqual(WebhookRetryQueue(self.db).counts(), {"pending": 2})
+
+        self._run_until(self._dispatcher(), lambda: len(self.server.received) == 2)
+        self.assertEqual(
+            sorted(payload["data"]["reservation"]["reservation_id"] for _, _, payload in self.server.received), [1, 2]
+        )
+
+    def test_per_destination_concurrency_limit(self):
+        """한 목적지로의 동시 요청 수는 per_destination을 넘지 않음"""
+        self.server.delay = 0.05
+        dispatcher = self._dispatcher(per_destination=2)
+        self._run_until(
+            dispatcher, lambda: len(self.server.received) == 8,
+            before=lambda: [dispatcher.publish(101, "reservation.confirmed", {"n": i}) for i in range(8)],
+        )
+        self.assertEqual(len(self.server.received), 8)
+        self.assertLessEqual(self.server.max_active, 2)
+
+    def test_slow_destination_backlog_is_sent_once(self):
+        """느린 목적지에 밀린 작업은 임대 시간이 지나도 다시 꺼내지지 않아 한 번씩만 전송됨"""
+        self.server.delay = 0.3
+        dispatcher = self._dispatcher(per_destination=1, lease_seconds=1, batch_size=2)
+        self._run_until(
+            dispatcher, lambda: len(self.server.received) >= 10,
+            before=lambda: [dispatcher.publish(101, "reservation.confirmed", {"n": i}) for i in range(10)],
+        )
+        delivery_ids = [delivery_id for delivery_id, _, _ in self.server.received]
+        self.assertEqual(len(delivery_ids), 10)
+        self.assertEqual(len(set(delivery_ids)), 10)
+        self.assertEqual(self.server.attempts, 10)
+        self.assertEqual(dispatcher.queue.counts(), {})
+
+    def test_gives_up_after_max_attempts(self):
+        """max_attempts번 실패하면 'dead'로 남기고 더 보내지 않음"""
+        self.server.fail_first = 100
+        dispatcher = self._dispatcher(max_attempts=3)
+        self._run_until(
+            dispatcher, lambda: dispatcher.queue.counts() == {"dead": 1},
+            before=lambda: dispatcher.publish(101, "reservation.confirmed", {}),
+        )
+        self.assertEqual(dispatcher.queue.counts(), {"dead": 1})
+        self.assertEqual(self.server.attempts, 3)
+
+    def test_unexpected_errors_count_as_attempts(self):
+        """httpx.HTTPError가 아닌 예외(잘못 저장된 주소 등)도 실패한 시도로 세어 결국 포기함"""
+        webhook = self.webhooks.find_one_by(host_id=101)
+        self.webhooks.save(Webhook.model_construct(**{**webhook.model_dump(), "url": "http://[::1"}))
+        dispatcher = self._dispatcher(max_attempts=3)
+        self._run_until(
+            dispatcher, lambda: dispatcher.queue.counts() == {"dead": 1},
+            before=lambda: dispatcher.publish(101, "reservation.confirmed", {}),
+        )
+        self.assertEqual(dispatcher.queue.counts(), {"dead": 1})
+        self.assertEqual(dispatcher.failed, 3)
+
+    def test_idle_destinations_are_evicted(self):
+        """전달이 끝난 목적지의 세마포어는 남지 않음"""
+        dispatcher = self._dispatcher()
+        self._run_until(
+            dispatcher, lambda: len(self.server.received) == 3,
+            before=lambda: [dispatcher.publish(101, "reservation.confirmed", {"n": i}) for i in range(3)],
+        )
+        self.assertEqual(len(self.server.received), 3)
+        self.assertEqual(dispatcher._destinations, {})
+        self.assertEqual(dispatcher._destination_users, {})
+
+    def test_private_destination_blocked_by_default(self):
+        """기본 설정에서는 루프백 주소(이름이 루프백으로 풀리는 경우 포함)로 보내지 않고 시도 횟수만 늘다가 포기함"""
+        port = self.server.server_address[1]
+        for url in (f"http://127.0.0.1:{port}/hooks", f"http://2130706433:{port}/hooks"):
+            with self.subTest(url=url):
+                webhook = self.webhooks.find_one_by(host_id=101)
+                self.webhooks.save(webhook.model_copy(update={"url": url}))
+                dispatcher = self._dispatcher(max_attempts=2, allow_private_networks=False)
+                self._run_until(
+                    dispatcher, lambda: dispatcher.queue.counts() == {"dead": 1},
+                    before=lambda: dispatcher.publish(101, "reservation.confirmed", {}),
+                )
+                self.assertEqual(dispatcher.queue.counts(), {"dead": 1})
+                self.assertEqual(self.server.attempts, 0)
+                with self.db.connection() as conn:
+                    conn.execute("DELETE FROM webhook_deliveries")
+
+
+class TestOutboundUrl(unittest.TestCase):
+    """웹훅 주소 검사 테스트"""
+
+    def test_rejects_malformed_urls(self):
+        for url in ("http://[::1", "http:///hooks", "ftp://example.com/", "https://example.com:99999/", "http://a b.com/"):
+            with self.subTest(url=url), self.assertRaises(ValueError):
+                check_outbound_url(url, allow_private=True)
+
+    def test_rejects_internal_addresses(self):
+        for url in ("http://127.0.0.1/", "http://localhost:8000/", "http://169.254.169.254/latest",
+                    "http://10.1.2.3/", "http://[::1]/", "http://[::ffff:192.168.0.1]/", "http://0.0.0.0/"):
+            with self.subTest(url=url), self.assertRaises(ValueError):
+                check_outbound_url(url)
+        self.assertEqual(check_outbound_url("https://hooks.example.com/caravans"), "hooks.example.com")
+        self.assertTrue(is_public_address("93.184.216.34"))
+        self.assertFalse(is_public_address("fe80::1%eth0"))
+
+
+if __name__ == '__main__':
+    unittest.main()